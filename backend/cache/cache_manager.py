@@ -0,0 +1,219 @@
+"""
+Cache Manager
+Three-tier cache for rendered charts and API responses.
+"""
+
+import base64
+import hashlib
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.cache.memory_cache import MemoryCache
+from backend.cache.object_store import LocalObjectStore
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_redis_optional
+
+HIT_MEMORY = "HIT_MEMORY"
+HIT_REDIS = "HIT_REDIS"
+HIT_OBJECT = "HIT_OBJECT"
+MISS = "MISS"
+
+
+def encode_value(value: Any) -> str:
+    """
+    Encode a cache value as text, keeping its type.
+
+    Bytes (PNG charts) are base64 encoded, strings (SVG charts) kept as is
+    and anything else (response dicts) stored as JSON, each behind a tag.
+    """
+    if isinstance(value, bytes):
+        return "b:" + base64.b64encode(value).decode("ascii")
+    if isinstance(value, str):
+        return "s:" + value
+    return "j:" + json.dumps(value, default=_json_default)
+
+
+def decode_value(payload: str) -> Any:
+    """Inverse of ``encode_value``."""
+    tag, body = payload[:2], payload[2:]
+    if tag == "b:":
+        return base64.b64decode(body)
+    if tag == "s:":
+        return body
+    return json.loads(body)
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class CacheManager:
+    """
+    Rendered charts and responses cached in three tiers.
+
+    - L1, ``MemoryCache``: this process's LRU, bounded by size. Entries live
+      at most ``memory_ttl`` seconds, since invalidations made by other
+      processes only reach Redis and the object store.
+    - L2, Redis: shared by every process.
+    - L3, object storage: durable and large; keeps long-lived entries
+      (``object_min_ttl`` and up) through Redis evictions and restarts. A
+      local directory stands in for the R2 bucket, so L3 is only correct
+      when every process uses the same directory, i.e. on a single host:
+      ``delete`` removes only that directory's copy, and a host with its
+      own directory would promote invalidated entries back into Redis.
+      Disable it (``cache_object_enabled``) for multi-host deployments.
+      Expired objects are purged by the metric maintenance runs.
+
+    ``get`` reads the tiers in order and copies a hit into the faster tiers
+    above it for the rest of its lifetime, reporting where it was found as
+    ``HIT_MEMORY``, ``HIT_REDIS`` or ``HIT_OBJECT`` (``MISS`` otherwise),
+    the same values endpoints send in ``X-Cache``. Every tier is best
+    effort: one being down only means more misses.
+    """
+
+    KEY_PREFIX = "cache:"
+
+    def __init__(
+        self,
+        default_ttl: Optional[int] = None,
+        memory_max_bytes: Optional[int] = None,
+        memory_ttl: Optional[float] = None,
+        object_store: Optional[LocalObjectStore] = None,
+        object_min_ttl: Optional[int] = None,
+    ):
+        self.default_ttl = default_ttl or settings.redis_cache_ttl
+        self.memory = MemoryCache(memory_max_bytes or settings.cache_memory_max_bytes)
+        self.memory_ttl = memory_ttl or settings.cache_memory_ttl
+        if object_store is None and settings.cache_object_enabled:
+            object_store = LocalObjectStore(settings.cache_object_dir)
+        self.objects = object_store
+        self.object_min_ttl = (
+            settings.cache_object_min_ttl if object_min_ttl is None else object_min_ttl
+        )
+        self._counts = dict.fromkeys((HIT_MEMORY, HIT_REDIS, HIT_OBJECT, MISS), 0)
+
+    @staticmethod
+    def generate_cache_key(
+        prefix: str,
+        repos: List[str],
+        timeframe: str,
+        theme: str = "dark",
+        format: str = "svg",
+        **params: Any,
+    ) -> str:
+        """
+        Key of a request, the same whatever order or case its repos are given in.
+
+        A 32-character SHA-256 prefix of the canonical request, so keys stay
+        short however many repos are charted.
+        """
+        canonical = json.dumps(
+            {
+                "prefix": prefix,
+                "repos": sorted(repo.lower() for repo in repos),
+                "timeframe": timeframe,
+                "theme": theme,
+                "format": format,
+                **params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+    async def get(self, key: str) -> Tuple[Optional[Any], str]:
+        """The cached value and the tier that served it, or ``(None, "MISS")``."""
+        payload = self.memory.get(key)
+        if payload is not None:
+            return self._hit(payload, HIT_MEMORY)
+
+        redis_client = get_redis_optional()
+        if redis_client is not None:
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    pipe.get(self.KEY_PREFIX + key)
+                    pipe.ttl(self.KEY_PREFIX + key)
+                    payload, ttl = await pipe.execute()
+            except Exception:
+                payload = None
+            if payload is not None:
+                remaining = ttl if ttl > 0 else self.default_ttl
+                self.memory.set(key, payload, min(remaining, self.memory_ttl))
+                return self._hit(payload, HIT_REDIS)
+
+        if self.objects is not None:
+            found = await self.objects.get(key)
+            if found is not None:
+                payload, expires_at = found
+                remaining = max(int(expires_at - time.time()), 1)
+                await self._set_redis(key, payload, remaining)
+                self.memory.set(key, payload, min(remaining, self.memory_ttl))
+                return self._hit(payload, HIT_OBJECT)
+
+        self._counts[MISS] += 1
+        return None, MISS
+
+    def _hit(self, payload: str, status: str) -> Tuple[Any, str]:
+        try:
+            value = decode_value(payload)
+        except Exception:
+            self._counts[MISS] += 1
+            return None, MISS
+        self._counts[status] += 1
+        return value, status
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Cache ``value`` for ``ttl`` seconds in every tier it belongs in."""
+        ttl = ttl or self.default_ttl
+        payload = encode_value(value)
+        self.memory.set(key, payload, min(ttl, self.memory_ttl))
+        await self._set_redis(key, payload, ttl)
+        if self.objects is not None and ttl >= self.object_min_ttl:
+            await self.objects.put(key, payload, ttl)
+
+    async def _set_redis(self, key: str, payload: str, ttl: int) -> None:
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.setex(self.KEY_PREFIX + key, ttl, payload)
+        except Exception:
+            pass
+
+    async def delete(self, key: str) -> None:
+        """Remove ``key`` from every tier."""
+        self.memory.delete(key)
+        redis_client = get_redis_optional()
+        if redis_client is not None:
+            try:
+                await redis_client.delete(self.KEY_PREFIX + key)
+            except Exception:
+                pass
+        if self.objects is not None:
+            await self.objects.delete(key)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Hit counts per tier since startup and the memory tier's usage."""
+        lookups = sum(self._counts.values())
+        hits = lookups - self._counts[MISS]
+        return {
+            "default_ttl": self.default_ttl,
+            "lookups": lookups,
+            "hits": {
+                status.replace("HIT_", "").lower(): count
+                for status, count in self._counts.items()
+                if status != MISS
+            },
+            "misses": self._counts[MISS],
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory": self.memory.stats(),
+            "redis": get_redis_optional() is not None,
+            "object_store": self.objects is not None,
+        }
+
+
+# Global cache manager
+cache_manager = CacheManager()
@@ -0,0 +1,69 @@
+"""
+Memory Cache
+In-process LRU of encoded cache entries, bounded by size.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class MemoryCache:
+    """
+    LRU of encoded entries evicted by total size, not count.
+
+    Each entry is the encoded value and the time it expires. Inserting past
+    ``max_bytes`` drops the least recently used entries until the new one
+    fits; entries larger than ``max_item_bytes`` are never kept, so one big
+    chart cannot flush everything else. Sizes are counted in characters of
+    the encoded form, which is ASCII for everything but SVG text.
+    """
+
+    def __init__(self, max_bytes: int, max_item_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes or max(max_bytes // 8, 1)
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """The entry under ``key`` if present and unexpired, marking it recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: str, ttl: float) -> bool:
+        """Store ``payload`` for ``ttl`` seconds; False if it is too large to keep."""
+        self._remove(key)
+        if ttl <= 0 or len(payload) > self.max_item_bytes:
+            return False
+        while self._entries and self.size + len(payload) > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+        self._entries[key] = (payload, time.time() + ttl)
+        self.size += len(payload)
+        return True
+
+    def delete(self, key: str) -> bool:
+        return self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size -= len(entry[0])
+        return True
+
+    def stats(self) -> Dict:
+        return {"entries": len(self._entries), "bytes": self.size, "max_bytes": self.max_bytes}
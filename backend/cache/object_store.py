@@ -0,0 +1,100 @@
+"""
+Object Store
+Durable, slow cache tier kept outside Redis.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+class LocalObjectStore:
+    """
+    Cache objects as files under ``root``, standing in for an R2 bucket.
+
+    One file per key, named by the key's hash and fanned out over 256
+    subdirectories; the first line holds the expiry time, the rest the
+    encoded value. Writes go to a temporary file renamed into place, so
+    readers never see a partial object. File I/O runs in worker threads.
+    Expired objects are deleted when read or by ``purge_expired``.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return self.root / name[:2] / name
+
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """The encoded value under ``key`` and when it expires, or None."""
+        try:
+            return await asyncio.to_thread(self._read, self._path(key))
+        except Exception:
+            return None
+
+    async def put(self, key: str, payload: str, ttl: float) -> bool:
+        try:
+            await asyncio.to_thread(self._write, self._path(key), payload, time.time() + ttl)
+            return True
+        except Exception:
+            return False
+
+    async def delete(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(self._path(key).unlink)
+            return True
+        except Exception:
+            return False
+
+    async def purge_expired(self) -> int:
+        """Delete every expired object, returning how many were removed."""
+        try:
+            return await asyncio.to_thread(self._purge)
+        except Exception:
+            return 0
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Tuple[str, float]]:
+        try:
+            with path.open("r", encoding="utf-8", newline="") as f:
+                expires_at = float(f.readline())
+                if expires_at <= time.time():
+                    payload = None
+                else:
+                    payload = f.read()
+        except FileNotFoundError:
+            return None
+        if payload is None:
+            path.unlink(missing_ok=True)
+            return None
+        return payload, expires_at
+
+    @staticmethod
+    def _write(path: Path, payload: str, expires_at: float) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with temporary.open("w", encoding="utf-8", newline="") as f:
+            f.write(f"{expires_at}\n")
+            f.write(payload)
+        os.replace(temporary, path)
+
+    def _purge(self) -> int:
+        removed = 0
+        now = time.time()
+        for path in self.root.glob("*/*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                with path.open("r", encoding="utf-8", newline="") as f:
+                    expired = float(f.readline()) <= now
+            except (OSError, ValueError):
+                continue
+            if expired:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
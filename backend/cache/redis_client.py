@@ -0,0 +1,91 @@
+"""
+Redis Client
+Best-effort access to the shared Redis connection for key/value callers.
+"""
+
+import json
+from typing import Any, Optional
+
+from backend.hyperbeats.dependencies import get_redis_optional
+
+
+class RedisClient:
+    """
+    The few Redis commands API keys and rate limits need, over the app's
+    shared connection.
+
+    Every call degrades instead of raising when Redis is not initialized or
+    a command fails: reads return nothing, writes report that nothing was
+    written, so callers fail open the way the rest of the app does.
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return None
+        try:
+            return await redis_client.get(key)
+        except Exception:
+            return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return False
+        try:
+            return bool(await redis_client.set(key, value, ex=ttl))
+        except Exception:
+            return False
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        raw = await self.get(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    async def set_json(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        return await self.set(key, json.dumps(value), ttl)
+
+    async def delete(self, *keys: str) -> int:
+        redis_client = get_redis_optional()
+        if redis_client is None or not keys:
+            return 0
+        try:
+            return await redis_client.delete(*keys)
+        except Exception:
+            return 0
+
+    async def incr(self, key: str) -> int:
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return 0
+        try:
+            return await redis_client.incr(key)
+        except Exception:
+            return 0
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return False
+        try:
+            return bool(await redis_client.expire(key, seconds))
+        except Exception:
+            return False
+
+    async def ttl(self, key: str) -> int:
+        """Seconds left on ``key``; -1 without an expiry, -2 when missing or unknown."""
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return -2
+        try:
+            return await redis_client.ttl(key)
+        except Exception:
+            return -2
+
+
+# Global Redis client
+redis_client = RedisClient()
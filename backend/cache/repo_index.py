@@ -0,0 +1,58 @@
+"""
+Repository Cache Index
+Tracks which cache entries were built from which repositories.
+"""
+
+from typing import Iterable, Set
+
+from backend.hyperbeats.dependencies import get_redis_optional
+
+
+class RepoCacheIndex:
+    """
+    Reverse index from repository to the cache keys that include it.
+
+    Cache keys are hashes of the request, so they cannot be matched by repo
+    name. Endpoints register each key they cache here; a change to one
+    repository then invalidates exactly the charts and metrics built from it.
+    """
+
+    KEY_PREFIX = "cache:repo_keys:"
+
+    def __init__(self, ttl: int = 7 * 86400):
+        self.ttl = ttl
+
+    def _key(self, repo: str) -> str:
+        return f"{self.KEY_PREFIX}{repo.lower()}"
+
+    async def add(self, repos: Iterable[str], cache_key: str) -> None:
+        """Record that ``cache_key`` was built from ``repos``."""
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for repo in repos:
+                    pipe.sadd(self._key(repo), cache_key)
+                    pipe.expire(self._key(repo), self.ttl)
+                await pipe.execute()
+        except Exception:
+            pass
+
+    async def pop(self, repo: str) -> Set[str]:
+        """Take every cache key built from ``repo`` out of the index."""
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return set()
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.smembers(self._key(repo))
+                pipe.delete(self._key(repo))
+                keys, _ = await pipe.execute()
+        except Exception:
+            return set()
+        return set(keys)
+
+
+# Global repository cache index
+repo_cache_index = RepoCacheIndex()
@@ -0,0 +1,717 @@
+"""
+Metric Store
+Reads and writes the DailyMetric time series and its rollups.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    and_,
+    case,
+    delete,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models import (
+    BackfillCheckpoint,
+    DailyMetric,
+    IngestedBatch,
+    MetricRollup,
+    Repository,
+    SyncCursor,
+)
+
+
+ACTIVITY_FIELDS = (
+    "commits",
+    "prs_opened",
+    "prs_merged",
+    "prs_closed",
+    "issues_opened",
+    "issues_closed",
+    "contributors",
+)
+
+# Fields with running totals (``<field>_cumulative``) on each DailyMetric row
+PREFIX_FIELDS = ACTIVITY_FIELDS[:-1]
+
+# Series grains, finest first; weeks and months are kept in MetricRollup
+GRAINS = ("day", "week", "month")
+ROLLUP_GRAINS = GRAINS[1:]
+
+
+def period_start(day: datetime, grain: str) -> datetime:
+    """Start of the day, ISO week (Monday) or month containing ``day``."""
+    start = datetime(day.year, day.month, day.day)
+    if grain == "week":
+        return start - timedelta(days=start.weekday())
+    if grain == "month":
+        return start.replace(day=1)
+    return start
+
+
+def next_period(start: datetime, grain: str) -> datetime:
+    """Start of the period after the one starting at ``start``."""
+    if grain == "week":
+        return start + timedelta(days=7)
+    if grain == "month":
+        return datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+async def get_repository_id(session: AsyncSession, full_name: str) -> Optional[UUID]:
+    """Look up a tracked repository by "owner/name", ignoring case."""
+    return await session.scalar(
+        select(Repository.id).where(func.lower(Repository.full_name) == full_name.lower())
+    )
+
+
+async def ensure_repository(session: AsyncSession, full_name: str) -> UUID:
+    """Start tracking a repository by "owner/name", returning its id."""
+    repository_id = await get_repository_id(session, full_name)
+    if repository_id is not None:
+        return repository_id
+    owner, name = full_name.split("/", 1)
+    repository = Repository(owner=owner, name=name, full_name=full_name)
+    session.add(repository)
+    await session.flush()
+    return repository.id
+
+
+class MetricBatch:
+    """
+    Columnar batch of daily counts for any number of repositories.
+
+    One list per column rather than one dict per row, so large backfills
+    and multi-repository syncs stay compact until they are written.
+    """
+
+    def __init__(self):
+        self.repository_ids: List[UUID] = []
+        self.dates: List[datetime] = []
+        self.columns: Dict[str, List[int]] = {field: [] for field in ACTIVITY_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def add(self, repository_id: UUID, day: datetime, fields: Dict[str, int]) -> None:
+        """Append one repository-day; missing fields count as zero."""
+        self.repository_ids.append(repository_id)
+        self.dates.append(day)
+        for field, column in self.columns.items():
+            column.append(fields.get(field, 0))
+
+    def extend(
+        self,
+        repository_id: UUID,
+        counts: Dict[datetime, Dict[str, int]],
+        contributors: Optional[Dict[datetime, int]] = None,
+    ) -> None:
+        """Append a repository's days of counts and distinct contributor counts."""
+        contributors = contributors or {}
+        for day in sorted(set(counts) | set(contributors)):
+            fields = counts.get(day, {})
+            if day in contributors:
+                fields = {**fields, "contributors": contributors[day]}
+            self.add(repository_id, day, fields)
+
+    def rows(self, start: int, stop: int) -> List[Dict]:
+        """Rows ``start`` to ``stop`` as INSERT values."""
+        return [
+            {
+                "repository_id": self.repository_ids[i],
+                "date": self.dates[i],
+                **{field: column[i] for field, column in self.columns.items()},
+            }
+            for i in range(start, min(stop, len(self)))
+        ]
+
+    def days_by_repository(self) -> Dict[UUID, List[datetime]]:
+        """The days each repository appears on."""
+        days: Dict[UUID, List[datetime]] = {}
+        for repository_id, day in zip(self.repository_ids, self.dates):
+            days.setdefault(repository_id, []).append(day)
+        return days
+
+
+class IngestStats:
+    """Rows written and time spent writing them, summed across batches."""
+
+    def __init__(self, rows: int = 0, seconds: float = 0.0):
+        self.rows = rows
+        self.seconds = seconds
+
+    def add(self, other: "IngestStats") -> None:
+        self.rows += other.rows
+        self.seconds += other.seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+# Rows per INSERT; each row binds 9 parameters and asyncpg allows 32767 per statement
+UPSERT_BATCH_SIZE = 2000
+
+
+async def claim_batch(session: AsyncSession, batch_id: str) -> bool:
+    """
+    Record that the batch ``batch_id`` is being added, in the caller's transaction.
+
+    Returns False if it was added before. A concurrent claim of the same id
+    waits for the first transaction and then returns False if it committed,
+    so each id is counted at most once however often it is retried.
+    """
+    claimed = await session.scalar(
+        insert(IngestedBatch)
+        .values(batch_id=batch_id, created_at=datetime.utcnow())
+        .on_conflict_do_nothing()
+        .returning(IngestedBatch.batch_id)
+    )
+    return claimed is not None
+
+
+async def claim_events(
+    session: AsyncSession,
+    repository_id: UUID,
+    keys: Iterable[str],
+) -> Set[str]:
+    """
+    Claim named events of a repository, returning the ones not counted before.
+
+    Webhooks and polls both name what they count (see ``ActivityDelta``),
+    so an event seen by both is only counted by whichever stores it first.
+    Claims share the batch table and its retention.
+    """
+    ids = {f"event:{repository_id}:{key}": key for key in keys}
+    names = list(ids)
+    claimed: Set[str] = set()
+    now = datetime.utcnow()
+    for start in range(0, len(names), UPSERT_BATCH_SIZE):
+        result = await session.execute(
+            insert(IngestedBatch)
+            .values([
+                {"batch_id": batch_id, "created_at": now}
+                for batch_id in names[start:start + UPSERT_BATCH_SIZE]
+            ])
+            .on_conflict_do_nothing()
+            .returning(IngestedBatch.batch_id)
+        )
+        claimed.update(ids[batch_id] for batch_id in result.scalars())
+    return claimed
+
+
+async def purge_batches(session: AsyncSession, before: datetime) -> int:
+    """Forget batch ids claimed before ``before``, returning how many were dropped."""
+    result = await session.execute(delete(IngestedBatch).where(IngestedBatch.created_at < before))
+    return result.rowcount
+
+
+async def upsert_daily_metrics(
+    session: AsyncSession,
+    batch: MetricBatch,
+    batch_size: int = UPSERT_BATCH_SIZE,
+    batch_id: Optional[str] = None,
+) -> IngestStats:
+    """
+    Add a batch of counts to DailyMetric in multi-row upserts.
+
+    Each ``batch_size`` rows are one ``INSERT ... ON CONFLICT (repository_id,
+    date) DO UPDATE`` that adds counts to existing rows and only ever raises
+    their contributor counts. A repository-day listed twice in one batch is
+    merged before writing, since a single upsert cannot touch a row twice.
+    Running totals and rollups are then recomputed once per repository.
+
+    Adding is not idempotent, so callers that may send the same counts
+    again (retries, redeliveries, overlapping leases) pass a ``batch_id``;
+    a batch whose id was already claimed writes nothing.
+    """
+    started = time.perf_counter()
+    if batch_id is not None and not await claim_batch(session, batch_id):
+        return IngestStats()
+    merged = _merge_duplicates(batch)
+    for start in range(0, len(merged), batch_size):
+        stmt = insert(DailyMetric).values(merged.rows(start, start + batch_size))
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[DailyMetric.repository_id, DailyMetric.date],
+                set_={
+                    **{
+                        field: func.coalesce(getattr(DailyMetric, field), 0) + stmt.excluded[field]
+                        for field in PREFIX_FIELDS
+                    },
+                    "contributors": func.greatest(
+                        func.coalesce(DailyMetric.contributors, 0), stmt.excluded.contributors
+                    ),
+                },
+            )
+        )
+    for repository_id, days in merged.days_by_repository().items():
+        await refresh_prefix_sums(session, repository_id, min(days))
+        await refresh_rollups(session, repository_id, days)
+    return IngestStats(len(merged), time.perf_counter() - started)
+
+
+def _merge_duplicates(batch: MetricBatch) -> MetricBatch:
+    """Fold repeated repository-days into one row, summing counts and keeping peak contributors."""
+    positions: Dict[Tuple[UUID, datetime], int] = {}
+    merged = MetricBatch()
+    for i, key in enumerate(zip(batch.repository_ids, batch.dates)):
+        fields = {field: column[i] for field, column in batch.columns.items()}
+        if key not in positions:
+            positions[key] = len(merged)
+            merged.add(*key, fields)
+            continue
+        row = positions[key]
+        for field, value in fields.items():
+            column = merged.columns[field]
+            if field == "contributors":
+                column[row] = max(column[row], value)
+            else:
+                column[row] += value
+    return merged
+
+
+async def increment_daily_metrics(
+    session: AsyncSession,
+    repository_id: UUID,
+    counts: Dict[datetime, Dict[str, int]],
+    batch_id: Optional[str] = None,
+) -> None:
+    """
+    Add counts to a repository's daily rows in place.
+
+    The days are written in one upsert; running totals are brought up to
+    date from the earliest touched day, and the rollups containing the
+    touched days recomputed. Nothing is written if ``batch_id`` was seen.
+    """
+    batch = MetricBatch()
+    batch.extend(repository_id, {day: fields for day, fields in counts.items() if fields})
+    if batch:
+        await upsert_daily_metrics(session, batch, batch_id=batch_id)
+
+
+async def add_daily_metrics(
+    session: AsyncSession,
+    repository_id: UUID,
+    counts: Dict[datetime, Dict[str, int]],
+    contributors: Optional[Dict[datetime, int]] = None,
+    batch_id: Optional[str] = None,
+) -> IngestStats:
+    """
+    Add many days of counts at once, for backfills.
+
+    Contributor counts are set on new rows and only ever raised on existing
+    ones. Returns how many rows were written and how long it took; none if
+    ``batch_id`` was seen.
+    """
+    batch = MetricBatch()
+    batch.extend(repository_id, counts, contributors)
+    if not batch:
+        return IngestStats()
+    return await upsert_daily_metrics(session, batch, batch_id=batch_id)
+
+
+async def refresh_prefix_sums(
+    session: AsyncSession,
+    repository_id: UUID,
+    since: datetime,
+) -> None:
+    """
+    Recompute a repository's running totals for every row from ``since`` on.
+
+    One ``UPDATE ... FROM`` over a windowed ``SUM() OVER (ORDER BY date)``
+    of the rows from ``since`` on, offset by the running totals of the last
+    row before ``since``, which are already correct. Writes to the current
+    day therefore only read and rewrite that row; a backfill of older days
+    rewrites the rows after it once per chunk. Without an earlier row, the
+    offset is the months whose partitions were compacted away, carried in
+    from their monthly rollups, so totals stay comparable with rows
+    computed before the compaction.
+    """
+    running = (
+        select(
+            DailyMetric.id,
+            DailyMetric.date,
+            *[
+                func.sum(func.coalesce(getattr(DailyMetric, field), 0))
+                .over(order_by=DailyMetric.date)
+                .label(field)
+                for field in PREFIX_FIELDS
+            ],
+        )
+        .where(DailyMetric.repository_id == repository_id, DailyMetric.date >= since)
+        .subquery()
+    )
+    first_day = (
+        select(func.min(DailyMetric.date))
+        .where(DailyMetric.repository_id == repository_id)
+        .scalar_subquery()
+    )
+    carried = (
+        select(*[
+            func.coalesce(func.sum(getattr(MetricRollup, field)), 0).label(field)
+            for field in PREFIX_FIELDS
+        ])
+        .where(
+            MetricRollup.repository_id == repository_id,
+            MetricRollup.grain == "month",
+            MetricRollup.period_start < func.date_trunc(literal_column("'month'"), first_day),
+        )
+        .subquery()
+    )
+
+    def before(field: str):
+        return (
+            select(getattr(DailyMetric, f"{field}_cumulative"))
+            .where(DailyMetric.repository_id == repository_id, DailyMetric.date < since)
+            .order_by(DailyMetric.date.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    await session.execute(
+        update(DailyMetric)
+        .where(DailyMetric.id == running.c.id, DailyMetric.date == running.c.date)
+        .values({
+            getattr(DailyMetric, f"{field}_cumulative"): (
+                running.c[field] + func.coalesce(before(field), carried.c[field])
+            )
+            for field in PREFIX_FIELDS
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def refresh_rollups(
+    session: AsyncSession,
+    repository_id: UUID,
+    days: Iterable[datetime],
+) -> None:
+    """Recompute a repository's week and month rollups covering ``days``."""
+    days = list(days)
+    if not days:
+        return
+    for grain in ROLLUP_GRAINS:
+        first = period_start(min(days), grain)
+        end = next_period(period_start(max(days), grain), grain)
+        await rollup_range(session, grain, first, end, repository_id)
+
+
+async def rollup_range(
+    session: AsyncSession,
+    grain: str,
+    first: datetime,
+    end: datetime,
+    repository_id: Optional[UUID] = None,
+) -> None:
+    """
+    Re-sum the ``grain`` rollups of periods in ``[first, end)`` from DailyMetric.
+
+    One ``INSERT ... SELECT ... GROUP BY date_trunc() ON CONFLICT DO UPDATE``
+    for one repository, or all of them, so rollups always equal their days
+    no matter how the days were written.
+    """
+    # Inline the unit so the grouped and selected expressions are identical
+    period = func.date_trunc(literal_column(f"'{grain}'"), DailyMetric.date)
+    conditions = [DailyMetric.date >= first, DailyMetric.date < end]
+    if repository_id is not None:
+        conditions.append(DailyMetric.repository_id == repository_id)
+    summed = (
+        select(
+            func.gen_random_uuid(),
+            DailyMetric.repository_id,
+            literal(grain),
+            period,
+            *[
+                func.coalesce(func.sum(getattr(DailyMetric, field)), 0)
+                for field in PREFIX_FIELDS
+            ],
+            func.coalesce(func.max(DailyMetric.contributors), 0),
+            literal(datetime.utcnow()),
+        )
+        .where(*conditions)
+        .group_by(DailyMetric.repository_id, period)
+    )
+    columns = ["id", "repository_id", "grain", "period_start", *ACTIVITY_FIELDS, "updated_at"]
+    stmt = insert(MetricRollup).from_select(columns, summed)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                MetricRollup.repository_id, MetricRollup.grain, MetricRollup.period_start,
+            ],
+            set_={column: stmt.excluded[column] for column in (*ACTIVITY_FIELDS, "updated_at")},
+        )
+    )
+
+
+async def raise_daily_contributors(
+    session: AsyncSession,
+    repository_id: UUID,
+    day: datetime,
+    contributors: int,
+) -> None:
+    """Raise the distinct contributor count of an existing daily row, never lowering it."""
+    await session.execute(
+        update(DailyMetric)
+        .where(DailyMetric.repository_id == repository_id, DailyMetric.date == day)
+        .values(
+            contributors=case(
+                (func.coalesce(DailyMetric.contributors, 0) < contributors, contributors),
+                else_=DailyMetric.contributors,
+            )
+        )
+    )
+    await refresh_rollups(session, repository_id, [day])
+
+
+async def set_daily_engagement(
+    session: AsyncSession,
+    repository_id: UUID,
+    day: datetime,
+    stars: int,
+    forks: int,
+    watchers: int,
+) -> None:
+    """Record a repository's engagement totals as of ``day``, creating the row if needed."""
+    values = {"stars": stars, "forks": forks, "watchers": watchers}
+    result = await session.execute(
+        update(DailyMetric)
+        .where(DailyMetric.repository_id == repository_id, DailyMetric.date == day)
+        .values(values)
+    )
+    if result.rowcount == 0:
+        session.add(DailyMetric(repository_id=repository_id, date=day, **values))
+        await session.flush()
+        # A new row starts out with zero running totals
+        await refresh_prefix_sums(session, repository_id, day)
+
+
+async def daily_totals(
+    session: AsyncSession,
+    full_names: List[str],
+    since: datetime,
+    grain: str = "day",
+) -> List[Dict]:
+    """
+    Activity per day since ``since``, summed over the given repositories.
+
+    With a ``grain`` of week or month, reads one rollup row per period
+    instead, starting with the period containing ``since``.
+    """
+    table, date = _series_source(grain)
+    result = await session.execute(
+        select(date.label("date"), *_summed_activity(table))
+        .join(Repository, Repository.id == table.repository_id)
+        .where(
+            func.lower(Repository.full_name).in_([name.lower() for name in full_names]),
+            date >= period_start(since, grain),
+            *_grain_filter(table, grain),
+        )
+        .group_by(date)
+        .order_by(date)
+    )
+    return _daily_rows(result)
+
+
+async def daily_totals_between(
+    session: AsyncSession,
+    ranges: List[Tuple[UUID, datetime, datetime]],
+    grain: str = "day",
+) -> List[Dict]:
+    """
+    Activity per day summed over several repositories, each within its own ranges.
+
+    ``ranges`` lists ``(repository id, first, end)`` spans of ``[first,
+    end)`` days to read, so every repository contributes only days it has
+    complete rows for, in a single grouped query. With a ``grain`` of week
+    or month, reads rollup periods starting inside the spans instead.
+    """
+    ranges = [span for span in ranges if span[1] < span[2]]
+    if not ranges:
+        return []
+    table, date = _series_source(grain)
+    result = await session.execute(
+        select(date.label("date"), *_summed_activity(table))
+        .where(
+            *_grain_filter(table, grain),
+            or_(*(
+                and_(table.repository_id == repository_id, date >= first, date < end)
+                for repository_id, first, end in ranges
+            )),
+        )
+        .group_by(date)
+        .order_by(date)
+    )
+    return _daily_rows(result)
+
+
+async def repository_days(
+    session: AsyncSession,
+    ranges: List[Tuple[UUID, datetime, datetime]],
+) -> List[Dict]:
+    """
+    Each repository's own DailyMetric rows within its ``[first, end)`` span.
+
+    Unlike ``daily_totals_between`` nothing is summed across repositories;
+    rows carry ``repository_id``, ``date``, the activity fields and the
+    engagement totals, ordered by repository and day.
+    """
+    ranges = [span for span in ranges if span[1] < span[2]]
+    if not ranges:
+        return []
+    columns = (*ACTIVITY_FIELDS, "stars", "forks", "watchers")
+    result = await session.execute(
+        select(
+            DailyMetric.repository_id,
+            DailyMetric.date,
+            *[func.coalesce(getattr(DailyMetric, field), 0).label(field) for field in columns],
+        )
+        .where(or_(*(
+            and_(
+                DailyMetric.repository_id == repository_id,
+                DailyMetric.date >= first,
+                DailyMetric.date < end,
+            )
+            for repository_id, first, end in ranges
+        )))
+        .order_by(DailyMetric.repository_id, DailyMetric.date)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def stored_coverage(session: AsyncSession, full_names: List[str]) -> List[Dict]:
+    """
+    How far each repository's DailyMetric rows have been filled.
+
+    ``synced_from``/``synced_until`` bound what incremental sync has counted;
+    ``backfilled_from`` is set once a backfill has completed the history
+    before ``synced_from``. Repositories never synced are left out.
+    """
+    result = await session.execute(
+        select(
+            Repository.id.label("repository_id"),
+            Repository.full_name,
+            SyncCursor.synced_from,
+            SyncCursor.synced_until,
+            case(
+                (BackfillCheckpoint.status == "done", BackfillCheckpoint.start_at),
+                else_=None,
+            ).label("backfilled_from"),
+        )
+        .join(SyncCursor, SyncCursor.repository_id == Repository.id)
+        .outerjoin(BackfillCheckpoint, BackfillCheckpoint.repository_id == Repository.id)
+        .where(
+            func.lower(Repository.full_name).in_([name.lower() for name in full_names]),
+            SyncCursor.synced_until.is_not(None),
+        )
+    )
+    return [dict(row._mapping) for row in result]
+
+
+def _series_source(grain: str):
+    if grain == "day":
+        return DailyMetric, DailyMetric.date
+    return MetricRollup, MetricRollup.period_start
+
+
+def _grain_filter(table, grain: str) -> list:
+    return [] if table is DailyMetric else [MetricRollup.grain == grain]
+
+
+def _summed_activity(table=DailyMetric) -> list:
+    return [
+        func.coalesce(func.sum(getattr(table, field)), 0).label(field)
+        for field in ACTIVITY_FIELDS
+    ]
+
+
+def _daily_rows(result) -> List[Dict]:
+    return [
+        {"date": row.date.isoformat(), **{f: int(row._mapping[f]) for f in ACTIVITY_FIELDS}}
+        for row in result
+    ]
+
+
+async def window_totals(
+    session: AsyncSession,
+    previous_since: datetime,
+    since: datetime,
+    until: datetime,
+) -> List[Dict]:
+    """
+    Activity of every tracked repository in one grouped query.
+
+    Sums each activity field over ``[since, until)`` and commits over the
+    preceding ``[previous_since, since)`` for period-over-period change.
+    """
+    current = DailyMetric.date >= since
+    columns = [
+        func.coalesce(
+            func.sum(case((current, getattr(DailyMetric, field)), else_=0)), 0
+        ).label(field)
+        for field in ACTIVITY_FIELDS
+    ]
+    previous_commits = func.coalesce(
+        func.sum(case((current, 0), else_=DailyMetric.commits)), 0
+    ).label("previous_commits")
+    result = await session.execute(
+        select(Repository.full_name, *columns, previous_commits)
+        .join(Repository, Repository.id == DailyMetric.repository_id)
+        .where(DailyMetric.date >= previous_since, DailyMetric.date < until)
+        .group_by(Repository.full_name)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def prefix_totals_at(
+    session: AsyncSession,
+    full_names: List[str],
+    boundaries: List[datetime],
+) -> List[Dict[str, int]]:
+    """
+    Running totals of the given repositories, summed, just before each boundary.
+
+    Each repository contributes the cumulative columns of its last row before
+    the boundary: one index seek per repository, however long the history.
+    The sum of any field over ``[a, b)`` is then the value at ``b`` minus the
+    value at ``a``.
+    """
+    names = [name.lower() for name in full_names]
+    totals = []
+    for boundary in boundaries:
+        latest = (
+            select(*[getattr(DailyMetric, f"{f}_cumulative").label(f) for f in PREFIX_FIELDS])
+            .where(DailyMetric.repository_id == Repository.id, DailyMetric.date < boundary)
+            .order_by(DailyMetric.date.desc())
+            .limit(1)
+            .lateral()
+        )
+        row = (
+            await session.execute(
+                select(*[func.coalesce(func.sum(latest.c[f]), 0).label(f) for f in PREFIX_FIELDS])
+                .select_from(Repository)
+                .join(latest, true())
+                .where(func.lower(Repository.full_name).in_(names))
+            )
+        ).one()
+        totals.append({field: int(row._mapping[field]) for field in PREFIX_FIELDS})
+    return totals
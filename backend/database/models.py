@@ -51,12 +51,17 @@ class Repository(Base):
 
 
 class DailyMetric(Base):
-    """Daily aggregated metrics for a repository."""
+    """
+    Daily aggregated metrics for a repository.
+
+    Range-partitioned by month on ``date`` (see ``backend.database.partitions``),
+    so the partition key is part of the primary key.
+    """
     __tablename__ = "daily_metrics"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     repository_id = Column(UUID(as_uuid=True), ForeignKey("repositories.id"), nullable=False)
-    date = Column(DateTime, nullable=False)
+    date = Column(DateTime, primary_key=True)
 
     # Activity metrics
     commits = Column(Integer, default=0)
@@ -67,6 +72,16 @@ class DailyMetric(Base):
     issues_closed = Column(Integer, default=0)
     contributors = Column(Integer, default=0)
 
+    # Running totals of the activity metrics through this day (inclusive);
+    # a window's sum is the difference of two rows. Distinct contributors do
+    # not add up across days, so they have none.
+    commits_cumulative = Column(Integer, default=0)
+    prs_opened_cumulative = Column(Integer, default=0)
+    prs_merged_cumulative = Column(Integer, default=0)
+    prs_closed_cumulative = Column(Integer, default=0)
+    issues_opened_cumulative = Column(Integer, default=0)
+    issues_closed_cumulative = Column(Integer, default=0)
+
     # Engagement metrics
     stars = Column(Integer, default=0)
     forks = Column(Integer, default=0)
@@ -80,8 +95,86 @@ class DailyMetric(Base):
     repository = relationship("Repository", back_populates="metrics")
 
     __table_args__ = (
-        Index("idx_metrics_repo_date", "repository_id", "date"),
+        # Conflict target of the bulk upserts; includes the partition key as required
+        Index("idx_metrics_repo_date", "repository_id", "date", unique=True),
         Index("idx_metrics_date", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+
+class MetricRollup(Base):
+    """Weekly or monthly totals of a repository's DailyMetric rows."""
+    __tablename__ = "metric_rollups"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    repository_id = Column(UUID(as_uuid=True), ForeignKey("repositories.id"), nullable=False)
+    grain = Column(String(10), nullable=False)  # week (ISO, from Monday), month
+    period_start = Column(DateTime, nullable=False)
+
+    commits = Column(Integer, default=0)
+    prs_opened = Column(Integer, default=0)
+    prs_merged = Column(Integer, default=0)
+    prs_closed = Column(Integer, default=0)
+    issues_opened = Column(Integer, default=0)
+    issues_closed = Column(Integer, default=0)
+    contributors = Column(Integer, default=0)  # peak daily count; distinct counts do not add up
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index(
+            "idx_rollups_repo_grain_period", "repository_id", "grain", "period_start", unique=True
+        ),
+    )
+
+
+class SyncCursor(Base):
+    """Incremental sync position of a repository's DailyMetric rows."""
+    __tablename__ = "sync_cursors"
+
+    repository_id = Column(UUID(as_uuid=True), ForeignKey("repositories.id"), primary_key=True)
+    synced_from = Column(DateTime, nullable=True)  # where incremental counting began
+    synced_until = Column(DateTime, nullable=True)  # activity before this is counted
+    next_run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_sync_next_run", "next_run_at"),
+    )
+
+
+class BackfillCheckpoint(Base):
+    """Progress of a repository's historical backfill."""
+    __tablename__ = "backfill_checkpoints"
+
+    repository_id = Column(UUID(as_uuid=True), ForeignKey("repositories.id"), primary_key=True)
+    start_at = Column(DateTime, nullable=False)  # oldest day to fill
+    until_at = Column(DateTime, nullable=False)  # where incremental sync took over
+    commits_before = Column(DateTime, nullable=False)  # commit chunks done back to here
+    issues_page = Column(Integer, default=1)
+    last_issue_number = Column(Integer, nullable=True)
+    issues_done = Column(Boolean, default=False)
+    status = Column(String(20), default="pending")  # pending, running, done
+    lease_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_backfill_status", "status"),
+    )
+
+
+class IngestedBatch(Base):
+    """A batch of counts, or one named event, already added to DailyMetric."""
+    __tablename__ = "ingested_batches"
+
+    batch_id = Column(String(200), primary_key=True)  # webhook:<delivery id>, event:<repo>:<key>
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_ingested_batches_created", "created_at"),
     )
 
 
@@ -0,0 +1,161 @@
+"""
+Metric Partitions
+Monthly partitions of daily_metrics, raw data retention and cold compaction.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.metric_store import (
+    ROLLUP_GRAINS,
+    next_period,
+    period_start,
+    refresh_prefix_sums,
+    rollup_range,
+)
+from backend.database.models import DailyMetric
+
+PARENT = DailyMetric.__tablename__
+
+# Serialises partition DDL across app processes (any constant shared by all of them)
+PARTITION_LOCK_ID = 0x6862_6D70
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding ``month``, e.g. ``daily_metrics_y2024m03``."""
+    return f"{PARENT}_y{month:%Y}m{month:%m}"
+
+
+def months_between(first: datetime, end: datetime) -> List[datetime]:
+    """Starts of every month overlapping ``[first, end)``."""
+    months = [period_start(first, "month")]
+    while next_period(months[-1], "month") < end:
+        months.append(next_period(months[-1], "month"))
+    return months
+
+
+async def existing_partitions(session: AsyncSession) -> List[str]:
+    """Names of the partitions currently attached to daily_metrics."""
+    result = await session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT},
+    )
+    return sorted(result.scalars())
+
+
+async def ensure_partitions(session: AsyncSession, first: datetime, end: datetime) -> List[str]:
+    """
+    Create the monthly partitions covering ``[first, end)`` that do not exist yet.
+
+    Returns the names of the partitions created. Indexes declared on the
+    parent are created on each new partition automatically.
+    """
+    await session.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID})
+    existing = set(await existing_partitions(session))
+    created = []
+    for month in months_between(first, end):
+        name = partition_name(month)
+        if name in existing:
+            continue
+        # Bounds come from datetimes, never user input
+        await session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT}"
+                f" FOR VALUES FROM ('{month:%Y-%m-%d}')"
+                f" TO ('{next_period(month, 'month'):%Y-%m-%d}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def drop_raw_data(session: AsyncSession, before: datetime) -> int:
+    """
+    Clear ``raw_data`` on rows older than ``before``, returning how many were cleared.
+
+    The date bound prunes the scan to old partitions; rows already cleared
+    are skipped, so each row is rewritten once.
+    """
+    result = await session.execute(
+        update(DailyMetric)
+        .where(DailyMetric.date < before, DailyMetric.raw_data.is_not(None))
+        .values(raw_data=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def compact_partitions(session: AsyncSession, before: datetime) -> List[str]:
+    """
+    Fold every partition that ends on or before ``before`` into monthly rollups and drop it.
+
+    The month's rollups are re-summed from the partition first, then the
+    partition is detached and dropped along with its indexes. Running totals
+    of later rows are unaffected, and later recomputations carry the dropped
+    history forward from the monthly rollups.
+    """
+    await session.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID})
+    dropped = []
+    for name in await existing_partitions(session):
+        try:
+            month = datetime.strptime(name[len(PARENT):], "_y%Ym%m")
+        except ValueError:
+            continue
+        if next_period(month, "month") > before:
+            continue
+        await rollup_range(session, "month", month, next_period(month, "month"))
+        await session.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        await session.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+async def partition_existing_table(session: AsyncSession, months_ahead: int) -> int:
+    """
+    Convert an unpartitioned daily_metrics table in place, returning the rows moved.
+
+    The old table and its indexes are renamed aside, the partitioned table is
+    created with partitions for every month that has data, the rows are
+    copied, running totals and rollups are recomputed and the old table is
+    dropped, all in the session's transaction.
+    """
+    legacy = f"{PARENT}_unpartitioned"
+    await session.execute(text(f"ALTER TABLE {PARENT} RENAME TO {legacy}"))
+    for index in ("idx_metrics_repo_date", "idx_metrics_date", f"{PARENT}_pkey"):
+        await session.execute(text(f"ALTER INDEX IF EXISTS {index} RENAME TO {legacy}_{index}"))
+    await session.run_sync(lambda sync: DailyMetric.__table__.create(sync.connection()))
+
+    first, last = (await session.execute(text(f"SELECT min(date), max(date) FROM {legacy}"))).one()
+    now = datetime.utcnow()
+    first = first or now
+    end = max(last or now, now) + timedelta(days=31 * months_ahead)
+    await ensure_partitions(session, first, end)
+
+    # Copy the columns both tables have; the rest start from their defaults
+    result = await session.execute(
+        text(
+            "SELECT column_name FROM information_schema.columns"
+            " WHERE table_name = :legacy ORDER BY ordinal_position"
+        ),
+        {"legacy": legacy},
+    )
+    columns = ", ".join(c for c in result.scalars() if c in DailyMetric.__table__.c)
+    moved = await session.execute(
+        text(f"INSERT INTO {PARENT} ({columns}) SELECT {columns} FROM {legacy}")
+    )
+    await session.execute(text(f"DROP TABLE {legacy}"))
+
+    for grain in ROLLUP_GRAINS:
+        await rollup_range(session, grain, period_start(first, grain), end)
+    repository_ids = await session.scalars(select(DailyMetric.repository_id).distinct())
+    for repository_id in repository_ids.all():
+        await refresh_prefix_sums(session, repository_id, first)
+    return moved.rowcount
@@ -0,0 +1,350 @@
+"""
+Backfill Job
+Fills a year of DailyMetric history for newly tracked repositories.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.database.metric_store import IngestStats, add_daily_metrics
+from backend.database.models import BackfillCheckpoint, Repository, SyncCursor
+from backend.database.partitions import ensure_partitions
+from backend.hyperbeats.aggregator.leaderboard import leaderboard
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_session_factory_optional
+from backend.integrations.contributor_sketch import contributor_sketches
+from backend.integrations.github_client import GitHubClient
+from backend.integrations.github_models import IssueRecord
+
+# Chunks are bounded by time, so the live path's page and item caps do not apply
+UNBOUNDED = 1_000_000
+
+ISSUES_PER_PAGE = 100
+
+
+def _midnight(value: datetime) -> datetime:
+    return datetime(value.year, value.month, value.day)
+
+
+class BackfillJob:
+    """
+    Resumable backfill of DailyMetric history.
+
+    A checkpoint per repository covers ``days`` of history up to the point
+    where incremental sync took over (``SyncCursor.synced_from``), so the
+    two never count the same window. Commits are fetched in
+    ``chunk_days`` time slices walking back from that point. PRs and
+    issues come from one issues listing (which includes PRs) restricted to
+    items updated inside the window and sorted by creation, newest first;
+    issue numbers follow creation order, so items pushed onto an
+    already-read page by newly created ones are recognised and skipped.
+
+    Each chunk or page is bulk-written together with its checkpoint, so a
+    crash or a pause loses at most the chunk in flight. Before each request
+    the job waits until the token pool has more than ``1 - budget_share`` of
+    its quota left, leaving the rest of every window to live traffic.
+    ``ingested`` sums the rows written and the time spent writing them.
+    """
+
+    def __init__(
+        self,
+        client: Optional[GitHubClient] = None,
+        workers: Optional[int] = None,
+        days: Optional[int] = None,
+        chunk_days: Optional[int] = None,
+        budget_share: Optional[float] = None,
+        lease: Optional[float] = None,
+        tick: Optional[float] = None,
+    ):
+        self.client = client or GitHubClient()
+        self.workers = workers or settings.backfill_workers
+        self.days = days or settings.backfill_days
+        self.chunk_days = chunk_days or settings.backfill_chunk_days
+        self.budget_share = settings.backfill_budget_share if budget_share is None else budget_share
+        self.lease = lease or settings.backfill_lease
+        self.tick = tick or settings.backfill_tick
+        self.ingested = IngestStats()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start backfilling in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop backfilling; checkpoints keep the progress made so far."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                claimed = 0
+            if not claimed:
+                await asyncio.sleep(self.tick)
+
+    async def run_once(self) -> int:
+        """Backfill up to ``workers`` repositories in parallel, returning how many were claimed."""
+        session_factory = get_session_factory_optional()
+        if session_factory is None:
+            return 0
+
+        async with session_factory() as session:
+            await self._ensure_checkpoints(session)
+            claimed = await self._claim(session)
+            await session.commit()
+
+        await asyncio.gather(
+            *(self.backfill_repository(session_factory, *repository) for repository in claimed)
+        )
+        return len(claimed)
+
+    async def _ensure_checkpoints(self, session: AsyncSession) -> None:
+        """
+        Plan a backfill for every repository without one.
+
+        The window ends where incremental sync began. Repositories sync has
+        not reached yet get their cursor set to now, so sync picks up from
+        exactly where the backfill stops.
+        """
+        result = await session.execute(
+            select(Repository.id, SyncCursor.synced_from)
+            .outerjoin(SyncCursor, SyncCursor.repository_id == Repository.id)
+            .where(
+                ~select(BackfillCheckpoint.repository_id)
+                .where(BackfillCheckpoint.repository_id == Repository.id)
+                .exists()
+            )
+        )
+        now = datetime.utcnow().replace(microsecond=0)
+        earliest = None
+        for repository_id, synced_from in result:
+            until = synced_from or now
+            if synced_from is None:
+                await session.execute(
+                    insert(SyncCursor)
+                    .values(
+                        repository_id=repository_id,
+                        synced_from=until,
+                        synced_until=until,
+                        next_run_at=now,
+                    )
+                    .on_conflict_do_update(
+                        index_elements=[SyncCursor.repository_id],
+                        set_={"synced_from": until, "synced_until": until},
+                        where=SyncCursor.synced_until.is_(None),
+                    )
+                )
+            start_at = _midnight(until - timedelta(days=self.days))
+            earliest = min(earliest or start_at, start_at)
+            await session.execute(
+                insert(BackfillCheckpoint)
+                .values(
+                    repository_id=repository_id,
+                    start_at=start_at,
+                    until_at=until,
+                    commits_before=until,
+                    status="pending",
+                )
+                .on_conflict_do_nothing()
+            )
+        # Repositories synced long ago reach further back than maintenance prepares for
+        if earliest is not None:
+            await ensure_partitions(session, earliest, now)
+
+    async def _claim(self, session: AsyncSession) -> List[Tuple[UUID, str]]:
+        """Lease unfinished backfills that no other process is working on."""
+        now = datetime.utcnow()
+        lease_until = BackfillCheckpoint.lease_until
+        result = await session.execute(
+            select(BackfillCheckpoint.repository_id, Repository.full_name)
+            .join(Repository, Repository.id == BackfillCheckpoint.repository_id)
+            .where(
+                BackfillCheckpoint.status != "done",
+                or_(lease_until.is_(None), lease_until <= now),
+            )
+            .order_by(BackfillCheckpoint.created_at)
+            .limit(self.workers)
+            .with_for_update(of=BackfillCheckpoint, skip_locked=True)
+        )
+        claimed = [tuple(row) for row in result]
+        if claimed:
+            await session.execute(
+                update(BackfillCheckpoint)
+                .where(BackfillCheckpoint.repository_id.in_([row[0] for row in claimed]))
+                .values(status="running", lease_until=now + timedelta(seconds=self.lease))
+            )
+        return claimed
+
+    async def _wait_for_budget(self) -> None:
+        await self.client.token_pool.wait_for_headroom(1 - self.budget_share)
+
+    async def backfill_repository(
+        self,
+        session_factory: async_sessionmaker,
+        repository_id: UUID,
+        full_name: str,
+    ) -> None:
+        """Run one repository's backfill from its checkpoint to completion."""
+        owner, repo = full_name.split("/", 1)
+        try:
+            async with session_factory() as session:
+                checkpoint = await session.get(BackfillCheckpoint, repository_id)
+
+            while checkpoint.commits_before > checkpoint.start_at:
+                chunk_start = max(
+                    checkpoint.start_at,
+                    _midnight(checkpoint.commits_before - timedelta(days=self.chunk_days)),
+                )
+                await self._wait_for_budget()
+                delta = await self.client.get_activity(
+                    owner, repo, chunk_start, checkpoint.commits_before,
+                    kinds=("commits",), max_pages=UNBOUNDED, max_items=UNBOUNDED,
+                )
+                contributors = await contributor_sketches.add(full_name, delta.contributors)
+                checkpoint = await self._save(
+                    session_factory,
+                    repository_id,
+                    delta.counts,
+                    contributors,
+                    batch_id=f"backfill:{repository_id}:commits:{chunk_start:%Y-%m-%d}",
+                    commits_before=chunk_start,
+                )
+
+            while not checkpoint.issues_done:
+                await self._wait_for_budget()
+                items, has_next = await self.client.get_issues_page(
+                    owner, repo, checkpoint.start_at, checkpoint.issues_page, ISSUES_PER_PAGE
+                )
+                counts, last_number = self.count_issues(
+                    items,
+                    checkpoint.start_at,
+                    checkpoint.until_at,
+                    checkpoint.last_issue_number,
+                )
+                checkpoint = await self._save(
+                    session_factory,
+                    repository_id,
+                    counts,
+                    batch_id=f"backfill:{repository_id}:issues:{checkpoint.issues_page}",
+                    issues_page=checkpoint.issues_page + 1,
+                    last_issue_number=last_number,
+                    issues_done=not has_next,
+                )
+
+            await self._save(session_factory, repository_id, {}, status="done", lease_until=None)
+            await leaderboard.refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await self._record_failure(session_factory, repository_id, exc)
+
+    @staticmethod
+    def count_issues(
+        items: List[IssueRecord],
+        since: datetime,
+        until: datetime,
+        last_number: Optional[int],
+    ) -> Tuple[Dict[datetime, Dict[str, int]], Optional[int]]:
+        """
+        Bucket one page of the issues listing by the day each event happened.
+
+        Items numbered at or above ``last_number`` were counted from an
+        earlier page and are skipped. Returns the counts and the lowest
+        number seen, the next page's ``last_number``.
+        """
+        counts: Dict[datetime, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+        def add(field: str, moment: Optional[datetime]) -> None:
+            if moment is None:
+                return
+            if moment.tzinfo:
+                moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            if since <= moment < until:
+                counts[_midnight(moment)][field] += 1
+
+        seen: Set[int] = set()
+        for item in items:
+            if last_number is not None and item.number >= last_number:
+                continue
+            seen.add(item.number)
+            if item.is_pull_request:
+                add("prs_opened", item.created_at)
+                if item.merged_at:
+                    add("prs_merged", item.merged_at)
+                else:
+                    add("prs_closed", item.closed_at)
+            else:
+                add("issues_opened", item.created_at)
+                add("issues_closed", item.closed_at)
+
+        lowest = min(seen) if seen else last_number
+        return {day: dict(fields) for day, fields in counts.items()}, lowest
+
+    async def _save(
+        self,
+        session_factory: async_sessionmaker,
+        repository_id: UUID,
+        counts: Dict[datetime, Dict[str, int]],
+        contributors: Optional[Dict[datetime, int]] = None,
+        batch_id: Optional[str] = None,
+        **progress,
+    ) -> BackfillCheckpoint:
+        """
+        Write a chunk's rows and advance the checkpoint in one transaction.
+
+        ``batch_id`` names the chunk, so a worker whose lease ran out while
+        another took over does not add the same chunk a second time.
+        """
+        async with session_factory() as session:
+            self.ingested.add(
+                await add_daily_metrics(session, repository_id, counts, contributors, batch_id)
+            )
+            progress.setdefault("lease_until", datetime.utcnow() + timedelta(seconds=self.lease))
+            await session.execute(
+                update(BackfillCheckpoint)
+                .where(BackfillCheckpoint.repository_id == repository_id)
+                .values(last_error=None, **progress)
+            )
+            await session.commit()
+            return await session.get(BackfillCheckpoint, repository_id)
+
+    async def _record_failure(
+        self,
+        session_factory: async_sessionmaker,
+        repository_id: UUID,
+        exc: Exception,
+    ) -> None:
+        """Release the lease after a short pause; the next claim resumes from the checkpoint."""
+        try:
+            async with session_factory() as session:
+                await session.execute(
+                    update(BackfillCheckpoint)
+                    .where(BackfillCheckpoint.repository_id == repository_id)
+                    .values(
+                        lease_until=datetime.utcnow() + timedelta(seconds=self.tick),
+                        last_error=f"{type(exc).__name__}: {exc}"[:500],
+                    )
+                )
+                await session.commit()
+        except Exception:
+            pass
+
+
+# Global backfill job
+backfill_job = BackfillJob()
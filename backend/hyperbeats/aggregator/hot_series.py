@@ -0,0 +1,216 @@
+"""
+Hot Series
+In-process columnar copies of the most requested repositories' daily activity.
+"""
+
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from backend.database.metric_store import ACTIVITY_FIELDS, next_period, period_start
+from backend.hyperbeats.config import settings
+
+ENGAGEMENT_FIELDS = ("stars", "forks", "watchers")
+
+
+class RepoSeries:
+    """
+    One repository's daily activity over ``[first, end)``.
+
+    Each field is a typed ``array`` of 32-bit counters, one slot per day,
+    read through zero-copy NumPy views; about 28 bytes per day for all
+    activity fields. ``engagement`` holds the latest stars, forks and
+    watchers.
+    """
+
+    __slots__ = ("first", "end", "columns", "engagement", "expires_at")
+
+    def __init__(self, first: datetime, end: datetime, expires_at: datetime):
+        self.first = first
+        self.end = end
+        self.expires_at = expires_at
+        length = (end - first).days
+        self.columns = {field: array("i", bytes(4 * length)) for field in ACTIVITY_FIELDS}
+        self.engagement = dict.fromkeys(ENGAGEMENT_FIELDS, 0)
+
+    def _offset(self, day: datetime) -> int:
+        return min(max((day - self.first).days, 0), (self.end - self.first).days)
+
+    def add(self, day: datetime, fields: Dict[str, int]) -> None:
+        """Add counts to a day inside the series; other days are ignored."""
+        if not self.first <= day < self.end:
+            return
+        offset = (day - self.first).days
+        for field, value in fields.items():
+            if field in self.columns:
+                self.columns[field][offset] += value
+
+    def raise_contributors(self, day: datetime, count: int) -> None:
+        """Raise a day's distinct contributor count, never lowering it."""
+        if self.first <= day < self.end:
+            column = self.columns["contributors"]
+            offset = (day - self.first).days
+            column[offset] = max(column[offset], count)
+
+    def totals(self, first: datetime, end: datetime) -> Dict[str, int]:
+        """Each field summed over the days of ``[first, end)`` inside the series."""
+        start, stop = self._offset(first), self._offset(end)
+        return {
+            field: int(np.frombuffer(column, dtype=np.int32)[start:stop].sum(dtype=np.int64))
+            for field, column in self.columns.items()
+        }
+
+    def per_period(
+        self,
+        first: datetime,
+        end: datetime,
+        grain: str,
+        fields: Iterable[str] = ACTIVITY_FIELDS,
+    ) -> Dict[datetime, Dict[str, int]]:
+        """Sums of ``fields`` per ``grain`` period over the days of ``[first, end)``."""
+        first, end = max(first, self.first), min(end, self.end)
+        if first >= end:
+            return {}
+        periods, offsets = [], []
+        period = period_start(first, grain)
+        while period < end:
+            periods.append(period)
+            offsets.append(max((period - first).days, 0))
+            period = next_period(period, grain)
+
+        start, stop = self._offset(first), self._offset(end)
+        sums = {
+            field: np.add.reduceat(
+                np.frombuffer(self.columns[field], dtype=np.int32)[start:stop],
+                offsets,
+                dtype=np.int64,
+            )
+            for field in fields
+        }
+        return {
+            period: {field: int(sums[field][i]) for field in sums}
+            for i, period in enumerate(periods)
+        }
+
+
+class HotSeriesStore:
+    """
+    Bounded LRU of ``RepoSeries`` for the repositories requested most.
+
+    Holds at most ``max_repos`` series of at most ``days`` days each, so
+    memory stays fixed however many repositories are tracked. A repository
+    is admitted on its second miss, so one-off requests keep reading
+    rollups instead of pulling a year of days into memory. Series only
+    cover days DailyMetric has complete rows for up to the current day.
+
+    Webhooks and the sync worker apply their increments to loaded series in
+    place. A series expires after ``ttl`` seconds, or when its last day
+    ends, and is reloaded, which also picks up writes made by other
+    processes.
+    """
+
+    def __init__(
+        self,
+        max_repos: Optional[int] = None,
+        days: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.max_repos = settings.hot_series_max_repos if max_repos is None else max_repos
+        self.days = days or settings.hot_series_days
+        self.ttl = ttl or settings.hot_series_ttl
+        self._series: "OrderedDict[str, RepoSeries]" = OrderedDict()
+        self._missed: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def lookup(self, repos: Iterable[str], now: Optional[datetime] = None) -> Dict[str, RepoSeries]:
+        """Loaded, unexpired series of ``repos``, keyed by lowercased name."""
+        now = now or datetime.utcnow()
+        found = {}
+        for name in {repo.lower() for repo in repos}:
+            series = self._series.get(name)
+            if series is None:
+                continue
+            if series.expires_at <= now:
+                del self._series[name]
+                continue
+            self._series.move_to_end(name)
+            found[name] = series
+        return found
+
+    def admissions(self, repos: Iterable[str]) -> List[str]:
+        """Of repositories just missed, the ones missed before and now worth loading."""
+        if self.max_repos <= 0:
+            return []
+        admit = []
+        for name in {repo.lower() for repo in repos}:
+            if name in self._series:
+                continue
+            if name in self._missed:
+                del self._missed[name]
+                admit.append(name)
+                continue
+            self._missed[name] = None
+            if len(self._missed) > 4 * self.max_repos:
+                self._missed.popitem(last=False)
+        return admit
+
+    def load(
+        self,
+        repo: str,
+        first: datetime,
+        end: datetime,
+        rows: List[Dict],
+        now: Optional[datetime] = None,
+    ) -> Optional[RepoSeries]:
+        """Store a repository's ``[first, end)`` days from its DailyMetric rows."""
+        now = now or datetime.utcnow()
+        first = max(first, end - timedelta(days=self.days))
+        if self.max_repos <= 0 or first >= end or end <= now:
+            return None
+        series = RepoSeries(first, end, min(now + timedelta(seconds=self.ttl), end))
+        engaged = [row for row in rows if any(row.get(field) for field in ENGAGEMENT_FIELDS)]
+        for row in rows:
+            series.add(row["date"], {field: row[field] for field in ACTIVITY_FIELDS})
+        if engaged:
+            latest = max(engaged, key=lambda row: row["date"])
+            series.engagement = {field: latest[field] for field in ENGAGEMENT_FIELDS}
+
+        name = repo.lower()
+        self._series[name] = series
+        self._series.move_to_end(name)
+        while len(self._series) > self.max_repos:
+            self._series.popitem(last=False)
+        return series
+
+    def record(self, repo: str, counts: Dict[datetime, Dict[str, int]]) -> None:
+        """Apply increments just written to DailyMetric to a loaded series."""
+        series = self._series.get(repo.lower())
+        if series is not None:
+            for day, fields in counts.items():
+                series.add(day, fields)
+
+    def raise_contributors(self, repo: str, contributors: Dict[datetime, int]) -> None:
+        """Apply raised daily contributor counts to a loaded series."""
+        series = self._series.get(repo.lower())
+        if series is not None:
+            for day, count in contributors.items():
+                series.raise_contributors(day, count)
+
+    def set_engagement(self, repo: str, stars: int, forks: int, watchers: int) -> None:
+        """Apply a repository's latest engagement totals to a loaded series."""
+        series = self._series.get(repo.lower())
+        if series is not None:
+            series.engagement = {"stars": stars, "forks": forks, "watchers": watchers}
+
+    def clear(self) -> None:
+        self._series.clear()
+        self._missed.clear()
+
+
+# Global hot series store
+hot_series = HotSeriesStore()
@@ -0,0 +1,200 @@
+"""
+Leaderboard
+Precomputed activity ranking of every tracked repository.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.database.metric_store import ACTIVITY_FIELDS, window_totals
+from backend.hyperbeats.aggregator.metrics_calculator import MetricsCalculator, TREND_LABELS
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_redis_optional, get_session_factory_optional
+from backend.integrations.contributor_sketch import contributor_sketches
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_DAYS = {"7d": 7, "30d": 30, "90d": 90}
+
+
+class Leaderboard:
+    """
+    Activity ranking kept in a Redis sorted set per timeframe.
+
+    ``refresh`` reads every repository's window totals from DailyMetric in
+    one grouped query, scores them all in one vectorized pass and swaps the
+    new ranking in atomically. It runs after ingest (sync, backfill and
+    webhooks), at most once per ``min_interval``; requests only read a page
+    of the set, starting one background rebuild when there is none to read.
+    Each member's metrics are kept in a companion hash for display.
+    """
+
+    KEY_PREFIX = "leaderboard:"
+
+    def __init__(self, min_interval: Optional[float] = None, ttl: int = 7 * 86400):
+        self.min_interval = (
+            settings.leaderboard_refresh_interval if min_interval is None else min_interval
+        )
+        self.ttl = ttl
+        self._refreshed_at = 0.0
+        self._rebuild: Optional[asyncio.Task] = None
+
+    def _keys(self, timeframe: str) -> Tuple[str, str]:
+        return f"{self.KEY_PREFIX}{timeframe}", f"{self.KEY_PREFIX}{timeframe}:details"
+
+    @staticmethod
+    def rank(rows: List[Dict], contributors: Optional[Dict[str, int]] = None) -> Dict[str, Dict]:
+        """
+        Score window totals for many repositories at once.
+
+        ``rows`` come from ``window_totals``. ``contributors`` overrides the
+        summed daily counts with distinct counts when sketches are available.
+        """
+        names = [row["full_name"] for row in rows]
+        columns = {
+            field: np.fromiter((row[field] for row in rows), dtype=np.int64, count=len(rows))
+            for field in (*ACTIVITY_FIELDS, "previous_commits")
+        }
+        if contributors:
+            # Repositories without sketches keep their summed daily counts
+            columns["contributors"] = np.fromiter(
+                (contributors.get(name) or row["contributors"] for name, row in zip(names, rows)),
+                dtype=np.int64,
+                count=len(rows),
+            )
+
+        scored = MetricsCalculator.calculate_activity_scores(
+            columns["commits"],
+            columns["prs_merged"],
+            columns["issues_closed"],
+            columns["contributors"],
+            previous_commits=columns["previous_commits"],
+        )
+        trends = TREND_LABELS[scored["trend"] + 1]
+
+        return {
+            name: {
+                "score": float(scored["score"][i]),
+                "change_percent": float(scored["change_percent"][i]),
+                "trend": str(trends[i]),
+                "commits": int(columns["commits"][i]),
+                "prs_merged": int(columns["prs_merged"][i]),
+                "issues_closed": int(columns["issues_closed"][i]),
+                "contributors": int(columns["contributors"][i]),
+            }
+            for i, name in enumerate(names)
+        }
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Rebuild every timeframe's ranking from DailyMetric; False if skipped."""
+        session_factory = get_session_factory_optional()
+        redis_client = get_redis_optional()
+        if session_factory is None or redis_client is None:
+            return False
+        if not force and time.monotonic() - self._refreshed_at < self.min_interval:
+            return False
+        self._refreshed_at = time.monotonic()
+
+        today = datetime.utcnow()
+        until = datetime(today.year, today.month, today.day) + timedelta(days=1)
+        for timeframe, days in TIMEFRAME_DAYS.items():
+            since = until - timedelta(days=days)
+            async with session_factory() as session:
+                rows = await window_totals(session, since - timedelta(days=days), since, until)
+            names = [row["full_name"] for row in rows]
+            contributors = await contributor_sketches.count_each(
+                names, since, until - timedelta(days=1)
+            )
+            await self._store(timeframe, self.rank(rows, contributors))
+        return True
+
+    def rebuild_in_background(self) -> None:
+        """
+        Start a ``refresh`` for readers that found no ranking.
+
+        At most one runs at a time, and it is rate limited like any other,
+        so an empty ranking does not make every request rebuild.
+        """
+        if self._rebuild is None or self._rebuild.done():
+            self._rebuild = asyncio.create_task(self._refresh_logged())
+
+    async def _refresh_logged(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("Leaderboard rebuild failed")
+
+    async def _store(self, timeframe: str, ranking: Dict[str, Dict]) -> None:
+        """Swap in a new ranking so readers never see a half-written one."""
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return
+        key, details_key = self._keys(timeframe)
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                if not ranking:
+                    pipe.delete(key, details_key)
+                else:
+                    staging, staging_details = f"{key}:staging", f"{details_key}:staging"
+                    pipe.delete(staging, staging_details)
+                    pipe.zadd(staging, {name: entry["score"] for name, entry in ranking.items()})
+                    pipe.hset(
+                        staging_details,
+                        mapping={
+                            name: json.dumps({**entry, "updated_at": time.time()})
+                            for name, entry in ranking.items()
+                        },
+                    )
+                    pipe.rename(staging, key)
+                    pipe.rename(staging_details, details_key)
+                    pipe.expire(key, self.ttl)
+                    pipe.expire(details_key, self.ttl)
+                await pipe.execute()
+        except Exception:
+            pass
+
+    async def page(
+        self,
+        timeframe: str,
+        offset: int,
+        limit: int,
+    ) -> Optional[Tuple[int, List[Dict]]]:
+        """
+        One page of a ranking, best first, with the total number of repositories.
+
+        Details are read after the page, so a ranking swapped in between can
+        leave a name without them; such entries are skipped. Returns None
+        when no ranking is available.
+        """
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return None
+        key, details_key = self._keys(timeframe)
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.zcard(key)
+                pipe.zrevrange(key, offset, offset + limit - 1)
+                total, names = await pipe.execute()
+            details = await redis_client.hmget(details_key, names) if names else []
+        except Exception:
+            return None
+        if not total:
+            return None
+
+        entries = []
+        for rank, (name, raw) in enumerate(zip(names, details), start=offset + 1):
+            if not raw:
+                continue
+            entry = json.loads(raw)
+            entries.append({"rank": rank, "repository": name, **entry})
+        return total, entries
+
+
+# Global leaderboard
+leaderboard = Leaderboard()
@@ -0,0 +1,134 @@
+"""
+Metric Maintenance
+Creates, trims and compacts daily_metrics partitions in the background.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from backend.cache.cache_manager import cache_manager
+from backend.database.metric_store import next_period, period_start, purge_batches
+from backend.database.partitions import compact_partitions, drop_raw_data, ensure_partitions
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_session_factory_optional
+
+logger = logging.getLogger(__name__)
+
+
+class MetricMaintenance:
+    """
+    Periodic upkeep of the month-partitioned daily_metrics table.
+
+    Each run creates any missing partitions from the backfill horizon
+    through ``months_ahead`` months from now, clears ``raw_data`` older than
+    ``raw_data_days`` and compacts partitions older than
+    ``compact_after_days`` into monthly rollups, dropping them with their
+    indexes. Index size therefore stays bounded by the hot window. Each run
+    also forgets ingested batch ids older than ``batch_retention_days`` and
+    deletes expired objects from the cache's object store. The first
+    run happens on ``start``, before the sync and backfill workers write.
+    """
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        months_ahead: Optional[int] = None,
+        raw_data_days: Optional[int] = None,
+        compact_after_days: Optional[int] = None,
+        batch_retention_days: Optional[int] = None,
+    ):
+        self.interval = interval or settings.metrics_maintenance_interval
+        self.months_ahead = months_ahead or settings.metrics_partition_months_ahead
+        self.raw_data_days = raw_data_days or settings.metrics_raw_data_days
+        self.compact_after_days = compact_after_days or settings.metrics_compact_after_days
+        self.batch_retention_days = (
+            batch_retention_days or settings.metrics_batch_retention_days
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Run once now, then keep running in the background."""
+        if self._task is not None:
+            return
+        try:
+            await self.run_once()
+        except Exception:
+            logger.exception("Metric maintenance failed")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background runs."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Metric maintenance failed")
+
+    async def ensure_current(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Create this month's and next month's partitions if missing.
+
+        Runs at startup whether or not maintenance is enabled, since writes
+        to a month without a partition fail. Failures are logged, not raised.
+        """
+        session_factory = get_session_factory_optional()
+        if session_factory is None:
+            return []
+        month = period_start(now or datetime.utcnow(), "month")
+        end = next_period(next_period(month, "month"), "month")
+        try:
+            async with session_factory() as session:
+                created = await ensure_partitions(session, month, end)
+                await session.commit()
+        except Exception:
+            logger.exception("Creating current daily_metrics partitions failed")
+            return []
+        return created
+
+    async def run_once(self) -> Dict:
+        """One maintenance pass, returning what it created, cleared, compacted, forgot and purged."""
+        purged = 0
+        if cache_manager.objects is not None:
+            purged = await cache_manager.objects.purge_expired()
+
+        session_factory = get_session_factory_optional()
+        if session_factory is None:
+            return {"purged": purged}
+
+        now = datetime.utcnow()
+        horizon = now - timedelta(days=self.compact_after_days)
+        first = max(horizon, now - timedelta(days=settings.backfill_days + 31))
+        async with session_factory() as session:
+            created = await ensure_partitions(
+                session, first, now + timedelta(days=31 * self.months_ahead)
+            )
+            cleared = await drop_raw_data(session, now - timedelta(days=self.raw_data_days))
+            compacted = await compact_partitions(session, horizon)
+            forgotten = await purge_batches(
+                session, now - timedelta(days=self.batch_retention_days)
+            )
+            await session.commit()
+        return {
+            "created": created,
+            "cleared": cleared,
+            "compacted": compacted,
+            "forgotten": forgotten,
+            "purged": purged,
+        }
+
+
+# Global metric maintenance
+metric_maintenance = MetricMaintenance()
@@ -3,12 +3,32 @@ Metrics Calculator
 Calculates derived metrics from raw repository data.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
 
+import numpy as np
 from pydantic import BaseModel
 
 
+# Activity score: weight of each metric and the value at which it maxes out
+SCORE_WEIGHTS = {
+    "commits": 0.4,
+    "prs_merged": 0.3,
+    "issues_closed": 0.2,
+    "contributors": 0.1,
+}
+SCORE_CAPS = {
+    "commits": 100,
+    "prs_merged": 20,
+    "issues_closed": 30,
+    "contributors": 10,
+}
+
+# Change (in percent) beyond which a trend is "up" or "down"
+TREND_THRESHOLD = 5.0
+TREND_LABELS = np.array(["down", "stable", "up"])
+
+
 class TimeSeriesPoint(BaseModel):
     """Single data point in a time series."""
     date: datetime
@@ -16,6 +36,42 @@ class TimeSeriesPoint(BaseModel):
     label: Optional[str] = None
 
 
+class SeriesColumns:
+    """
+    Columnar daily time series: one list of dates and one value list per metric.
+
+    Cheap to build for long ranges; convert to ``TimeSeriesPoint`` models
+    with ``points`` only where a response needs them.
+    """
+
+    __slots__ = ("dates", "values")
+
+    def __init__(self, dates: List[datetime], values: Dict[str, List[float]]):
+        self.dates = dates
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def points(self, metric_key: str) -> List[TimeSeriesPoint]:
+        """One metric as API models."""
+        return [
+            TimeSeriesPoint(date=date, value=value)
+            for date, value in zip(self.dates, self.values[metric_key])
+        ]
+
+
+def _point_day(value: Any) -> Optional[datetime]:
+    """UTC calendar day of a data point's date, given as a datetime or ISO string."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, value.day)
+
+
 class MetricsResult(BaseModel):
     """Result of metrics calculation."""
     metric_name: str
@@ -23,7 +79,7 @@ class MetricsResult(BaseModel):
     previous_value: float
     change_percent: float
     trend: str  # up, down, stable
-    time_series: List[TimeSeriesPoint]
+    time_series: List[TimeSeriesPoint] = []
 
 
 class MetricsCalculator:
@@ -40,25 +96,66 @@ class MetricsCalculator:
         Calculate an activity score (0-100).
         Weighted formula based on different activity types.
         """
-        # Weights for different metrics
-        weights = {
-            "commits": 0.4,
-            "prs_merged": 0.3,
-            "issues_closed": 0.2,
-            "contributors": 0.1,
+        values = {
+            "commits": commits,
+            "prs_merged": prs_merged,
+            "issues_closed": issues_closed,
+            "contributors": contributors,
         }
 
-        # Normalize each metric (assuming max values)
-        normalized = {
-            "commits": min(commits / 100, 1.0),
-            "prs_merged": min(prs_merged / 20, 1.0),
-            "issues_closed": min(issues_closed / 30, 1.0),
-            "contributors": min(contributors / 10, 1.0),
+        # Normalize each metric against its cap and weight it
+        score = sum(
+            min(values[k] / SCORE_CAPS[k], 1.0) * SCORE_WEIGHTS[k] for k in SCORE_WEIGHTS
+        )
+        return round(score * 100, 2)
+
+    @staticmethod
+    def calculate_activity_scores(
+        commits: np.ndarray,
+        prs_merged: np.ndarray,
+        issues_closed: np.ndarray,
+        contributors: np.ndarray,
+        previous_commits: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score many repositories in one vectorized pass.
+
+        Takes one array per metric, aligned by repository, and applies the
+        same formulas as ``calculate_activity_score`` and
+        ``calculate_velocity`` to all of them at once. Returns ``score``,
+        commit ``change_percent`` against ``previous_commits`` and ``trend``
+        (-1 down, 0 stable, 1 up; index ``TREND_LABELS`` with ``trend + 1``).
+        """
+        values = {
+            "commits": np.asarray(commits, dtype=np.float64),
+            "prs_merged": np.asarray(prs_merged, dtype=np.float64),
+            "issues_closed": np.asarray(issues_closed, dtype=np.float64),
+            "contributors": np.asarray(contributors, dtype=np.float64),
         }
 
-        # Calculate weighted score
-        score = sum(normalized[k] * weights[k] for k in weights)
-        return round(score * 100, 2)
+        score = np.zeros_like(values["commits"])
+        for key, weight in SCORE_WEIGHTS.items():
+            score += np.minimum(values[key] / SCORE_CAPS[key], 1.0) * weight
+
+        current = values["commits"]
+        previous = (
+            np.zeros_like(current)
+            if previous_commits is None
+            else np.asarray(previous_commits, dtype=np.float64)
+        )
+        safe_previous = np.where(previous == 0, 1.0, previous)
+        change = np.where(
+            previous == 0,
+            np.where(current > 0, 100.0, 0.0),
+            (current - previous) / safe_previous * 100,
+        )
+        trend = (change > TREND_THRESHOLD).astype(np.int8) - (change < -TREND_THRESHOLD)
+
+        return {
+            "score": np.round(score * 100, 2),
+            "change_percent": np.round(change, 2),
+            "trend": trend.astype(np.int8),
+        }
 
     @staticmethod
     def calculate_velocity(
@@ -71,46 +168,97 @@ class MetricsCalculator:
         else:
             change_percent = ((current_commits - previous_commits) / previous_commits) * 100
 
+        if change_percent > TREND_THRESHOLD:
+            trend = "up"
+        elif change_percent < -TREND_THRESHOLD:
+            trend = "down"
+        else:
+            trend = "stable"
+
         return {
             "current": current_commits,
             "previous": previous_commits,
             "change_percent": round(change_percent, 2),
-            "trend": "up" if change_percent > 5 else "down" if change_percent < -5 else "stable",
+            "trend": trend,
         }
 
+    @staticmethod
+    def bucket_time_series(
+        data_points: Iterable[Dict],
+        metric_keys: Iterable[str],
+        timeframe: str = "7d",
+        end_date: Optional[datetime] = None,
+    ) -> SeriesColumns:
+        """
+        Bucket data points into one value per day for several metrics at once.
+
+        Point days are located among the day boundaries with one
+        ``searchsorted`` and each metric column is filled with ``np.add.at``,
+        so no per-day scan over the points is needed. Points outside the
+        range or without a date are ignored.
+
+        Several points on the same UTC day are summed. Callers that used to
+        rely on only the first point of a day counting must pass one point
+        per day.
+        """
+        days = {"1d": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365}.get(timeframe, 7)
+        metric_keys = list(metric_keys)
+
+        end_date = end_date or datetime.utcnow()
+        start_date = end_date - timedelta(days=days)
+        first_day = datetime(start_date.year, start_date.month, start_date.day)
+        dates = [start_date + timedelta(days=i) for i in range(days + 1)]
+
+        dated = [
+            (day, point)
+            for point in data_points
+            if (day := _point_day(point.get("date"))) is not None
+        ]
+        point_days = np.array([day for day, _ in dated], dtype="datetime64[D]")
+        edges = np.datetime64(first_day, "D") + np.arange(len(dates) + 1)
+        offsets = np.searchsorted(edges, point_days, side="right") - 1
+        inside = (offsets >= 0) & (offsets < len(dates))
+
+        values = {}
+        for key in metric_keys:
+            column = np.zeros(len(dates))
+            amounts = np.fromiter(
+                (float(point.get(key) or 0) for _, point in dated),
+                dtype=np.float64,
+                count=len(dated),
+            )
+            np.add.at(column, offsets[inside], amounts[inside])
+            values[key] = column.tolist()
+
+        return SeriesColumns(dates, values)
+
     @staticmethod
     def generate_time_series(
         data_points: List[Dict],
         metric_key: str,
         timeframe: str = "7d",
     ) -> List[TimeSeriesPoint]:
-        """Generate time series data for charting."""
-        days = {"1d": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365}.get(timeframe, 7)
-        
-        # Generate date range
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-        
-        # Create time series points
-        series = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            # Find data for this date
-            value = 0.0
-            for point in data_points:
-                point_date = point.get("date")
-                if point_date and point_date.date() == current_date.date():
-                    value = float(point.get(metric_key, 0))
-                    break
-            
-            series.append(TimeSeriesPoint(
-                date=current_date,
-                value=value,
-            ))
-            current_date += timedelta(days=1)
-        
-        return series
+        """Generate time series data for charting; same-day points are summed."""
+        columns = MetricsCalculator.bucket_time_series(data_points, [metric_key], timeframe)
+        return columns.points(metric_key)
+
+    @staticmethod
+    def period_result(
+        metric_name: str,
+        current: float,
+        previous: float,
+        time_series: Optional[List[TimeSeriesPoint]] = None,
+    ) -> MetricsResult:
+        """A metric's value compared with the period before it."""
+        velocity = MetricsCalculator.calculate_velocity(current, previous)
+        return MetricsResult(
+            metric_name=metric_name,
+            current_value=current,
+            previous_value=previous,
+            change_percent=velocity["change_percent"],
+            trend=velocity["trend"],
+            time_series=time_series or [],
+        )
 
     @staticmethod
     def calculate_growth_rate(
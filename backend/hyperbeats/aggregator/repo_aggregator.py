@@ -3,64 +3,167 @@ Repository Aggregator
 Combines metrics from multiple GitHub repositories.
 """
 
-from datetime import datetime
-from typing import Dict, List, Set
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
 
-from backend.integrations.github_client import GitHubClient
-from backend.integrations.github_models import AggregatedMetrics, RepoStats
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.metric_store import (
+    daily_totals,
+    daily_totals_between,
+    next_period,
+    period_start,
+    prefix_totals_at,
+    repository_days,
+    stored_coverage,
+)
+from backend.hyperbeats.aggregator.hot_series import hot_series
+from backend.hyperbeats.aggregator.metrics_calculator import MetricsCalculator, MetricsResult
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_session_factory_optional
+from backend.integrations.circuit_breaker import CLOSED, CircuitOpenError
+from backend.integrations.contributor_sketch import contributor_sketches
+from backend.integrations.github_client import GitHubClient, timeframe_start
+from backend.integrations.github_graphql import GitHubGraphQLClient
+from backend.integrations.github_models import (
+    ActivityDelta,
+    ActivitySeries,
+    AggregatedMetrics,
+    RepoStats,
+    SourceRange,
+)
+from backend.integrations.singleflight import repo_stats_flight
+
+TIMEFRAME_DAYS = {"1d": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365}
+
+# Metrics compared with the previous period; distinct contributors do not add up over days
+COMPARED_METRICS = ("commits", "prs_merged", "issues_closed")
+
+# Chart series keys and the DailyMetric fields they plot
+SERIES_FIELDS = {"commits": "commits", "prs": "prs_merged", "issues": "issues_closed"}
+
+
+def _midnight(value: datetime) -> datetime:
+    return datetime(value.year, value.month, value.day)
+
+
+def choose_grain(days: int, budget: Optional[int] = None) -> str:
+    """
+    The coarsest series grain that still gives at least ``budget`` points over ``days``.
+
+    Long ranges then read a few weekly or monthly rollup rows per repo
+    instead of one row per day.
+    """
+    budget = budget or settings.chart_point_budget
+    for grain, length in (("month", 30), ("week", 7)):
+        if days // length >= budget:
+            return grain
+    return "day"
+
+
+def stored_days(
+    coverage: Dict,
+    now: datetime,
+    freshness: float,
+) -> Optional[Tuple[datetime, datetime]]:
+    """
+    The ``[first, end)`` days a repository's stored rows are complete for.
+
+    History starts at the completed backfill, or else at the first whole day
+    incremental sync counted. A cursor synced within ``freshness`` seconds
+    stands for the current day; an older one leaves the day it stopped in
+    (and everything after) to be fetched live.
+    """
+    start = coverage["backfilled_from"] or coverage["synced_from"]
+    synced_until = coverage["synced_until"]
+    if start is None or synced_until is None:
+        return None
+
+    first = _midnight(start)
+    if first < start:
+        first += timedelta(days=1)
+    if (now - synced_until).total_seconds() <= freshness:
+        end = _midnight(now) + timedelta(days=1)
+    else:
+        end = _midnight(synced_until)
+    return (first, end) if first < end else None
 
 
 class RepositoryAggregator:
     """Combine metrics from multiple GitHub repos."""
 
     def __init__(self):
-        self.github_client = GitHubClient()
+        if settings.github_backend == "graphql":
+            self.github_client = GitHubGraphQLClient()
+        else:
+            self.github_client = GitHubClient()
 
     async def aggregate_repos(
         self,
         repo_list: List[str],
         timeframe: str = "7d",
+        max_concurrency: Optional[int] = None,
+        repo_timeout: Optional[float] = None,
     ) -> AggregatedMetrics:
         """
         Aggregate activity across repos.
+
+        Repos are fetched concurrently, at most ``max_concurrency`` at a time,
+        and each fetch is bounded by ``repo_timeout``. Results keep the order
+        of ``repo_list`` regardless of completion order. Totals count items
+        created in the window by their current state, which stored daily
+        rows (counted on the day each event happened) cannot reproduce, so
+        hot series are not used here.
         
         Args:
             repo_list: List of repos in "owner/repo" format
             timeframe: Time window (1d, 7d, 30d, 90d, 1y)
+            max_concurrency: Max repos fetched at once (1 = sequential)
+            repo_timeout: Per-repo timeout in seconds
             
         Returns:
             AggregatedMetrics with combined and per-repo data
+
+        Raises:
+            CircuitOpenError: If repos failed while the GitHub circuit is open,
+                so callers can serve their last good result instead
         """
         per_repo: Dict[str, RepoStats] = {}
-        all_contributors: Set[str] = set()
         errors: List[str] = []
 
-        async with self.github_client as client:
-            for repo in repo_list:
-                try:
-                    # Parse owner/repo
-                    if "/" not in repo:
-                        errors.append(f"Invalid repo format: {repo}")
-                        continue
+        concurrency = max(1, max_concurrency or settings.aggregator_max_concurrency)
+        timeout = repo_timeout or settings.aggregator_repo_timeout
+        semaphore = asyncio.Semaphore(concurrency)
 
-                    owner, name = repo.split("/", 1)
+        async with self.github_client as client:
+            if isinstance(client, GitHubGraphQLClient):
+                results = await self._fetch_batched(
+                    client, repo_list, timeframe, concurrency, timeout
+                )
+            else:
+                results = await self._fetch_each(
+                    client, repo_list, timeframe, semaphore, timeout
+                )
 
-                    # Fetch stats
-                    stats = await client.get_repo_stats(owner, name, timeframe)
-                    per_repo[repo] = stats
+        for repo, (stats, error) in zip(repo_list, results):
+            if error:
+                errors.append(error)
+                continue
 
-                    # Track unique contributors (would need commit data for accuracy)
-                    # For now, we count per-repo contributors
+            per_repo[repo] = stats
 
-                except Exception as e:
-                    errors.append(f"Failed to fetch {repo}: {str(e)}")
-                    continue
+        # Partial data while GitHub is down would be cached as if it were good
+        breaker = self.github_client.breaker
+        if errors and breaker is not None and breaker.state != CLOSED:
+            raise CircuitOpenError(f"GitHub unavailable: {errors[0]}")
 
         # Calculate aggregated totals
         total_commits = sum(s.commits for s in per_repo.values())
         total_prs_merged = sum(s.prs_merged for s in per_repo.values())
         total_issues_closed = sum(s.issues_closed for s in per_repo.values())
-        unique_contributors = sum(s.contributors for s in per_repo.values())
+        unique_contributors = await self._unique_contributors(per_repo, timeframe)
 
         return AggregatedMetrics(
             repos=len(per_repo),
@@ -69,22 +172,377 @@ class RepositoryAggregator:
             total_issues_closed=total_issues_closed,
             unique_contributors=unique_contributors,
             per_repo=per_repo,
+            errors=errors,
             timeframe=timeframe,
             timestamp=datetime.utcnow(),
         )
 
+    @staticmethod
+    async def _unique_contributors(per_repo: Dict[str, RepoStats], timeframe: str) -> int:
+        """
+        Distinct contributors across repos, counting people active in several once.
+
+        Merges the repos' daily contributor sketches over the window. The
+        estimate is kept between the largest single repo and the per-repo
+        sum, which bound the true value; without sketches the sum is used.
+        """
+        counts = [stats.contributors for stats in per_repo.values()]
+        if not counts:
+            return 0
+        estimate = await contributor_sketches.count(
+            per_repo, timeframe_start(timeframe), datetime.utcnow()
+        )
+        if estimate is None:
+            return sum(counts)
+        return min(max(estimate, max(counts)), sum(counts))
+
+    @staticmethod
+    async def _fetch_each(
+        client: GitHubClient,
+        repo_list: List[str],
+        timeframe: str,
+        semaphore: asyncio.Semaphore,
+        timeout: float,
+    ) -> List[Tuple[Optional[RepoStats], Optional[str]]]:
+        """Fetch repos one call each, concurrently behind a semaphore."""
+
+        async def fetch(repo: str) -> Tuple[Optional[RepoStats], Optional[str]]:
+            # Parse owner/repo
+            if "/" not in repo:
+                return None, f"Invalid repo format: {repo}"
+
+            owner, name = repo.split("/", 1)
+
+            async with semaphore:
+                try:
+                    # Concurrent requests for the same repo share one fetch
+                    stats = await asyncio.wait_for(
+                        repo_stats_flight.do(
+                            f"{repo.lower()}:{timeframe}",
+                            lambda: client.get_repo_stats(owner, name, timeframe),
+                            encode=RepoStats.model_dump_json,
+                            decode=RepoStats.model_validate_json,
+                        ),
+                        timeout=timeout,
+                    )
+                except asyncio.TimeoutError:
+                    return None, f"Failed to fetch {repo}: timed out after {timeout}s"
+                except Exception as e:
+                    return None, f"Failed to fetch {repo}: {str(e)}"
+
+            return stats, None
+
+        return await asyncio.gather(*(fetch(repo) for repo in repo_list))
+
+    @staticmethod
+    async def _fetch_batched(
+        client: GitHubGraphQLClient,
+        repo_list: List[str],
+        timeframe: str,
+        concurrency: int,
+        timeout: float,
+    ) -> List[Tuple[Optional[RepoStats], Optional[str]]]:
+        """Fetch all repos through batched GraphQL queries."""
+        valid = [tuple(repo.split("/", 1)) for repo in repo_list if "/" in repo]
+        stats, errors = await client.get_many_repo_stats(
+            valid, timeframe, max_concurrency=concurrency, timeout=timeout
+        )
+
+        results: List[Tuple[Optional[RepoStats], Optional[str]]] = []
+        for repo in repo_list:
+            if "/" not in repo:
+                results.append((None, f"Invalid repo format: {repo}"))
+            elif repo in stats:
+                results.append((stats[repo], None))
+            else:
+                results.append((None, f"Failed to fetch {repo}: {errors.get(repo, 'no data')}"))
+        return results
+
+    async def get_series(
+        self,
+        repo_list: List[str],
+        timeframe: str = "7d",
+        grain: Optional[str] = None,
+    ) -> ActivitySeries:
+        """
+        Real activity for charting, summed across repos, one point per period.
+
+        ``grain`` (day, week or month; by default ``choose_grain``) sets the
+        period. Only the timeframe's days are counted, so the first period
+        may be partial. Repos in the hot series store are summed from memory. For
+        the others, whole periods a repo has complete stored rows for are read
+        from its rollups, the rest of its stored days from DailyMetric, each
+        in one grouped query for all repos. Only days outside the stored
+        range (not yet synced or backfilled, or everything when no database
+        is configured) are fetched from GitHub. Each run of periods is
+        labelled with the source that served it: ``database``, ``live``,
+        ``mixed`` when repos differed, or ``unavailable`` when a live fetch
+        failed.
+
+        Raises:
+            CircuitOpenError: If a live fetch failed while the GitHub circuit
+                is open, so callers can serve their last good result instead
+        """
+        days = TIMEFRAME_DAYS.get(timeframe, 7)
+        grain = grain or choose_grain(days)
+        now = datetime.utcnow()
+        end = _midnight(now) + timedelta(days=1)
+        # The first period is partial: only days inside the window are counted,
+        # so a month-grain year never reaches behind the backfill horizon
+        since = end - timedelta(days=days)
+        first = period_start(since, grain)
+
+        periods = [first]
+        while next_period(periods[-1], grain) < end:
+            periods.append(next_period(periods[-1], grain))
+
+        totals: Dict[datetime, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        sources: Dict[datetime, Set[str]] = defaultdict(set)
+        stored: Dict[str, Tuple[datetime, datetime]] = {}
+        for name, series in hot_series.lookup(repo_list, now).items():
+            covered_first, covered_end = max(series.first, since), min(series.end, end)
+            if covered_first >= covered_end:
+                continue
+            stored[name] = (covered_first, covered_end)
+            summed = series.per_period(covered_first, covered_end, grain, SERIES_FIELDS.values())
+            for period, fields in summed.items():
+                for field, value in fields.items():
+                    totals[period][field] += value
+
+        cold = [repo for repo in repo_list if repo.lower() not in stored]
+        rows: List[Dict] = []
+        session_factory = get_session_factory_optional()
+        if session_factory is not None and cold:
+            try:
+                async with session_factory() as session:
+                    daily_spans, period_spans = [], []
+                    coverages = await stored_coverage(session, cold)
+                    for coverage in coverages:
+                        covered = stored_days(coverage, now, 2 * settings.sync_interval)
+                        if covered is None:
+                            continue
+                        covered_first, covered_end = max(covered[0], since), min(covered[1], end)
+                        if covered_first >= covered_end:
+                            continue
+                        stored[coverage["full_name"].lower()] = (covered_first, covered_end)
+
+                        repository_id = coverage["repository_id"]
+                        whole = [
+                            period for period in periods
+                            if covered_first <= period
+                            and min(next_period(period, grain), end) <= covered_end
+                        ]
+                        if not whole:
+                            daily_spans.append((repository_id, covered_first, covered_end))
+                            continue
+                        whole_end = min(next_period(whole[-1], grain), end)
+                        period_spans.append((repository_id, whole[0], whole_end))
+                        daily_spans.append((repository_id, covered_first, whole[0]))
+                        daily_spans.append((repository_id, whole_end, covered_end))
+                    rows = await daily_totals_between(session, daily_spans)
+                    rows += await daily_totals_between(session, period_spans, grain)
+                    await self._admit_hot(session, coverages, now)
+            except Exception:
+                cold_names = {repo.lower() for repo in cold}
+                stored = {name: span for name, span in stored.items() if name not in cold_names}
+                rows = []
+
+        for row in rows:
+            period = period_start(datetime.fromisoformat(row["date"]), grain)
+            for field in SERIES_FIELDS.values():
+                totals[period][field] += row[field]
+
+        gaps: List[Tuple[str, datetime, datetime]] = []
+        for repo in repo_list:
+            covered_first, covered_end = stored.get(repo.lower(), (end, end))
+            self._label(sources, covered_first, covered_end, "database", grain)
+            if since < covered_first:
+                gaps.append((repo, since, covered_first))
+            if covered_end < end:
+                gaps.append((repo, covered_end, end))
+
+        deltas = await self._fetch_gaps(gaps)
+        for (repo, gap_first, gap_end), delta in zip(gaps, deltas):
+            if delta is None:
+                self._label(sources, gap_first, gap_end, "unavailable", grain)
+                continue
+            self._label(sources, gap_first, gap_end, "live", grain)
+            for day, fields in delta.counts.items():
+                period = period_start(day, grain)
+                for field in SERIES_FIELDS.values():
+                    totals[period][field] += fields.get(field, 0)
+
+        points = [
+            {"date": period, **{key: totals[period][field] for key, field in SERIES_FIELDS.items()}}
+            for period in periods
+        ]
+        return ActivitySeries(
+            grain=grain, points=points, sources=self._source_ranges(periods, sources)
+        )
+
+    @staticmethod
+    async def _admit_hot(session: AsyncSession, coverages: List[Dict], now: datetime) -> None:
+        """Load repos requested repeatedly into the hot series store, best effort."""
+        spans = {}
+        admitted = set(hot_series.admissions(coverage["full_name"] for coverage in coverages))
+        for coverage in coverages:
+            if coverage["full_name"].lower() not in admitted:
+                continue
+            covered = stored_days(coverage, now, 2 * settings.sync_interval)
+            if covered is not None:
+                first, end = covered
+                first = max(first, end - timedelta(days=hot_series.days))
+                spans[coverage["repository_id"]] = (coverage["full_name"], first, end)
+        if not spans:
+            return
+        try:
+            rows = await repository_days(
+                session, [(repository_id, *span[1:]) for repository_id, span in spans.items()]
+            )
+        except Exception:
+            return
+        by_repo: Dict = defaultdict(list)
+        for row in rows:
+            by_repo[row["repository_id"]].append(row)
+        for repository_id, (full_name, first, end) in spans.items():
+            hot_series.load(full_name, first, end, by_repo[repository_id], now)
+
+    async def _fetch_gaps(
+        self,
+        gaps: List[Tuple[str, datetime, datetime]],
+    ) -> List[Optional[ActivityDelta]]:
+        """Fetch each repo's missing days from GitHub; None where that failed."""
+        if not gaps:
+            return []
+        semaphore = asyncio.Semaphore(max(1, settings.aggregator_max_concurrency))
+        timeout = settings.aggregator_repo_timeout
+
+        async def fetch(repo: str, since: datetime, until: datetime) -> Optional[ActivityDelta]:
+            if "/" not in repo:
+                return None
+            owner, name = repo.split("/", 1)
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        client.get_activity(owner, name, since, until), timeout=timeout
+                    )
+                except Exception:
+                    return None
+
+        async with self.github_client as client:
+            deltas = await asyncio.gather(*(fetch(*gap) for gap in gaps))
+
+        breaker = self.github_client.breaker
+        if None in deltas and breaker is not None and breaker.state != CLOSED:
+            raise CircuitOpenError("GitHub unavailable while filling chart gaps")
+        return deltas
+
+    @staticmethod
+    def _label(
+        sources: Dict[datetime, Set[str]],
+        first: datetime,
+        end: datetime,
+        source: str,
+        grain: str,
+    ) -> None:
+        day = first
+        while day < end:
+            sources[period_start(day, grain)].add(source)
+            day += timedelta(days=1)
+
+    @staticmethod
+    def _source_ranges(
+        periods: List[datetime],
+        sources: Dict[datetime, Set[str]],
+    ) -> List[SourceRange]:
+        """Collapse per-period sources into runs of consecutive periods."""
+        ranges: List[SourceRange] = []
+        for day in periods:
+            labels = sources.get(day, set())
+            if "unavailable" in labels:
+                source = "unavailable"
+            elif len(labels) == 1:
+                source = next(iter(labels))
+            else:
+                source = "mixed"
+            if ranges and ranges[-1].source == source:
+                ranges[-1].last = day
+            else:
+                ranges.append(SourceRange(source=source, first=day, last=day))
+        return ranges
+
     async def get_historical_data(
         self,
         repo_list: List[str],
         timeframe: str = "30d",
+        grain: str = "day",
     ) -> List[Dict]:
         """
         Get historical data points for charting.
-        Returns daily aggregated metrics.
+
+        Returns metrics per day (or per week or month, read from rollups)
+        summed across the repos, as kept in DailyMetric by the sync worker
+        and webhooks. Empty when no database is configured.
+        """
+        session_factory = get_session_factory_optional()
+        if session_factory is None:
+            return []
+
+        since = timeframe_start(timeframe)
+        async with session_factory() as session:
+            return await daily_totals(
+                session, repo_list, datetime(since.year, since.month, since.day), grain
+            )
+
+    async def compare_periods(
+        self,
+        repo_list: List[str],
+        timeframe: str = "7d",
+    ) -> Optional[Dict[str, MetricsResult]]:
         """
-        # This would query the database for stored historical data
-        # For now, return empty list as placeholder
-        return []
+        Each metric over the timeframe against the same-length period before it.
+
+        Reads the running totals DailyMetric keeps at the three period
+        boundaries, so the comparison costs three indexed lookups per repo and
+        no GitHub requests. None when the database is unavailable or has not
+        stored every repo's days over both periods, which would compare
+        missing rows as zeros. With the default ``backfill_days`` of 365 that
+        includes every 1y comparison, until a year of sync adds the second
+        year of history.
+        """
+        session_factory = get_session_factory_optional()
+        if session_factory is None:
+            return None
+
+        days = TIMEFRAME_DAYS.get(timeframe, 7)
+        now = datetime.utcnow()
+        until = datetime(now.year, now.month, now.day) + timedelta(days=1)
+        since = until - timedelta(days=days)
+        first = since - timedelta(days=days)
+        try:
+            async with session_factory() as session:
+                spans = {
+                    coverage["full_name"].lower(): stored_days(
+                        coverage, now, 2 * settings.sync_interval
+                    )
+                    for coverage in await stored_coverage(session, repo_list)
+                }
+                for repo in repo_list:
+                    span = spans.get(repo.lower())
+                    if span is None or span[0] > first or span[1] < until:
+                        return None
+                before, start, end = await prefix_totals_at(
+                    session, repo_list, [first, since, until]
+                )
+        except Exception:
+            return None
+
+        return {
+            metric: MetricsCalculator.period_result(
+                metric, end[metric] - start[metric], start[metric] - before[metric]
+            )
+            for metric in COMPARED_METRICS
+        }
 
 
 # Global aggregator instance
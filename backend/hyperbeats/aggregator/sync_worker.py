@@ -0,0 +1,279 @@
+"""
+Sync Worker
+Keeps DailyMetric current by polling tracked repositories in the background.
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.database.metric_store import (
+    claim_events,
+    increment_daily_metrics,
+    raise_daily_contributors,
+    set_daily_engagement,
+)
+from backend.database.models import Repository, SyncCursor
+from backend.hyperbeats.aggregator.hot_series import hot_series
+from backend.hyperbeats.aggregator.leaderboard import leaderboard
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_session_factory_optional
+from backend.integrations.contributor_sketch import contributor_sketches
+from backend.integrations.github_client import GitHubClient
+from backend.integrations.github_models import ActivityDelta
+from backend.integrations.github_webhooks import webhook_counters
+
+# (repository id, "owner/name", synced_until)
+DueRepository = Tuple[UUID, str, Optional[datetime]]
+
+
+class SyncWorker:
+    """
+    Background poller that adds new activity to DailyMetric.
+
+    Every tracked repository has a SyncCursor recording how far its activity
+    has been counted and when it is next due. Each tick claims due cursors
+    (``FOR UPDATE SKIP LOCKED``, so several app processes share the work),
+    syncs at most ``workers`` repositories at a time and counts only what
+    happened between the cursor and now. The counts and the advanced cursor
+    commit together, so a failed sync is simply retried from the same cursor.
+
+    Next runs drift by up to ``jitter`` of the interval so repositories added
+    together do not stay in lockstep. Repositories whose webhooks arrived
+    within ``webhook_grace`` are already current and only their cursor
+    moves, unless a delivery since the last poll left events out. Events
+    are claimed by name, so those a webhook already counted are skipped.
+    Constant URLs (the repository and the first PR and issue pages) revalidate
+    through the conditional request cache, so quiet repos cost little quota.
+    """
+
+    def __init__(
+        self,
+        client: Optional[GitHubClient] = None,
+        workers: Optional[int] = None,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        initial_window: Optional[timedelta] = None,
+        webhook_grace: Optional[float] = None,
+        tick: Optional[float] = None,
+    ):
+        self.client = client or GitHubClient()
+        self.workers = workers or settings.sync_workers
+        self.interval = interval or settings.sync_interval
+        self.jitter = settings.sync_jitter if jitter is None else jitter
+        self.batch_size = batch_size or settings.sync_batch_size
+        self.initial_window = initial_window or timedelta(days=settings.sync_initial_window_days)
+        self.webhook_grace = settings.sync_webhook_grace if webhook_grace is None else webhook_grace
+        self.tick = tick or settings.sync_tick
+        self._task: Optional[asyncio.Task] = None
+
+    def next_run(self, now: datetime) -> datetime:
+        """When a repository synced at ``now`` is next due."""
+        spread = self.interval * self.jitter
+        return now + timedelta(seconds=self.interval + random.uniform(-spread, spread))
+
+    async def start(self) -> None:
+        """Start polling in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling, abandoning in-flight syncs; their cursors stay put."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                synced = await self.run_once()
+            except Exception:
+                synced = 0
+            # Keep draining while there is a backlog of due repositories
+            if synced < self.batch_size:
+                await asyncio.sleep(self.tick)
+
+    async def run_once(self) -> int:
+        """Sync every repository that is due, returning how many were claimed."""
+        session_factory = get_session_factory_optional()
+        if session_factory is None:
+            return 0
+
+        async with session_factory() as session:
+            await self._ensure_cursors(session)
+            due = await self._claim_due(session)
+            await session.commit()
+
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def bounded(repository: DueRepository) -> None:
+            async with semaphore:
+                await self.sync_repository(session_factory, *repository)
+
+        await asyncio.gather(*(bounded(repository) for repository in due))
+        if due:
+            await leaderboard.refresh()
+        return len(due)
+
+    async def _ensure_cursors(self, session: AsyncSession) -> None:
+        """Give newly tracked repositories a cursor, due at a random point in the next interval."""
+        result = await session.execute(
+            select(Repository.id).where(
+                ~select(SyncCursor.repository_id)
+                .where(SyncCursor.repository_id == Repository.id)
+                .exists()
+            )
+        )
+        now = datetime.utcnow()
+        rows = [
+            {
+                "repository_id": repository_id,
+                "next_run_at": now + timedelta(seconds=random.uniform(0, self.interval)),
+            }
+            for repository_id in result.scalars()
+        ]
+        if rows:
+            await session.execute(insert(SyncCursor).values(rows).on_conflict_do_nothing())
+
+    async def _claim_due(self, session: AsyncSession) -> List[DueRepository]:
+        """
+        Lease up to ``batch_size`` due cursors.
+
+        Leased cursors are pushed one interval out, so a worker that dies
+        mid-sync only delays that repository instead of losing it.
+        """
+        now = datetime.utcnow()
+        result = await session.execute(
+            select(SyncCursor.repository_id, Repository.full_name, SyncCursor.synced_until)
+            .join(Repository, Repository.id == SyncCursor.repository_id)
+            .where(SyncCursor.next_run_at <= now)
+            .order_by(SyncCursor.next_run_at)
+            .limit(self.batch_size)
+            .with_for_update(of=SyncCursor, skip_locked=True)
+        )
+        due = [tuple(row) for row in result]
+        if due:
+            await session.execute(
+                update(SyncCursor)
+                .where(SyncCursor.repository_id.in_([row[0] for row in due]))
+                .values(next_run_at=now + timedelta(seconds=self.interval))
+            )
+        return due
+
+    async def collect(
+        self,
+        full_name: str,
+        since: datetime,
+        until: datetime,
+    ) -> Optional[ActivityDelta]:
+        """Activity for one repository inside the window, or None if webhooks cover it."""
+        last_event = await webhook_counters.last_event_at(full_name)
+        if last_event is not None and time.time() - last_event < self.webhook_grace:
+            if await webhook_counters.incomplete_at(full_name) is None:
+                return None
+        owner, repo = full_name.split("/", 1)
+        return await self.client.get_activity(owner, repo, since, until)
+
+    async def sync_repository(
+        self,
+        session_factory: async_sessionmaker,
+        repository_id: UUID,
+        full_name: str,
+        synced_until: Optional[datetime],
+    ) -> None:
+        """Count one repository's activity since its cursor and advance the cursor."""
+        until = datetime.utcnow().replace(microsecond=0)
+        since = synced_until or until - self.initial_window
+        try:
+            delta = await self.collect(full_name, since, until)
+            repo_data = None
+            if delta is not None:
+                repo_data = await self.client.get_repo(*full_name.split("/", 1))
+
+            contributors = {}
+            async with session_factory() as session:
+                if delta is not None:
+                    delta = delta.restricted_to(
+                        await claim_events(session, repository_id, delta.events)
+                    )
+                    await increment_daily_metrics(session, repository_id, delta.counts)
+                    contributors = await contributor_sketches.add(full_name, delta.contributors)
+                    for day, count in contributors.items():
+                        await raise_daily_contributors(session, repository_id, day, count)
+                if repo_data is not None:
+                    await set_daily_engagement(
+                        session,
+                        repository_id,
+                        datetime(until.year, until.month, until.day),
+                        stars=repo_data.get("stargazers_count", 0),
+                        forks=repo_data.get("forks_count", 0),
+                        watchers=repo_data.get("subscribers_count", 0),
+                    )
+                await session.execute(
+                    update(SyncCursor)
+                    .where(SyncCursor.repository_id == repository_id)
+                    .values(
+                        synced_from=func.coalesce(SyncCursor.synced_from, since),
+                        synced_until=until,
+                        next_run_at=self.next_run(until),
+                        last_error=None,
+                    )
+                )
+                await session.commit()
+
+            # Keep this process's in-memory copy in step with what was just written
+            if delta is not None:
+                await webhook_counters.clear_incomplete(
+                    full_name, until.replace(tzinfo=timezone.utc).timestamp()
+                )
+                hot_series.record(full_name, delta.counts)
+                hot_series.raise_contributors(full_name, contributors)
+            if repo_data is not None:
+                hot_series.set_engagement(
+                    full_name,
+                    stars=repo_data.get("stargazers_count", 0),
+                    forks=repo_data.get("forks_count", 0),
+                    watchers=repo_data.get("subscribers_count", 0),
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await self._record_failure(session_factory, repository_id, exc)
+
+    async def _record_failure(
+        self,
+        session_factory: async_sessionmaker,
+        repository_id: UUID,
+        exc: Exception,
+    ) -> None:
+        """Keep the cursor where it was and retry on the normal schedule."""
+        try:
+            async with session_factory() as session:
+                await session.execute(
+                    update(SyncCursor)
+                    .where(SyncCursor.repository_id == repository_id)
+                    .values(
+                        next_run_at=self.next_run(datetime.utcnow()),
+                        last_error=f"{type(exc).__name__}: {exc}"[:500],
+                    )
+                )
+                await session.commit()
+        except Exception:
+            pass
+
+
+# Global sync worker
+sync_worker = SyncWorker()
@@ -0,0 +1,28 @@
+"""
+API Error Handlers
+Exception handlers shared by every API version.
+"""
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic_core import PydanticUndefinedType
+
+
+async def validation_error_handler(request: Request, exc: RequestValidationError) -> ORJSONResponse:
+    """
+    422 with the validation errors.
+
+    A missing required list parameter reports its input as pydantic's
+    undefined marker, which FastAPI's default handler cannot encode; it is
+    sent as null instead.
+    """
+    return ORJSONResponse(
+        status_code=422,
+        content={
+            "detail": jsonable_encoder(
+                exc.errors(), custom_encoder={PydanticUndefinedType: lambda _: None}
+            )
+        },
+    )
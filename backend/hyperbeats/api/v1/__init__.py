@@ -6,11 +6,15 @@ Combines all v1 endpoints.
 from fastapi import APIRouter
 
 from backend.hyperbeats.api.v1.chart_activity import router as chart_activity_router
+from backend.hyperbeats.api.v1.leaderboard import router as leaderboard_router
 from backend.hyperbeats.api.v1.metrics_aggregate import router as metrics_router
+from backend.hyperbeats.api.v1.webhooks import router as webhooks_router
 
 router = APIRouter()
 
 # Include sub-routers
 router.include_router(chart_activity_router, prefix="/chart", tags=["Charts"])
+router.include_router(leaderboard_router, prefix="/leaderboard", tags=["Leaderboard"])
 router.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
+router.include_router(webhooks_router, prefix="/webhooks", tags=["Webhooks"])
 
@@ -3,22 +3,29 @@ Activity Chart Endpoint
 Generates activity charts for repositories.
 """
 
-from datetime import datetime
-from typing import List, Optional
+import time
+from typing import List
 
 from fastapi import APIRouter, Query, HTTPException, Depends
 from fastapi.responses import Response
 
 from backend.cache.cache_manager import cache_manager
+from backend.cache.repo_index import repo_cache_index
 from backend.hyperbeats.aggregator.repo_aggregator import repo_aggregator
+from backend.hyperbeats.config import settings
 from backend.hyperbeats.renderer.svg_renderer import svg_renderer
 from backend.hyperbeats.renderer.png_renderer import png_renderer
 from backend.hyperbeats.themes.theme_manager import theme_manager
 from backend.hyperbeats.validators.input_validator import validate_repos, validate_timeframe
 from backend.hyperbeats.security.rate_limiter import check_rate_limit
+from backend.integrations.circuit_breaker import CircuitOpenError
+from backend.integrations.github_models import SourceRange
 
 router = APIRouter()
 
+# Seconds a chart with days that could not be fetched stays cached
+INCOMPLETE_TTL = 60
+
 
 @router.get("/activity")
 async def chart_activity(
@@ -66,23 +73,43 @@ async def chart_activity(
     cached, cache_status = await cache_manager.get(cache_key)
     if cached:
         content_type = "image/svg+xml" if format == "svg" else "image/png"
+        # Hits advertise what is left of the TTL the chart was stored with
+        meta, _ = await cache_manager.get(f"meta:{cache_key}")
+        max_age = INCOMPLETE_TTL
+        headers = {"X-Cache": cache_status}
+        if meta:
+            max_age = max(0, min(meta["ttl"], int(meta["expires_at"] - time.time())))
+            headers["X-Data-Source"] = meta["source"]
+        headers["Cache-Control"] = f"public, max-age={max_age}"
         return Response(
             content=cached if isinstance(cached, bytes) else cached.encode(),
             media_type=content_type,
-            headers={
-                "X-Cache": cache_status,
-                "Cache-Control": "public, max-age=3600",
-            },
+            headers=headers,
         )
 
-    # Fetch and aggregate data
+    # Stored rows (rollups for long ranges), with live fetches only for days not stored yet
     try:
-        metrics = await repo_aggregator.aggregate_repos(repos, timeframe)
+        series = await repo_aggregator.get_series(repos, timeframe)
+    except CircuitOpenError:
+        # GitHub is down: serve the last good chart, however old
+        stale, _ = await cache_manager.get(f"stale:{cache_key}")
+        if not stale:
+            raise HTTPException(status_code=503, detail="GitHub is unavailable, try again later")
+        return Response(
+            content=stale if isinstance(stale, bytes) else stale.encode(),
+            media_type="image/svg+xml" if format == "svg" else "image/png",
+            headers={
+                "X-Cache": "STALE",
+                "Cache-Control": "public, max-age=60",
+            },
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch data: {str(e)}")
 
-    # Generate chart data
-    chart_data = _generate_chart_data(metrics, timeframe)
+    chart_data = series.points
+    data_source = _describe_sources(series.sources)
+    # Days a live fetch could not fill are plotted as zeros
+    complete = all(r.source != "unavailable" for r in series.sources)
 
     # Render chart
     title = f"Activity - Last {timeframe}"
@@ -94,50 +121,34 @@ async def chart_activity(
     svg_content = svg_renderer.render_activity_chart(chart_data, title, theme)
 
     if format == "png":
-        png_content = await png_renderer.render_png(svg_content, width, height)
-        await cache_manager.set(cache_key, png_content, ttl=3600)
-        return Response(
-            content=png_content,
-            media_type="image/png",
-            headers={
-                "X-Cache": "MISS",
-                "Cache-Control": "public, max-age=3600",
-            },
-        )
+        content = await png_renderer.render_png(svg_content, width, height)
     else:
-        await cache_manager.set(cache_key, svg_content, ttl=3600)
-        return Response(
-            content=svg_content,
-            media_type="image/svg+xml",
-            headers={
-                "X-Cache": "MISS",
-                "Cache-Control": "public, max-age=3600",
-            },
-        )
-
-
-def _generate_chart_data(metrics, timeframe: str) -> List[dict]:
-    """Generate time series data for the chart."""
-    # For now, return aggregated data as a single point
-    # In production, this would query historical data
-    from datetime import timedelta
-
-    days = {"1d": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365}.get(timeframe, 7)
-    data = []
-
-    for i in range(days):
-        date = datetime.utcnow() - timedelta(days=days - i - 1)
-        # Distribute metrics across days (simplified)
-        daily_commits = metrics.total_commits // days
-        daily_prs = metrics.total_prs_merged // days
-        daily_issues = metrics.total_issues_closed // days
-
-        data.append({
-            "date": date,
-            "commits": daily_commits + (i % 3),  # Add some variation
-            "prs": daily_prs + (i % 2),
-            "issues": daily_issues + ((i + 1) % 2),
-        })
+        content = svg_content
+
+    # Charts with zero-filled gaps are retried soon instead of served for an hour
+    ttl = 3600 if complete else INCOMPLETE_TTL
+    await cache_manager.set(cache_key, content, ttl=ttl)
+    await cache_manager.set(
+        f"meta:{cache_key}",
+        {"source": data_source, "ttl": ttl, "expires_at": time.time() + ttl},
+        ttl=ttl,
+    )
+    if complete:
+        await cache_manager.set(f"stale:{cache_key}", content, ttl=settings.circuit_stale_ttl)
+    await repo_cache_index.add(repos, cache_key)
+    return Response(
+        content=content,
+        media_type="image/png" if format == "png" else "image/svg+xml",
+        headers={
+            "X-Cache": "MISS",
+            "X-Data-Source": data_source,
+            "Cache-Control": f"public, max-age={ttl}",
+        },
+    )
 
-    return data
 
+def _describe_sources(sources: List[SourceRange]) -> str:
+    """Header value listing ``source:first/last`` for each run of periods."""
+    return ", ".join(
+        f"{r.source}:{r.first.date().isoformat()}/{r.last.date().isoformat()}" for r in sources
+    )
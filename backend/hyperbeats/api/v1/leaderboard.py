@@ -0,0 +1,79 @@
+"""
+Leaderboard Endpoint
+Ranks every tracked repository by activity score.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from backend.hyperbeats.aggregator.leaderboard import TIMEFRAME_DAYS, leaderboard
+
+router = APIRouter()
+
+
+class LeaderboardEntry(BaseModel):
+    """One ranked repository."""
+    rank: int
+    repository: str
+    score: float
+    change_percent: float
+    trend: str
+    commits: int
+    prs_merged: int
+    issues_closed: int
+    contributors: int
+
+
+class LeaderboardResponse(BaseModel):
+    """Response model for a leaderboard page."""
+    timeframe: str
+    page: int
+    per_page: int
+    total: int
+    entries: List[LeaderboardEntry]
+    updated_at: Optional[datetime] = None
+
+
+@router.get("/activity", response_model=LeaderboardResponse)
+async def activity_leaderboard(
+    timeframe: str = Query("7d", description="Timeframe: 7d, 30d, 90d"),
+    page: int = Query(1, ge=1, description="Page number, starting at 1"),
+    per_page: int = Query(50, ge=1, le=100, description="Repositories per page"),
+):
+    """
+    Get a page of repositories ranked by activity score.
+
+    Rankings are precomputed after each ingest, so a page is a single
+    sorted-set read however many repositories are tracked. Until the first
+    ranking is built the endpoint answers 503.
+    """
+    if timeframe not in TIMEFRAME_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid timeframe. Must be one of: {', '.join(TIMEFRAME_DAYS)}",
+        )
+
+    offset = (page - 1) * per_page
+    ranked = await leaderboard.page(timeframe, offset, per_page)
+    if ranked is None:
+        # Cold start: build the ranking once in the background
+        leaderboard.rebuild_in_background()
+        raise HTTPException(
+            status_code=503,
+            detail="Leaderboard is being built, retry shortly",
+            headers={"Retry-After": "10"},
+        )
+
+    total, entries = ranked
+    updated = [entry["updated_at"] for entry in entries if entry.get("updated_at")]
+    return LeaderboardResponse(
+        timeframe=timeframe,
+        page=page,
+        per_page=per_page,
+        total=total,
+        entries=[LeaderboardEntry(**entry) for entry in entries],
+        updated_at=datetime.utcfromtimestamp(min(updated)) if updated else None,
+    )
@@ -4,14 +4,22 @@ Returns raw metrics data as JSON.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Response
 from pydantic import BaseModel
 
 from backend.cache.cache_manager import cache_manager
-from backend.hyperbeats.aggregator.repo_aggregator import repo_aggregator
+from backend.cache.repo_index import repo_cache_index
+from backend.hyperbeats.aggregator.metrics_calculator import MetricsResult
+from backend.hyperbeats.aggregator.repo_aggregator import (
+    TIMEFRAME_DAYS,
+    choose_grain,
+    repo_aggregator,
+)
+from backend.hyperbeats.config import settings
 from backend.hyperbeats.validators.input_validator import validate_repos, validate_timeframe
+from backend.integrations.circuit_breaker import CircuitOpenError
 from backend.integrations.github_models import RepoStats
 
 router = APIRouter()
@@ -22,12 +30,15 @@ class MetricsResponse(BaseModel):
     aggregated: dict
     per_repo: dict
     historical: Optional[List[dict]] = None
+    historical_grain: Optional[str] = None
+    comparison: Optional[Dict[str, MetricsResult]] = None  # null until both periods are stored
     timeframe: str
     timestamp: datetime
 
 
 @router.get("/aggregate", response_model=MetricsResponse)
 async def metrics_aggregate(
+    response: Response,
     repos: List[str] = Query(..., description="Repository names (owner/repo)"),
     timeframe: str = Query("7d", description="Timeframe: 1d, 7d, 30d, 90d, 1y"),
     include_historical: bool = Query(False, description="Include historical data points"),
@@ -60,11 +71,19 @@ async def metrics_aggregate(
     # Try to get from cache
     cached, cache_status = await cache_manager.get(cache_key)
     if cached and isinstance(cached, dict):
+        response.headers["X-Cache"] = cache_status
         return MetricsResponse(**cached)
 
     # Fetch and aggregate data
     try:
         result = await repo_aggregator.aggregate_repos(repos, timeframe)
+    except CircuitOpenError:
+        # GitHub is down: serve the last good metrics, however old
+        stale, _ = await cache_manager.get(f"stale:{cache_key}")
+        if not stale or not isinstance(stale, dict):
+            raise HTTPException(status_code=503, detail="GitHub is unavailable, try again later")
+        response.headers["X-Cache"] = "STALE"
+        return MetricsResponse(**stale)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch data: {str(e)}")
 
@@ -96,21 +115,39 @@ async def metrics_aggregate(
 
     # Get historical data if requested
     historical = None
+    historical_grain = None
     if include_historical:
-        historical = await repo_aggregator.get_historical_data(repos, timeframe)
-
-    response = MetricsResponse(
+        # Long timeframes read weekly or monthly rollups instead of every day
+        historical_grain = choose_grain(TIMEFRAME_DAYS[timeframe])
+        historical = await repo_aggregator.get_historical_data(
+            repos, timeframe, historical_grain
+        )
+
+    # Previous-period values come from stored running totals, not GitHub
+    comparison = await repo_aggregator.compare_periods(repos, timeframe)
+    if comparison and metrics:
+        comparison = {k: v for k, v in comparison.items() if k in metrics}
+
+    metrics_response = MetricsResponse(
         aggregated=aggregated,
         per_repo=per_repo,
         historical=historical,
+        historical_grain=historical_grain,
+        comparison=comparison,
         timeframe=timeframe,
         timestamp=result.timestamp,
     )
 
     # Cache the response
-    await cache_manager.set(cache_key, response.model_dump(), ttl=1800)
+    await cache_manager.set(cache_key, metrics_response.model_dump(), ttl=1800)
+    if not result.errors:
+        # Only complete results may stand in for GitHub while it is down
+        await cache_manager.set(
+            f"stale:{cache_key}", metrics_response.model_dump(), ttl=settings.circuit_stale_ttl
+        )
+    await repo_cache_index.add(repos, cache_key)
 
-    return response
+    return metrics_response
 
 
 @router.get("/repos/{owner}/{repo}")
@@ -129,6 +166,8 @@ async def get_repo_metrics(
 
     try:
         result = await repo_aggregator.aggregate_repos([f"{owner}/{repo}"], timeframe)
+    except CircuitOpenError:
+        raise HTTPException(status_code=503, detail="GitHub is unavailable, try again later")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch data: {str(e)}")
 
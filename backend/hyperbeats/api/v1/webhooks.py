@@ -0,0 +1,133 @@
+"""
+Webhooks Endpoint
+Applies GitHub webhook events to stored metrics as they happen.
+"""
+
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.cache.cache_manager import cache_manager
+from backend.cache.repo_index import repo_cache_index
+from backend.database.metric_store import (
+    claim_batch,
+    claim_events,
+    get_repository_id,
+    increment_daily_metrics,
+    raise_daily_contributors,
+)
+from backend.database.models import SyncCursor
+from backend.hyperbeats.aggregator.hot_series import hot_series
+from backend.hyperbeats.aggregator.leaderboard import leaderboard
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_db
+from backend.integrations.github_webhooks import (
+    ActivityDelta,
+    event_delta,
+    verify_signature,
+    webhook_counters,
+)
+
+router = APIRouter()
+
+
+@router.post("/github", status_code=202)
+async def github_webhook(
+    request: Request,
+    x_github_event: str = Header(..., description="Event name, e.g. push"),
+    x_github_delivery: Optional[str] = Header(None, description="Unique delivery ID"),
+    x_hub_signature_256: Optional[str] = Header(None, description="HMAC-SHA256 of the body"),
+):
+    """
+    Receive a GitHub webhook delivery.
+
+    ``push`` (default branch), ``pull_request`` and ``issues`` events for
+    tracked repositories increment that day's DailyMetric row and the
+    repo's counters, then invalidate only the cache entries built from it
+    and start a (rate limited) leaderboard rebuild.
+    """
+    if not settings.github_webhook_secret:
+        raise HTTPException(status_code=503, detail="Webhooks are not configured")
+
+    body = await request.body()
+    if not verify_signature(settings.github_webhook_secret, body, x_hub_signature_256):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    if x_github_event == "ping":
+        return {"status": "pong"}
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be JSON")
+
+    delta = event_delta(x_github_event, payload)
+    if delta is None:
+        return {"status": "ignored"}
+
+    # Only signed, relevant deliveries get as far as the database
+    status = "untracked"
+    async for session in get_db():
+        status = await _apply(session, delta, x_github_delivery)
+    if status != "applied":
+        return {"status": status, "repository": delta.repo}
+
+    # Drop fresh copies built from this repo; stale copies stay as a fallback
+    invalidated = await repo_cache_index.pop(delta.repo)
+    for cache_key in invalidated:
+        await cache_manager.delete(cache_key)
+
+    leaderboard.rebuild_in_background()
+
+    return {
+        "status": "applied",
+        "repository": delta.repo,
+        "days": sorted(day.date().isoformat() for day in delta.days),
+        "invalidated": len(invalidated),
+    }
+
+
+async def _apply(session: AsyncSession, delta: ActivityDelta, delivery_id: Optional[str]) -> str:
+    """
+    Write a delta to DailyMetric and the Redis counters, once per delivery.
+
+    Only events no poll has counted yet are added. A delivery that left
+    events out makes the repository due for polling right away.
+    """
+    repository_id = await get_repository_id(session, delta.repo)
+    if repository_id is None:
+        return "untracked"
+
+    if not await webhook_counters.claim_delivery(delivery_id):
+        return "duplicate"
+
+    try:
+        # Redis claims are lost on a flush; the database claim commits with the counts
+        if delivery_id is not None and not await claim_batch(session, f"webhook:{delivery_id}"):
+            return "duplicate"
+        delta = delta.restricted_to(await claim_events(session, repository_id, delta.events))
+        await increment_daily_metrics(session, repository_id, delta.counts)
+        contributors = await webhook_counters.add_contributors(delta)
+        for day, count in contributors.items():
+            await raise_daily_contributors(session, repository_id, day, count)
+        if delta.incomplete:
+            await webhook_counters.mark_incomplete(delta.repo)
+            await session.execute(
+                update(SyncCursor)
+                .where(SyncCursor.repository_id == repository_id)
+                .values(next_run_at=datetime.utcnow())
+            )
+        await session.commit()
+    except Exception:
+        await webhook_counters.release_delivery(delivery_id)
+        raise
+
+    # Counters are not idempotent, so a failed commit's redelivery must not find them applied
+    await webhook_counters.apply(delta)
+    hot_series.record(delta.repo, delta.counts)
+    hot_series.raise_contributors(delta.repo, contributors)
+    return "applied"
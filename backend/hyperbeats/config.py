@@ -6,6 +6,7 @@ Loads settings from environment variables with sensible defaults.
 from functools import lru_cache
 from typing import List
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -32,10 +33,91 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     redis_cache_ttl: int = 3600
 
+    # Response cache tiers (L1 in-process, L2 Redis, L3 object storage)
+    cache_memory_max_bytes: int = 67108864
+    cache_memory_ttl: float = 60.0  # how late other processes' invalidations reach L1
+    cache_object_enabled: bool = True  # single host only: invalidations delete local files
+    cache_object_dir: str = "/tmp/hyperbeats/cache"
+    cache_object_min_ttl: int = 3600  # shorter-lived entries stay in L1/L2 only
+
     # GitHub API
     github_token: str = ""
+    github_tokens: str = ""
     github_api_base_url: str = "https://api.github.com"
-    github_rate_limit_buffer: int = 10
+    github_backend: str = "rest"  # rest, graphql
+    github_fetch_strategy: str = "list"  # list, count
+    github_stats_ttl: int = 3600
+    github_stats_poll_interval: float = 2.0
+    github_stats_poll_attempts: int = 15
+    github_stats_cache_size: int = 1024
+    github_graphql_max_cost: int = 100
+    github_rate_limit_buffer: int = 10  # per core window, scaled for search
+    github_token_max_wait: float = 60.0
+    github_max_pages: int = 10
+    github_max_items: int = 1000
+    github_conditional_requests: bool = True
+    github_etag_cache_size: int = 256
+    github_etag_cache_ttl: int = 86400
+    github_http2: bool = True
+    github_timeout: float = 30.0
+    github_max_connections: int = 100
+    github_max_keepalive_connections: int = 20
+    github_keepalive_expiry: float = 60.0
+    github_webhook_secret: str = ""
+
+    # Circuit breaker (GitHub upstream)
+    circuit_breaker_enabled: bool = True
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30.0
+    circuit_half_open_max_calls: int = 1
+    circuit_stale_ttl: int = 604800  # last good responses served while open
+
+    # Aggregation
+    aggregator_max_concurrency: int = 8
+    aggregator_repo_timeout: float = 45.0  # above github_timeout, so hung requests trip the breaker
+
+    # Incremental sync (background DailyMetric poller)
+    sync_enabled: bool = True
+    sync_interval: float = 900.0
+    sync_jitter: float = 0.2  # fraction of the interval each schedule may drift
+    sync_workers: int = 4
+    sync_batch_size: int = 50
+    sync_initial_window_days: int = 1
+    sync_webhook_grace: float = 3600.0  # skip polling repos with webhooks this recent
+    sync_tick: float = 30.0
+
+    # Historical backfill
+    backfill_enabled: bool = True
+    backfill_days: int = 365
+    backfill_chunk_days: int = 30
+    backfill_workers: int = 2
+    backfill_budget_share: float = 0.3  # fraction of each rate limit window backfills may use
+    backfill_lease: float = 600.0
+    backfill_tick: float = 60.0
+
+    # DailyMetric partitions and retention
+    metrics_maintenance_enabled: bool = True
+    metrics_maintenance_interval: float = 21600.0
+    metrics_partition_months_ahead: int = 3
+    metrics_raw_data_days: int = 90  # raw_data is cleared on older rows
+    metrics_compact_after_days: int = 760  # 1y comparisons also need backfill_days >= 730
+    metrics_batch_retention_days: int = 7  # how long ingested batch ids guard against repeats
+
+    # Charts
+    chart_point_budget: int = 12  # fewest points a chart needs; coarser grains are used when met
+
+    # In-process daily series of hot repositories
+    hot_series_max_repos: int = 256  # 0 disables
+    hot_series_days: int = 400
+    hot_series_ttl: float = 300.0
+
+    # Activity leaderboard
+    leaderboard_refresh_interval: float = 60.0  # minimum seconds between rebuilds after ingest
+
+    # Request coalescing
+    singleflight_distributed: bool = True
+    singleflight_lock_ttl: float = 10.0  # renewed by live leaders; a dead one's expires
+    singleflight_result_ttl: int = 10
 
     # Cloudflare R2 (FREE 10GB)
     r2_bucket: str = "hyperbeats-charts"
@@ -75,11 +157,37 @@ class Settings(BaseSettings):
     prometheus_enabled: bool = True
     prometheus_port: int = 9090
 
+    @model_validator(mode="after")
+    def check_singleflight_wait(self) -> "Settings":
+        """
+        Followers of a dead leader must notice in time to fetch for themselves.
+
+        Live leaders renew their lock, so followers wait for them up to
+        ``aggregator_repo_timeout``; only an unrenewed lock, gone after
+        ``singleflight_lock_ttl``, sends them to fetch on their own.
+        """
+        if self.singleflight_lock_ttl >= self.aggregator_repo_timeout:
+            raise ValueError("singleflight_lock_ttl must be shorter than aggregator_repo_timeout")
+        return self
+
+    @model_validator(mode="after")
+    def check_repo_timeout(self) -> "Settings":
+        """A hung request must fail, and count against the breaker, before its repo is dropped."""
+        if self.aggregator_repo_timeout <= self.github_timeout:
+            raise ValueError("aggregator_repo_timeout must be longer than github_timeout")
+        return self
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def github_tokens_list(self) -> List[str]:
+        """All configured GitHub tokens, primary token first."""
+        tokens = [self.github_token] + self.github_tokens.split(",")
+        return list(dict.fromkeys(t.strip() for t in tokens if t.strip()))
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -5,6 +5,7 @@ Database, Redis, and other service connections.
 
 from typing import Dict, Optional
 
+import httpx
 import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
@@ -14,6 +15,7 @@ from backend.hyperbeats.config import settings
 _engine = None
 _session_factory = None
 _redis_client: Optional[redis.Redis] = None
+_http_client: Optional[httpx.AsyncClient] = None
 
 
 async def init_database() -> None:
@@ -56,6 +58,11 @@ async def get_db() -> AsyncSession:
             raise
 
 
+def get_session_factory_optional() -> Optional[async_sessionmaker]:
+    """Get the session factory if the database is initialized, otherwise None."""
+    return _session_factory
+
+
 async def init_redis() -> None:
     """Initialize Redis connection."""
     global _redis_client
@@ -81,6 +88,44 @@ def get_redis() -> redis.Redis:
     return _redis_client
 
 
+def get_redis_optional() -> Optional[redis.Redis]:
+    """Get Redis client if initialized, otherwise None."""
+    return _redis_client
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP/2 client for the GitHub API."""
+    return httpx.AsyncClient(
+        base_url=settings.github_api_base_url,
+        http2=settings.github_http2,
+        timeout=settings.github_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.github_max_connections,
+            max_keepalive_connections=settings.github_max_keepalive_connections,
+            keepalive_expiry=settings.github_keepalive_expiry,
+        ),
+    )
+
+
+async def init_http_client() -> None:
+    """Initialize the shared GitHub connection pool."""
+    global _http_client
+    _http_client = create_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the shared GitHub connection pool."""
+    global _http_client
+    if _http_client:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_http_client_optional() -> Optional[httpx.AsyncClient]:
+    """Get the shared GitHub connection pool if initialized, otherwise None."""
+    return _http_client
+
+
 async def check_dependencies() -> Dict[str, bool]:
     """Check all dependency connections."""
     results = {}
@@ -7,16 +7,23 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
 from backend.hyperbeats.config import settings
+from backend.hyperbeats.aggregator.backfill import backfill_job
+from backend.hyperbeats.aggregator.maintenance import metric_maintenance
+from backend.hyperbeats.aggregator.sync_worker import sync_worker
+from backend.hyperbeats.api.errors import validation_error_handler
 from backend.hyperbeats.api.v1 import router as api_v1_router
 from backend.hyperbeats.dependencies import (
     init_database,
     close_database,
     init_redis,
     close_redis,
+    init_http_client,
+    close_http_client,
 )
 from backend.hyperbeats.middleware.metrics_middleware import PrometheusMiddleware
 
@@ -27,8 +34,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Startup
     await init_database()
     await init_redis()
+    await init_http_client()
+    # This and next month's partitions must exist before anything writes to them
+    await metric_maintenance.ensure_current()
+    if settings.metrics_maintenance_enabled:
+        await metric_maintenance.start()
+    if settings.sync_enabled:
+        await sync_worker.start()
+    if settings.backfill_enabled:
+        await backfill_job.start()
     yield
     # Shutdown
+    await backfill_job.stop()
+    await sync_worker.stop()
+    await metric_maintenance.stop()
+    await close_http_client()
     await close_redis()
     await close_database()
 
@@ -62,6 +82,8 @@ def create_app() -> FastAPI:
     # Include API routers
     app.include_router(api_v1_router, prefix="/api/v1")
 
+    app.add_exception_handler(RequestValidationError, validation_error_handler)
+
     # Health endpoints
     @app.get("/health", tags=["Health"])
     async def health_check():
@@ -42,6 +42,25 @@ CACHE_MISSES = Counter(
     "Total cache misses",
 )
 
+GITHUB_FETCH_LATENCY = Histogram(
+    "hyperbeats_github_fetch_latency_seconds",
+    "GitHub fetch latency in seconds by stage",
+    ["stage"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+)
+
+GITHUB_REVALIDATIONS = Counter(
+    "hyperbeats_github_revalidations_total",
+    "GitHub conditional requests by outcome",
+    ["result"],
+)
+
+CIRCUIT_STATE = Gauge(
+    "hyperbeats_circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["name"],
+)
+
 
 class PrometheusMiddleware(BaseHTTPMiddleware):
     """Middleware to collect Prometheus metrics."""
@@ -85,6 +104,8 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
             if cache_status.startswith("HIT"):
                 cache_layer = cache_status.replace("HIT_", "").lower() or "unknown"
                 CACHE_HITS.labels(cache_layer=cache_layer).inc()
+            elif cache_status == "STALE":
+                CACHE_HITS.labels(cache_layer="stale").inc()
             elif cache_status == "MISS":
                 CACHE_MISSES.inc()
 
@@ -124,3 +145,17 @@ def record_cache_miss() -> None:
     """Record a cache miss."""
     CACHE_MISSES.inc()
 
+
+def record_github_fetch(stage: str, seconds: float) -> None:
+    """Record the latency of a GitHub fetch stage."""
+    GITHUB_FETCH_LATENCY.labels(stage=stage).observe(seconds)
+
+
+def record_github_revalidation(hit: bool) -> None:
+    """Record whether a conditional GitHub request was answered with 304."""
+    GITHUB_REVALIDATIONS.labels(result="not_modified" if hit else "modified").inc()
+
+
+def record_circuit_state(name: str, state: str) -> None:
+    """Record a circuit breaker state change."""
+    CIRCUIT_STATE.labels(name=name).set({"closed": 0, "half_open": 1, "open": 2}.get(state, 0))
@@ -0,0 +1,181 @@
+"""
+Circuit Breaker
+Stops calling an upstream that keeps failing and probes it before resuming.
+"""
+
+import time
+from typing import Optional
+
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_redis_optional
+from backend.hyperbeats.middleware.metrics_middleware import record_circuit_state
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast. Once ``recovery_timeout`` has passed it is half-open:
+    up to ``half_open_max_calls`` probe calls go through per timeout period,
+    a success closes the circuit and a failure opens it again. The open
+    state and failure count are shared across workers through Redis, so one
+    worker tripping the breaker stops the others too.
+    """
+
+    KEY_PREFIX = "circuit:"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        half_open_max_calls: Optional[int] = None,
+        shared: bool = True,
+        sync_interval: float = 1.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.circuit_failure_threshold
+        self.recovery_timeout = recovery_timeout or settings.circuit_recovery_timeout
+        self.half_open_max_calls = half_open_max_calls or settings.circuit_half_open_max_calls
+        self.shared = shared
+        self.sync_interval = sync_interval
+        self.key = f"{self.KEY_PREFIX}{name}"
+
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_window = 0.0
+        self._synced_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """Current state as seen by this worker."""
+        if not self._opened_at:
+            return CLOSED
+        if time.time() - self._opened_at < self.recovery_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    async def allow(self) -> bool:
+        """Whether a call may go to the upstream now."""
+        await self._sync()
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+
+        # Half-open: let a few probes through per recovery period
+        now = time.time()
+        if now - self._probe_window >= self.recovery_timeout:
+            self._probe_window = now
+            self._probes = 0
+        if self._probes >= self.half_open_max_calls:
+            return False
+        self._probes += 1
+        return True
+
+    async def check(self) -> None:
+        """
+        Raise instead of letting a call through.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or out of probes
+        """
+        if not await self.allow():
+            retry_in = max(self._opened_at + self.recovery_timeout - time.time(), 0.0)
+            raise CircuitOpenError(
+                f"{self.name} circuit is open. Retry in {int(retry_in)} seconds."
+            )
+
+    async def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self._failures or self._opened_at:
+            await self.reset()
+
+    async def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        self._failures += 1
+        redis_client = get_redis_optional() if self.shared else None
+        if redis_client is not None:
+            try:
+                shared_failures = await redis_client.hincrby(self.key, "failures", 1)
+                self._failures = max(self._failures, shared_failures)
+            except Exception:
+                pass
+
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self._failures >= self.failure_threshold
+        ):
+            self._opened_at = time.time()
+            self._probes = 0
+            record_circuit_state(self.name, OPEN)
+            await self._write(failures=self._failures, opened_at=self._opened_at)
+
+    async def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        self._failures = 0
+        self._opened_at = 0.0
+        record_circuit_state(self.name, CLOSED)
+        await self._write(failures=0, opened_at=0.0)
+
+    def clear(self) -> None:
+        """Forget this worker's view of the circuit, leaving shared state alone."""
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_window = 0.0
+        self._synced_at = 0.0
+
+    async def _write(self, failures: int, opened_at: float) -> None:
+        """Publish the state for other workers."""
+        redis_client = get_redis_optional() if self.shared else None
+        if redis_client is None:
+            return
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(self.key, mapping={"failures": failures, "opened_at": opened_at})
+                pipe.expire(self.key, int(self.recovery_timeout * 10) + 60)
+                await pipe.execute()
+        except Exception:
+            # Shared state is advisory; the local breaker keeps working
+            pass
+
+    async def _sync(self) -> None:
+        """Adopt state other workers have published, at most once per interval."""
+        redis_client = get_redis_optional() if self.shared else None
+        if redis_client is None:
+            return
+
+        now = time.time()
+        if now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+
+        try:
+            shared_state = await redis_client.hgetall(self.key)
+        except Exception:
+            return
+        if not shared_state:
+            return
+
+        opened_at = float(shared_state.get("opened_at", 0))
+        self._failures = int(shared_state.get("failures", 0))
+        if opened_at != self._opened_at:
+            self._opened_at = opened_at
+            self._probes = 0
+            record_circuit_state(self.name, self.state)
+
+
+# Global breaker around the GitHub API
+github_breaker = CircuitBreaker("github", shared=True)
@@ -0,0 +1,110 @@
+"""
+Conditional Request Cache
+Stores GitHub ETag/Last-Modified validators and bodies for 304 revalidation.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_redis_optional
+
+
+class ConditionalRequestCache:
+    """
+    Two-tier store of validated GitHub responses.
+
+    An in-process LRU sits in front of Redis. Entries hold the validators
+    (``etag``, ``last_modified``), the raw response ``body`` and the
+    ``next`` pagination link so a 304 can be replayed as the original page.
+    """
+
+    KEY_PREFIX = "github:etag:"
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[int] = None):
+        self.max_entries = max_entries or settings.github_etag_cache_size
+        self.ttl = ttl or settings.github_etag_cache_ttl
+        self._local: "OrderedDict[str, Dict]" = OrderedDict()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """Build a cache key from an endpoint and its query parameters."""
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        digest = hashlib.sha256(f"{endpoint}?{query}".encode()).hexdigest()
+        return digest[:32]
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """Get a stored entry, checking memory before Redis."""
+        entry = self._local.get(key)
+        if entry is not None:
+            self._local.move_to_end(key)
+            return entry
+
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return None
+
+        try:
+            raw = await redis_client.get(self.KEY_PREFIX + key)
+        except Exception:
+            return None
+        if not raw:
+            return None
+
+        entry = json.loads(raw)
+        self._remember(key, entry)
+        return entry
+
+    async def set(
+        self,
+        key: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        next_url: Optional[str] = None,
+    ) -> None:
+        """Store a response body with its validators."""
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "next": next_url,
+            "body": body,
+        }
+        self._remember(key, entry)
+
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return
+
+        try:
+            await redis_client.setex(self.KEY_PREFIX + key, self.ttl, json.dumps(entry))
+        except Exception:
+            # Redis is an optimisation here; the local copy still serves 304s
+            pass
+
+    @staticmethod
+    def validators(entry: Dict) -> Dict[str, str]:
+        """Conditional request headers for a stored entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def clear(self) -> None:
+        """Drop all in-process entries."""
+        self._local.clear()
+
+    def _remember(self, key: str, entry: Dict) -> None:
+        """Insert into the local LRU, evicting the oldest entries."""
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+
+# Global conditional cache instance
+conditional_cache = ConditionalRequestCache()
@@ -3,91 +3,339 @@ GitHub API Client
 Fetches repository activity data from GitHub.
 """
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
 from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import create_http_client, get_http_client_optional
+from backend.hyperbeats.middleware.metrics_middleware import (
+    record_github_fetch,
+    record_github_revalidation,
+)
+from backend.integrations.circuit_breaker import CircuitBreaker, CircuitOpenError, github_breaker
+from backend.integrations.conditional_cache import ConditionalRequestCache, conditional_cache
+from backend.integrations.contributor_sketch import ContributorSketches, contributor_sketches
 from backend.integrations.github_models import (
+    ActivityDelta,
     Commit,
+    CommitRecord,
     PullRequest,
+    PullRequestRecord,
     Issue,
+    IssueRecord,
     RepoStats,
+    event_key,
+)
+from backend.integrations.repo_statistics import RepoStatisticsCache, repo_statistics
+from backend.integrations.token_pool import (
+    RateLimitedError,
+    TokenPool,
+    resource_for,
+    token_pool,
 )
 
+T = TypeVar("T")
+
+# Search qualifiers per RepoStats counter, matching the listing path's
+# "created inside the window" semantics.
+SEARCH_COUNTERS = {
+    "prs_opened": "is:pr is:open",
+    "prs_merged": "is:pr is:merged",
+    "prs_closed": "is:pr is:closed is:unmerged",
+    "issues_opened": "is:issue is:open",
+    "issues_closed": "is:issue is:closed",
+}
+
+WEEK_SECONDS = 7 * 86400
+DAY_SECONDS = 86400
+
+
+def _utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare with API timestamps."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _day(value: datetime) -> datetime:
+    """UTC midnight (naive, as stored in DailyMetric.date) of a timestamp."""
+    value = _utc(value).astimezone(timezone.utc)
+    return datetime(value.year, value.month, value.day)
+
+
+def timeframe_start(timeframe: str) -> datetime:
+    """
+    Start of a timeframe window in UTC.
+
+    Live queries cover a rolling window, e.g. the last 24 hours for "1d".
+    Aligned to the hour so repeated polls send identical, revalidatable URLs.
+    """
+    days = {"1d": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365}.get(timeframe, 7)
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    return since.replace(minute=0, second=0, microsecond=0)
+
 
 class GitHubClient:
-    """Async GitHub API client with rate limiting support."""
+    """
+    Async GitHub API client with rate limiting support.
 
-    BASE_URL = "https://api.github.com"
+    Without an explicit token, calls are spread over the shared token pool.
+    With the "count" fetch strategy, repo stats come from GitHub's
+    precomputed statistics and search totals instead of listing every item.
+    Requests go through the app-wide connection pool when it is running.
+    Outside the app (scripts, tests) the first ``async with`` opens a
+    private client and the last one to exit closes it, so concurrent users
+    of one instance never close each other's connections.
+    """
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        cache: Optional[ConditionalRequestCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        tokens: Optional[TokenPool] = None,
+        statistics: Optional[RepoStatisticsCache] = None,
+        fetch_strategy: Optional[str] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        sketches: Optional[ContributorSketches] = None,
+    ):
         self.token = token or settings.github_token
-        self._client: Optional[httpx.AsyncClient] = None
-        self._rate_limit_remaining = 5000
-        self._rate_limit_reset: Optional[datetime] = None
+        self.token_pool = tokens or (TokenPool([token], shared=False) if token else token_pool)
+        self.conditional_cache = cache or (
+            conditional_cache if settings.github_conditional_requests else None
+        )
+        self.statistics = statistics or repo_statistics
+        self.fetch_strategy = fetch_strategy or settings.github_fetch_strategy
+        self.breaker = breaker or (github_breaker if settings.circuit_breaker_enabled else None)
+        self.sketches = sketches or contributor_sketches
+        self._client: Optional[httpx.AsyncClient] = http_client
+        self._owned_client: Optional[httpx.AsyncClient] = None
+        self._entered = 0
 
     @property
     def headers(self) -> Dict[str, str]:
         """Request headers with authentication."""
+        return self._headers_for(self.token)
+
+    @staticmethod
+    def _headers_for(token: str) -> Dict[str, str]:
+        """Request headers authenticated with a specific token."""
         headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
         }
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
         return headers
 
+    @property
+    def http(self) -> Optional[httpx.AsyncClient]:
+        """The HTTP client requests are sent through."""
+        return self._client or get_http_client_optional() or self._owned_client
+
     async def __aenter__(self):
         """Async context manager entry."""
-        self._client = httpx.AsyncClient(
-            base_url=self.BASE_URL,
-            headers=self.headers,
-            timeout=30.0,
-        )
+        self._entered += 1
+        if self.http is None:
+            self._owned_client = create_http_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self._client:
-            await self._client.aclose()
+        self._entered -= 1
+        if self._entered == 0 and self._owned_client:
+            await self._owned_client.aclose()
+            self._owned_client = None
 
-    def _update_rate_limit(self, response: httpx.Response) -> None:
+    async def _update_rate_limit(
+        self,
+        response: httpx.Response,
+        token: str,
+        resource: str,
+    ) -> None:
         """Update rate limit tracking from response headers."""
-        if "X-RateLimit-Remaining" in response.headers:
-            self._rate_limit_remaining = int(response.headers["X-RateLimit-Remaining"])
-        if "X-RateLimit-Reset" in response.headers:
-            self._rate_limit_reset = datetime.fromtimestamp(
-                int(response.headers["X-RateLimit-Reset"])
-            )
+        if "X-RateLimit-Remaining" not in response.headers:
+            return
+        await self.token_pool.update(
+            token,
+            remaining=int(response.headers["X-RateLimit-Remaining"]),
+            reset=float(response.headers.get("X-RateLimit-Reset", 0)),
+            resource=response.headers.get("X-RateLimit-Resource", resource),
+        )
+
+    async def _track_upstream(self, response: Optional[httpx.Response]) -> None:
+        """Report a call's outcome to the circuit breaker; None means it never answered."""
+        if self.breaker is None:
+            return
+        if response is None or response.status_code >= 500 or response.status_code == 429:
+            await self.breaker.record_failure()
+        else:
+            await self.breaker.record_success()
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
+        # An open circuit or exhausted pool fails fast; retrying would only wait it out
+        retry=retry_if_not_exception_type((CircuitOpenError, RateLimitedError)),
     )
-    async def _request(
+    async def _send(
         self,
         method: str,
         endpoint: str,
         params: Optional[Dict] = None,
-    ) -> Any:
-        """Make an API request with retry logic."""
-        if self._client is None:
+        body: Optional[Dict] = None,
+    ) -> httpx.Response:
+        """Send an API request with retry logic and return the raw response."""
+        client = self.http
+        if client is None:
             raise RuntimeError("Client not initialized. Use async context manager.")
 
-        # Check rate limit
-        if self._rate_limit_remaining <= settings.github_rate_limit_buffer:
-            if self._rate_limit_reset and datetime.now() < self._rate_limit_reset:
-                wait_seconds = (self._rate_limit_reset - datetime.now()).seconds
-                raise Exception(f"Rate limited. Reset in {wait_seconds} seconds.")
+        if self.breaker is not None:
+            await self.breaker.check()
+
+        # Pick the token with the most headroom, waiting for a reset if needed
+        resource = resource_for(endpoint)
+        token = await self.token_pool.acquire(resource)
+
+        # Revalidate GETs we have seen before; a 304 is free against the quota
+        cache_key = None
+        cached = None
+        headers = {}
+        if self.conditional_cache is not None and method == "GET":
+            cache_key = self.conditional_cache.make_key(endpoint, params)
+            cached = await self.conditional_cache.get(cache_key)
+            if cached:
+                headers = self.conditional_cache.validators(cached)
+
+        try:
+            response = await client.request(
+                method,
+                endpoint,
+                params=params,
+                json=body,
+                headers={**self._headers_for(token), **headers},
+            )
+        except httpx.TransportError:
+            await self._track_upstream(None)
+            raise
+        await self._track_upstream(response)
+        await self._update_rate_limit(response, token, resource)
+
+        if response.status_code == 304 and cached:
+            record_github_revalidation(hit=True)
+            return self._replay(cached, response.request)
 
-        response = await self._client.request(method, endpoint, params=params)
-        self._update_rate_limit(response)
         response.raise_for_status()
+
+        if cached:
+            record_github_revalidation(hit=False)
+        # Only store complete answers; a 202 "still computing" must not be replayed
+        validators = "ETag" in response.headers or "Last-Modified" in response.headers
+        if cache_key and response.status_code == 200 and validators:
+            await self.conditional_cache.set(
+                cache_key,
+                response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                next_url=response.links.get("next", {}).get("url"),
+            )
+
+        return response
+
+    @staticmethod
+    def _replay(entry: Dict, request: httpx.Request) -> httpx.Response:
+        """Rebuild a 200 response from a stored conditional-cache entry."""
+        headers = {"Content-Type": "application/json"}
+        if entry.get("next"):
+            headers["Link"] = f'<{entry["next"]}>; rel="next"'
+        return httpx.Response(
+            200,
+            content=entry["body"].encode(),
+            headers=headers,
+            request=request,
+        )
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        body: Optional[Dict] = None,
+    ) -> Any:
+        """Make an API request and return the decoded JSON body."""
+        response = await self._send(method, endpoint, params, body)
         return response.json()
 
+    async def _request_page(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Fetch one page of a list endpoint and the URL of the next page."""
+        response = await self._send("GET", endpoint, params)
+        next_url = response.links.get("next", {}).get("url")
+        return response.json(), next_url
+
+    async def _paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield raw items from a list endpoint, following Link rel="next".
+
+        The next page is requested while the current one is being consumed.
+        Iteration stops after ``max_pages`` pages or ``max_items`` items,
+        whichever comes first.
+        """
+        max_pages = max_pages or settings.github_max_pages
+        max_items = max_items or settings.github_max_items
+
+        pages = 0
+        items = 0
+        next_page: Optional[asyncio.Future] = asyncio.ensure_future(
+            self._request_page(endpoint, params)
+        )
+        try:
+            while next_page is not None:
+                data, next_url = await next_page
+                pages += 1
+
+                # Prefetch the next page before handing out this one
+                next_page = None
+                if next_url and pages < max_pages and items + len(data) < max_items:
+                    next_page = asyncio.ensure_future(self._request_page(next_url))
+
+                for item in data:
+                    if items >= max_items:
+                        return
+                    items += 1
+                    yield item
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+                # Swallow the outcome so an abandoned prefetch never warns
+                next_page.add_done_callback(lambda f: f.cancelled() or f.exception())
+
     async def get_repo(self, owner: str, repo: str) -> Dict:
         """Get repository information."""
         return await self._request("GET", f"/repos/{owner}/{repo}")
@@ -118,7 +366,7 @@ class GitHubClient:
         per_page: int = 100,
     ) -> List[PullRequest]:
         """Get pull requests for a repository."""
-        params = {"state": state, "per_page": per_page, "sort": "updated"}
+        params = {"state": state, "per_page": per_page, "sort": "updated", "direction": "desc"}
         data = await self._request("GET", f"/repos/{owner}/{repo}/pulls", params)
         return [PullRequest.from_api(pr) for pr in data]
 
@@ -136,6 +384,252 @@ class GitHubClient:
         issues = [Issue.from_api(i) for i in data if "pull_request" not in i]
         return issues
 
+    async def get_issues_page(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+        page: int,
+        per_page: int = 100,
+    ) -> Tuple[List[IssueRecord], bool]:
+        """
+        Get one numbered page of issues and PRs updated since ``since``.
+
+        Items are sorted by creation, newest first. Returns the page and
+        whether another one follows, so callers can resume by page number.
+        """
+        params = {
+            "state": "all",
+            "since": f"{_utc(since).astimezone(timezone.utc):%Y-%m-%dT%H:%M:%SZ}",
+            "sort": "created",
+            "direction": "desc",
+            "per_page": per_page,
+            "page": page,
+        }
+        data, next_url = await self._request_page(f"/repos/{owner}/{repo}/issues", params)
+        return [IssueRecord(item) for item in data], next_url is not None
+
+    async def iter_commits(
+        self,
+        owner: str,
+        repo: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        per_page: int = 100,
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+        parse: Callable[[Dict], Any] = Commit.from_api,
+    ) -> AsyncIterator[Commit]:
+        """
+        Stream commits for a repository across all pages.
+
+        ``parse`` builds each item; pass ``CommitRecord`` for the cheap
+        counting view instead of the full model.
+        """
+        params = {"per_page": per_page}
+        if since:
+            params["since"] = _utc(since).isoformat()
+        if until:
+            params["until"] = _utc(until).isoformat()
+
+        pages = self._paginate(f"/repos/{owner}/{repo}/commits", params, max_pages, max_items)
+        async with aclosing(pages):
+            async for data in pages:
+                yield parse(data)
+
+    async def iter_pull_requests(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        since: Optional[datetime] = None,
+        per_page: int = 100,
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+        parse: Callable[[Dict], Any] = PullRequest.from_api,
+    ) -> AsyncIterator[PullRequest]:
+        """
+        Stream pull requests, most recently updated first.
+
+        Stops as soon as a PR was last updated before ``since``; every later
+        page is older still.
+        """
+        params = {"state": state, "per_page": per_page, "sort": "updated", "direction": "desc"}
+        since = _utc(since) if since else None
+
+        pages = self._paginate(f"/repos/{owner}/{repo}/pulls", params, max_pages, max_items)
+        async with aclosing(pages):
+            async for data in pages:
+                pr = parse(data)
+                if since and pr.updated_at and pr.updated_at < since:
+                    return
+                yield pr
+
+    async def iter_issues(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        since: Optional[datetime] = None,
+        per_page: int = 100,
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+        parse: Callable[[Dict], Any] = Issue.from_api,
+    ) -> AsyncIterator[Issue]:
+        """
+        Stream issues (excluding PRs), most recently updated first.
+
+        Stops as soon as an issue was last updated before ``since``.
+        """
+        params = {"state": state, "per_page": per_page, "sort": "updated", "direction": "desc"}
+        since = _utc(since) if since else None
+        if since:
+            params["since"] = since.isoformat()
+
+        pages = self._paginate(f"/repos/{owner}/{repo}/issues", params, max_pages, max_items)
+        async with aclosing(pages):
+            async for data in pages:
+                issue = parse(data)
+                if since and issue.updated_at and issue.updated_at < since:
+                    return
+                # Filter out pull requests (they also appear in issues endpoint)
+                if "pull_request" in data:
+                    continue
+                yield issue
+
+    @staticmethod
+    async def _timed(stage: str, fetch: Awaitable[T]) -> T:
+        """Await a fetch stage and record its latency."""
+        start = time.perf_counter()
+        result = await fetch
+        record_github_fetch(stage, time.perf_counter() - start)
+        return result
+
+    async def _count_commits(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+    ) -> Tuple[int, Set[str]]:
+        """
+        Count commits since a date and collect their author logins.
+
+        The logins also go into the per-day contributor sketches, so
+        cross-repo unique counts can be answered for what was listed.
+        """
+        count = 0
+        authors: Set[str] = set()
+        daily: Dict[datetime, Set[str]] = defaultdict(set)
+        commits = self.iter_commits(owner, repo, since=since, parse=CommitRecord)
+        async with aclosing(commits):
+            async for commit in commits:
+                count += 1
+                if commit.author:
+                    authors.add(commit.author)
+                    if commit.date:
+                        daily[_day(commit.date)].add(commit.author)
+        await self.sketches.add(f"{owner}/{repo}", daily)
+        return count, authors
+
+    async def _count_commits_from_stats(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+    ) -> Tuple[int, Set[str]]:
+        """
+        Count commits and contributors from GitHub's precomputed statistics.
+
+        Commits are summed per day from the weekly commit activity. GitHub
+        only reports contributors per week, so anyone with commits in a week
+        overlapping the window is counted. Falls back to listing commits
+        while GitHub is still computing either statistic.
+        """
+        activity, contributors = await asyncio.gather(
+            self.statistics.get(self, owner, repo, "commit_activity"),
+            self.statistics.get(self, owner, repo, "contributors"),
+        )
+        if activity is None or contributors is None:
+            return await self._count_commits(owner, repo, since)
+
+        since_ts = since.timestamp()
+        count = 0
+        for week in activity:
+            for i, day in enumerate(week.get("days", [])):
+                if week["week"] + i * DAY_SECONDS >= since_ts:
+                    count += day
+
+        authors: Set[str] = set()
+        for contributor in contributors:
+            login = (contributor.get("author") or {}).get("login")
+            if not login:
+                continue
+            weeks = contributor.get("weeks", [])
+            if any(w["c"] and w["w"] + WEEK_SECONDS > since_ts for w in weeks):
+                authors.add(login)
+        return count, authors
+
+    async def _search_count(self, query: str) -> int:
+        """Total number of issues and PRs matching a search query."""
+        data = await self._request("GET", "/search/issues", {"q": query, "per_page": 1})
+        return data.get("total_count", 0)
+
+    async def _search_counts(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+    ) -> Dict[str, int]:
+        """Count PRs and issues created since a date with one search per counter."""
+        created = f"created:>={since:%Y-%m-%dT%H:%M:%SZ}"
+        totals = await asyncio.gather(
+            *(
+                self._search_count(f"repo:{owner}/{repo} {qualifiers} {created}")
+                for qualifiers in SEARCH_COUNTERS.values()
+            )
+        )
+        return dict(zip(SEARCH_COUNTERS, totals))
+
+    async def _count_pull_requests(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+    ) -> Dict[str, int]:
+        """Count PRs created since a date by outcome."""
+        counts = {"prs_opened": 0, "prs_merged": 0, "prs_closed": 0}
+        prs = self.iter_pull_requests(owner, repo, since=since, parse=PullRequestRecord)
+        async with aclosing(prs):
+            async for pr in prs:
+                if not pr.created_at or pr.created_at < since:
+                    continue
+                if pr.state == "open":
+                    counts["prs_opened"] += 1
+                elif pr.merged:
+                    counts["prs_merged"] += 1
+                elif pr.state == "closed":
+                    counts["prs_closed"] += 1
+        return counts
+
+    async def _count_issues(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+    ) -> Dict[str, int]:
+        """Count issues created since a date by state."""
+        counts = {"issues_opened": 0, "issues_closed": 0}
+        issues = self.iter_issues(owner, repo, since=since, parse=IssueRecord)
+        async with aclosing(issues):
+            async for issue in issues:
+                if not issue.created_at or issue.created_at < since:
+                    continue
+                if issue.state == "open":
+                    counts["issues_opened"] += 1
+                elif issue.state == "closed":
+                    counts["issues_closed"] += 1
+        return counts
+
     async def get_repo_stats(
         self,
         owner: str,
@@ -143,34 +637,126 @@ class GitHubClient:
         timeframe: str = "7d",
     ) -> RepoStats:
         """Get aggregated stats for a repository within a timeframe."""
-        # Calculate date range
-        days = {"1d": 1, "7d": 7, "30d": 30, "90d": 90, "1y": 365}.get(timeframe, 7)
-        since = datetime.utcnow() - timedelta(days=days)
-
-        # Fetch data
-        commits = await self.get_commits(owner, repo, since=since)
-        prs = await self.get_pull_requests(owner, repo)
-        issues = await self.get_issues(owner, repo)
-
-        # Filter by date
-        prs_in_range = [
-            pr for pr in prs
-            if pr.created_at and pr.created_at >= since
-        ]
-        issues_in_range = [
-            i for i in issues
-            if i.created_at and i.created_at >= since
-        ]
+        since = timeframe_start(timeframe)
+
+        if self.fetch_strategy == "count":
+            stages = [
+                ("commit_stats", self._count_commits_from_stats(owner, repo, since)),
+                ("search", self._search_counts(owner, repo, since)),
+            ]
+        else:
+            stages = [
+                ("commits", self._count_commits(owner, repo, since)),
+                ("pulls", self._count_pull_requests(owner, repo, since)),
+                ("issues", self._count_issues(owner, repo, since)),
+            ]
+
+        # Run the stages concurrently. If one fails the TaskGroup cancels the
+        # others before the error propagates.
+        start = time.perf_counter()
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(self._timed(stage, fetch)) for stage, fetch in stages]
+        except BaseExceptionGroup as eg:
+            raise eg.exceptions[0] from None
+        record_github_fetch("repo_stats", time.perf_counter() - start)
+
+        commits, authors = tasks[0].result()
+        counts: Dict[str, int] = {}
+        for task in tasks[1:]:
+            counts.update(task.result())
 
         return RepoStats(
-            commits=len(commits),
-            prs_opened=len([pr for pr in prs_in_range if pr.state == "open"]),
-            prs_merged=len([pr for pr in prs_in_range if pr.merged]),
-            prs_closed=len([pr for pr in prs_in_range if pr.state == "closed" and not pr.merged]),
-            issues_opened=len([i for i in issues_in_range if i.state == "open"]),
-            issues_closed=len([i for i in issues_in_range if i.state == "closed"]),
-            contributors=len(set(c.author for c in commits if c.author)),
+            commits=commits,
+            contributors=len(authors),
             timeframe=timeframe,
+            **counts,
+        )
+
+    async def get_activity(
+        self,
+        owner: str,
+        repo: str,
+        since: datetime,
+        until: datetime,
+        kinds: Iterable[str] = ("commits", "pulls", "issues"),
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+    ) -> ActivityDelta:
+        """
+        Count activity between two instants, bucketed by the UTC day it happened.
+
+        Unlike ``get_repo_stats``, each event lands on its own day: a PR
+        counts as opened on the day it was created and as merged or closed
+        on the day that happened, if either falls inside the window. The
+        PR and issue lists are walked most recently updated first and stop
+        at ``since``, so a short window costs a page or two per list.
+        ``kinds`` limits which lists are read. Every count is also named in
+        ``events``, the same way webhook deliveries name them.
+        """
+        since, until = _utc(since), _utc(until)
+        counts: Dict[datetime, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        contributors: Dict[datetime, Set[str]] = defaultdict(set)
+        events: Dict[str, Tuple[datetime, str]] = {}
+
+        def add(field: str, moment: Optional[datetime], kind: str, ident: Any) -> None:
+            if moment and since <= moment < until:
+                day = _day(moment)
+                counts[day][field] += 1
+                if kind == "commit":
+                    events[f"commit:{ident}"] = (day, field)
+                else:
+                    events[event_key(kind, ident, field.split("_", 1)[1], moment)] = (day, field)
+
+        async def commits() -> None:
+            items = self.iter_commits(
+                owner, repo, since=since, until=until,
+                max_pages=max_pages, max_items=max_items, parse=CommitRecord,
+            )
+            async with aclosing(items):
+                async for commit in items:
+                    add("commits", commit.date, "commit", commit.sha)
+                    if commit.date and commit.author and since <= commit.date < until:
+                        contributors[_day(commit.date)].add(commit.author)
+
+        async def pulls() -> None:
+            items = self.iter_pull_requests(
+                owner, repo, since=since,
+                max_pages=max_pages, max_items=max_items, parse=PullRequestRecord,
+            )
+            async with aclosing(items):
+                async for pr in items:
+                    add("prs_opened", pr.created_at, "pr", pr.number)
+                    if pr.merged:
+                        add("prs_merged", pr.merged_at, "pr", pr.number)
+                    else:
+                        add("prs_closed", pr.closed_at, "pr", pr.number)
+
+        async def issues() -> None:
+            items = self.iter_issues(
+                owner, repo, since=since,
+                max_pages=max_pages, max_items=max_items, parse=IssueRecord,
+            )
+            async with aclosing(items):
+                async for issue in items:
+                    add("issues_opened", issue.created_at, "issue", issue.number)
+                    add("issues_closed", issue.closed_at, "issue", issue.number)
+
+        stages = {"commits": commits, "pulls": pulls, "issues": issues}
+        start = time.perf_counter()
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for kind in kinds:
+                    tg.create_task(self._timed(kind, stages[kind]()))
+        except BaseExceptionGroup as eg:
+            raise eg.exceptions[0] from None
+        record_github_fetch("activity", time.perf_counter() - start)
+
+        return ActivityDelta(
+            repo=f"{owner}/{repo}",
+            counts={day: dict(fields) for day, fields in counts.items()},
+            contributors=dict(contributors),
+            events=events,
         )
 
 
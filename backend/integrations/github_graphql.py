@@ -0,0 +1,267 @@
+"""
+GitHub GraphQL Client
+Fetches stats for many repositories in a few batched GraphQL queries.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.middleware.metrics_middleware import record_github_fetch
+from backend.integrations.github_client import SEARCH_COUNTERS, GitHubClient, timeframe_start
+from backend.integrations.github_models import RepoStats
+
+
+# Connections requested per repository block: commit history plus one
+# search per counter. GitHub charges one rate-limit point per 100 of these.
+REPO_QUERY_COST = 1 + len(SEARCH_COUNTERS)
+
+REPO_BLOCK = """
+  r{i}: repository(owner: $owner{i}, name: $name{i}) {{
+    stargazerCount
+    forkCount
+    watchers {{ totalCount }}
+    defaultBranchRef {{
+      target {{
+        ... on Commit {{
+          history(since: $since, first: 100) {{
+            totalCount
+            pageInfo {{ hasNextPage endCursor }}
+            nodes {{ author {{ user {{ login }} }} }}
+          }}
+        }}
+      }}
+    }}
+  }}"""
+
+# Further pages of one repository's history, for its distinct authors
+HISTORY_PAGE_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp!, $after: String!) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(since: $since, first: 100, after: $after) {
+            pageInfo { hasNextPage endCursor }
+            nodes { author { user { login } } }
+          }
+        }
+      }
+    }
+  }
+}"""
+
+SEARCH_BLOCK = """
+  r{i}_{counter}: search(type: ISSUE, query: ${counter}{i}) {{ issueCount }}"""
+
+
+class GitHubGraphQLClient(GitHubClient):
+    """GitHub client that batches repository stats through GraphQL."""
+
+    def __init__(self, *args, max_cost: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_cost = max_cost or settings.github_graphql_max_cost
+
+    @property
+    def repos_per_query(self) -> int:
+        """How many repository blocks fit into one query's cost budget."""
+        return max(1, self.max_cost // REPO_QUERY_COST)
+
+    @staticmethod
+    def build_query(
+        repos: List[Tuple[str, str]],
+        since: str,
+    ) -> Tuple[str, Dict[str, str]]:
+        """Build an aliased query and its variables for a chunk of repos."""
+        declarations = ["$since: GitTimestamp!"]
+        blocks = []
+        variables: Dict[str, str] = {"since": since}
+        cutoff = since[:19] + "Z"
+
+        for i, (owner, name) in enumerate(repos):
+            declarations += [f"$owner{i}: String!", f"$name{i}: String!"]
+            variables[f"owner{i}"] = owner
+            variables[f"name{i}"] = name
+            blocks.append(REPO_BLOCK.format(i=i))
+
+            for counter, qualifiers in SEARCH_COUNTERS.items():
+                declarations.append(f"${counter}{i}: String!")
+                variables[f"{counter}{i}"] = f"repo:{owner}/{name} {qualifiers} created:>={cutoff}"
+                blocks.append(SEARCH_BLOCK.format(i=i, counter=counter))
+
+        query = f"query({', '.join(declarations)}) {{{''.join(blocks)}\n}}"
+        return query, variables
+
+    @staticmethod
+    def parse_response(
+        body: Dict,
+        repos: List[Tuple[str, str]],
+        timeframe: str,
+    ) -> Tuple[Dict[str, RepoStats], Dict[str, str]]:
+        """Turn a GraphQL response into per-repo stats and errors."""
+        data = body.get("data") or {}
+        alias_errors: Dict[str, str] = {}
+        for error in body.get("errors") or []:
+            path = error.get("path") or []
+            if path:
+                alias = str(path[0]).split("_", 1)[0]
+                alias_errors.setdefault(alias, error.get("message", "GraphQL error"))
+
+        stats: Dict[str, RepoStats] = {}
+        errors: Dict[str, str] = {}
+
+        for i, (owner, name) in enumerate(repos):
+            full_name = f"{owner}/{name}"
+            node = data.get(f"r{i}")
+            if node is None:
+                errors[full_name] = alias_errors.get(f"r{i}", "Repository not found")
+                continue
+
+            history = GitHubGraphQLClient._history(node)
+            authors, _ = GitHubGraphQLClient.parse_history(history)
+
+            counts = {
+                counter: (data.get(f"r{i}_{counter}") or {}).get("issueCount", 0)
+                for counter in SEARCH_COUNTERS
+            }
+
+            stats[full_name] = RepoStats(
+                commits=history.get("totalCount", 0),
+                contributors=len(authors),
+                timeframe=timeframe,
+                stars=node.get("stargazerCount", 0),
+                forks=node.get("forkCount", 0),
+                watchers=(node.get("watchers") or {}).get("totalCount", 0),
+                **counts,
+            )
+
+        return stats, errors
+
+    @staticmethod
+    def _history(node: Optional[Dict]) -> Dict:
+        target = ((node or {}).get("defaultBranchRef") or {}).get("target") or {}
+        return target.get("history") or {}
+
+    @staticmethod
+    def parse_history(history: Dict) -> Tuple[Set[str], Optional[str]]:
+        """Author logins on a page of commit history, and the cursor of the next page."""
+        authors = {
+            ((n.get("author") or {}).get("user") or {}).get("login")
+            for n in history.get("nodes") or []
+        }
+        authors.discard(None)
+        page_info = history.get("pageInfo") or {}
+        return authors, page_info.get("endCursor") if page_info.get("hasNextPage") else None
+
+    async def _fetch_chunk(
+        self,
+        repos: List[Tuple[str, str]],
+        timeframe: str,
+    ) -> Tuple[Dict[str, RepoStats], Dict[str, str]]:
+        """
+        Run one batched query.
+
+        The batch reads the first 100 commits of each history; repos with
+        more have their remaining authors paged in, within the same page
+        limit as REST commit listings.
+        """
+        since = timeframe_start(timeframe).isoformat()
+        query, variables = self.build_query(repos, since)
+
+        start = time.perf_counter()
+        body = await self._request("POST", "/graphql", body={"query": query, "variables": variables})
+        record_github_fetch("graphql", time.perf_counter() - start)
+
+        if not body.get("data") and body.get("errors"):
+            raise Exception(body["errors"][0].get("message", "GraphQL query failed"))
+
+        stats, errors = self.parse_response(body, repos, timeframe)
+        data = body.get("data") or {}
+
+        async def complete_authors(i: int, owner: str, name: str) -> None:
+            authors, cursor = self.parse_history(self._history(data.get(f"r{i}")))
+            if cursor is not None:
+                authors |= await self._remaining_authors(owner, name, since, cursor)
+                stats[f"{owner}/{name}"].contributors = len(authors)
+
+        await asyncio.gather(*(
+            complete_authors(i, owner, name)
+            for i, (owner, name) in enumerate(repos)
+            if f"{owner}/{name}" in stats
+        ))
+        return stats, errors
+
+    async def _remaining_authors(
+        self,
+        owner: str,
+        name: str,
+        since: str,
+        cursor: str,
+    ) -> Set[str]:
+        """Authors on the history pages after ``cursor``, up to ``github_max_pages`` in all."""
+        authors: Set[str] = set()
+        for _ in range(settings.github_max_pages - 1):
+            variables = {"owner": owner, "name": name, "since": since, "after": cursor}
+            body = await self._request(
+                "POST", "/graphql", body={"query": HISTORY_PAGE_QUERY, "variables": variables}
+            )
+            page_authors, cursor = self.parse_history(
+                self._history((body.get("data") or {}).get("repository"))
+            )
+            authors |= page_authors
+            if cursor is None:
+                break
+        return authors
+
+    async def get_many_repo_stats(
+        self,
+        repos: List[Tuple[str, str]],
+        timeframe: str = "7d",
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[Dict[str, RepoStats], Dict[str, str]]:
+        """
+        Get stats for many repositories.
+
+        Repos are split into chunks that fit the query cost budget and the
+        chunks run concurrently. A failed chunk reports an error for each of
+        its repos without affecting the others.
+
+        Returns:
+            (stats, errors) keyed by "owner/repo"
+        """
+        size = self.repos_per_query
+        chunks = [repos[i:i + size] for i in range(0, len(repos), size)]
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.aggregator_max_concurrency))
+        timeout = timeout or settings.aggregator_repo_timeout
+
+        async def run(chunk: List[Tuple[str, str]]):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self._fetch_chunk(chunk, timeframe), timeout)
+                except asyncio.TimeoutError:
+                    message = f"timed out after {timeout}s"
+                except Exception as e:
+                    message = str(e)
+            return {}, {f"{owner}/{name}": message for owner, name in chunk}
+
+        stats: Dict[str, RepoStats] = {}
+        errors: Dict[str, str] = {}
+        for chunk_stats, chunk_errors in await asyncio.gather(*(run(c) for c in chunks)):
+            stats.update(chunk_stats)
+            errors.update(chunk_errors)
+
+        return stats, errors
+
+    async def get_repo_stats(
+        self,
+        owner: str,
+        repo: str,
+        timeframe: str = "7d",
+    ) -> RepoStats:
+        """Get aggregated stats for a single repository."""
+        stats, errors = await self._fetch_chunk([(owner, repo)], timeframe)
+        if errors:
+            raise Exception(errors[f"{owner}/{repo}"])
+        return stats[f"{owner}/{repo}"]
@@ -3,8 +3,9 @@ GitHub Data Models
 Pydantic models for GitHub API responses.
 """
 
-from datetime import datetime
-from typing import Any, Dict, Optional
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -96,6 +97,163 @@ class Issue(BaseModel):
         )
 
 
+def _timestamp(value: Any) -> Optional[datetime]:
+    """Parse a GitHub timestamp, passing through ones already parsed."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+class CommitRecord:
+    """
+    Minimal commit view for counting.
+
+    Keeps only the fields ``get_repo_stats`` reads; the timestamp stays a
+    string until first accessed. Use ``Commit`` when the full model is needed.
+    """
+
+    __slots__ = ("sha", "author", "_date")
+
+    def __init__(self, data: Dict[str, Any]):
+        author = data.get("author")
+        self.sha = data.get("sha", "")
+        self.author = author.get("login") if author else None
+        self._date = (data.get("commit") or {}).get("author", {}).get("date")
+
+    @property
+    def date(self) -> Optional[datetime]:
+        self._date = _timestamp(self._date)
+        return self._date
+
+
+class PullRequestRecord:
+    """Minimal pull request view for counting, with lazily parsed timestamps."""
+
+    __slots__ = (
+        "number", "state", "merged", "author",
+        "_created_at", "_updated_at", "_merged_at", "_closed_at",
+    )
+
+    def __init__(self, data: Dict[str, Any]):
+        user = data.get("user")
+        self.number = data.get("number", 0)
+        self.state = data.get("state", "")
+        self.merged = data.get("merged_at") is not None
+        self.author = user.get("login") if user else None
+        self._created_at = data.get("created_at")
+        self._updated_at = data.get("updated_at")
+        self._merged_at = data.get("merged_at")
+        self._closed_at = data.get("closed_at")
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        self._created_at = _timestamp(self._created_at)
+        return self._created_at
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        self._updated_at = _timestamp(self._updated_at)
+        return self._updated_at
+
+    @property
+    def merged_at(self) -> Optional[datetime]:
+        self._merged_at = _timestamp(self._merged_at)
+        return self._merged_at
+
+    @property
+    def closed_at(self) -> Optional[datetime]:
+        self._closed_at = _timestamp(self._closed_at)
+        return self._closed_at
+
+
+class IssueRecord:
+    """Minimal issue view for counting, with lazily parsed timestamps."""
+
+    __slots__ = (
+        "number", "state", "author", "is_pull_request",
+        "_created_at", "_updated_at", "_closed_at", "_merged_at",
+    )
+
+    def __init__(self, data: Dict[str, Any]):
+        user = data.get("user")
+        pull_request = data.get("pull_request")
+        self.number = data.get("number", 0)
+        self.state = data.get("state", "")
+        self.author = user.get("login") if user else None
+        self.is_pull_request = pull_request is not None
+        self._created_at = data.get("created_at")
+        self._updated_at = data.get("updated_at")
+        self._closed_at = data.get("closed_at")
+        # The issues endpoint reports a PR's merge time under "pull_request"
+        self._merged_at = pull_request.get("merged_at") if pull_request else None
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        self._created_at = _timestamp(self._created_at)
+        return self._created_at
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        self._updated_at = _timestamp(self._updated_at)
+        return self._updated_at
+
+    @property
+    def closed_at(self) -> Optional[datetime]:
+        self._closed_at = _timestamp(self._closed_at)
+        return self._closed_at
+
+    @property
+    def merged_at(self) -> Optional[datetime]:
+        self._merged_at = _timestamp(self._merged_at)
+        return self._merged_at
+
+
+def event_key(kind: str, number: int, field: str, moment: datetime) -> str:
+    """
+    Name a PR or issue event, e.g. ``pr:42:merged:1709294400``.
+
+    The time is part of the key, so an issue closed again after being
+    reopened is a new event. Naive times are taken as UTC.
+    """
+    moment = moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return f"{kind}:{number}:{field}:{int(moment.timestamp())}"
+
+
+class ActivityDelta(BaseModel):
+    """
+    Metric increments for one repository, keyed by UTC day.
+
+    ``events`` names each counted event (``commit:<sha>``,
+    ``pr:<number>:merged:<epoch>``, ...) with the day and field it was
+    counted under, so webhooks and polls that see the same event can count
+    it once. ``incomplete`` marks a delta known to leave events out, such as
+    a push whose payload lists only some of its commits.
+    """
+    repo: str
+    counts: Dict[datetime, Dict[str, int]] = Field(default_factory=dict)
+    contributors: Dict[datetime, Set[str]] = Field(default_factory=dict)
+    events: Dict[str, Tuple[datetime, str]] = Field(default_factory=dict)
+    incomplete: bool = False
+
+    @property
+    def days(self) -> Set[datetime]:
+        return set(self.counts) | set(self.contributors)
+
+    def restricted_to(self, keys: Set[str]) -> "ActivityDelta":
+        """The same delta counting only the named events; contributors are kept."""
+        counts: Dict[datetime, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for key in keys:
+            day, field = self.events[key]
+            counts[day][field] += 1
+        return ActivityDelta(
+            repo=self.repo,
+            counts={day: dict(fields) for day, fields in counts.items()},
+            contributors=self.contributors,
+            events={key: self.events[key] for key in keys},
+            incomplete=self.incomplete,
+        )
+
+
 class RepoStats(BaseModel):
     """Aggregated repository statistics."""
     commits: int = 0
@@ -119,6 +277,21 @@ class AggregatedMetrics(BaseModel):
     total_issues_closed: int = 0
     unique_contributors: int = 0
     per_repo: Dict[str, RepoStats] = Field(default_factory=dict)
+    errors: List[str] = Field(default_factory=list)  # repos left out, and why
     timeframe: str = "7d"
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+
+class SourceRange(BaseModel):
+    """Consecutive periods of a series served by the same source."""
+    source: str  # database, live, mixed, unavailable
+    first: datetime
+    last: datetime  # start of the last period
+
+
+class ActivitySeries(BaseModel):
+    """Activity per period summed across repositories, with where each period came from."""
+    grain: str = "day"  # day, week, month
+    points: List[Dict[str, Any]] = Field(default_factory=list)
+    sources: List[SourceRange] = Field(default_factory=list)
+
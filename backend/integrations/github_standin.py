@@ -0,0 +1,550 @@
+"""
+GitHub Stand-in Server
+Local ASGI replacement for the GitHub REST and GraphQL endpoints the client uses.
+
+Serves recorded or synthetic repositories with configurable latency,
+pagination, rate limit headers, 202/304/403 responses and injected errors,
+so the fetch path can be tested and benchmarked without touching GitHub.
+
+Usage:
+    python -m backend.integrations.github_standin --synthetic octocat/hello --port 8081
+    python -m backend.integrations.github_standin --fixture repos.json --latency 0.05
+    python -m backend.integrations.github_standin --record repos.json octocat/hello
+
+Then point the app at it with GITHUB_API_BASE_URL=http://localhost:8081.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from collections import Counter
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request, Response
+from pydantic import BaseModel, Field
+
+from backend.integrations.github_client import GitHubClient
+
+
+WEEK_SECONDS = 7 * 86400
+
+# Requests per window and window length, per rate limit resource
+RATE_LIMITS = {"core": (5000, 3600), "search": (30, 60), "graphql": (5000, 3600)}
+
+
+class StandinConfig(BaseModel):
+    """Behaviour knobs for the stand-in server."""
+    latency: float = 0.0
+    jitter: float = 0.0
+    max_per_page: int = 100
+    rate_limits: Dict[str, Tuple[int, int]] = Field(default_factory=lambda: dict(RATE_LIMITS))
+    stats_pending: int = 1  # 202 responses before /stats data is "computed"
+    error_rate: float = 0.0
+    error_status: int = 502
+    fail: Dict[str, int] = Field(default_factory=dict)  # path regex -> status
+    seed: Optional[int] = None
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def synthetic_repo(
+    full_name: str,
+    commits: int = 200,
+    pulls: int = 60,
+    issues: int = 80,
+    days: int = 90,
+    authors: int = 12,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Generate a repository in the shape of GitHub's list endpoints.
+
+    ``issues`` holds what /issues returns, so pull requests appear there too.
+    Lists are newest first.
+    """
+    rng = random.Random(f"{full_name}:{seed}")
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    logins = [f"dev{i}" for i in range(authors)]
+    owner, name = full_name.split("/", 1)
+    base = f"https://github.com/{full_name}"
+
+    def moment() -> datetime:
+        return now - timedelta(seconds=rng.randrange(days * 86400))
+
+    commit_items = []
+    for _ in range(commits):
+        login = rng.choice(logins)
+        sha = "%040x" % rng.getrandbits(160)
+        commit_items.append({
+            "sha": sha,
+            "html_url": f"{base}/commit/{sha}",
+            "author": {"login": login} if rng.random() > 0.05 else None,
+            "commit": {
+                "message": f"Change {sha[:7]}",
+                "author": {"name": login, "email": f"{login}@example.com", "date": _iso(moment())},
+            },
+        })
+    commit_items.sort(key=lambda c: c["commit"]["author"]["date"], reverse=True)
+
+    def item(number: int, kind: str) -> Dict[str, Any]:
+        created = moment()
+        updated = min(now, created + timedelta(hours=rng.randrange(1, 240)))
+        state = "open" if rng.random() < 0.3 else "closed"
+        data = {
+            "number": number,
+            "title": f"{kind.title()} {number}",
+            "state": state,
+            "html_url": f"{base}/{'pull' if kind == 'pull' else 'issues'}/{number}",
+            "user": {"login": rng.choice(logins)},
+            "labels": [],
+            "created_at": _iso(created),
+            "updated_at": _iso(updated),
+            "closed_at": _iso(updated) if state == "closed" else None,
+        }
+        if kind == "pull":
+            data["merged_at"] = _iso(updated) if state == "closed" and rng.random() < 0.7 else None
+        return data
+
+    pull_items = [item(n, "pull") for n in range(1, pulls + 1)]
+    issue_items = [item(n, "issue") for n in range(pulls + 1, pulls + issues + 1)]
+    for pr in pull_items:
+        as_issue = {k: v for k, v in pr.items() if k != "merged_at"}
+        pull_request = {"url": pr["html_url"], "merged_at": pr["merged_at"]}
+        issue_items.append({**as_issue, "pull_request": pull_request})
+    pull_items.sort(key=lambda i: i["updated_at"], reverse=True)
+    issue_items.sort(key=lambda i: i["updated_at"], reverse=True)
+
+    return {
+        "repo": {
+            "full_name": full_name,
+            "name": name,
+            "owner": {"login": owner},
+            "stargazers_count": rng.randrange(10000),
+            "forks_count": rng.randrange(1000),
+            "subscribers_count": rng.randrange(500),
+        },
+        "commits": commit_items,
+        "pulls": pull_items,
+        "issues": issue_items,
+    }
+
+
+class GitHubStandin:
+    """
+    In-memory GitHub serving a fixed set of repositories.
+
+    ``repos`` maps "owner/name" to ``{"repo", "commits", "pulls", "issues"}``
+    as produced by ``synthetic_repo`` or ``record``.
+    """
+
+    def __init__(self, repos: Dict[str, Dict[str, Any]], config: Optional[StandinConfig] = None):
+        self.repos = {name.lower(): data for name, data in repos.items()}
+        self.config = config or StandinConfig()
+        self.calls: Counter = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._windows: Dict[Tuple[str, str], List[float]] = {}
+        self._stats_requests: Counter = Counter()
+
+    @classmethod
+    def from_file(cls, path: str, config: Optional[StandinConfig] = None) -> "GitHubStandin":
+        """Load repositories saved by ``record``."""
+        with open(path) as f:
+            return cls(json.load(f), config)
+
+    def repo(self, owner: str, name: str) -> Optional[Dict[str, Any]]:
+        return self.repos.get(f"{owner}/{name}".lower())
+
+    # ------------------------------------------------------------------
+    # Transport behaviour
+    # ------------------------------------------------------------------
+
+    def _rate_limit(self, request: Request, resource: str) -> Tuple[Dict[str, str], bool]:
+        """Charge one request to the caller's window; returns headers and whether allowed."""
+        token = request.headers.get("Authorization", "anonymous")
+        limit, period = self.config.rate_limits.get(resource, RATE_LIMITS["core"])
+        now = time.time()
+        window = self._windows.get((token, resource))
+        if window is None or now >= window[1]:
+            window = self._windows[(token, resource)] = [limit, now + period]
+
+        allowed = window[0] > 0
+        if allowed:
+            window[0] -= 1
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(int(window[0])),
+            "X-RateLimit-Reset": str(int(window[1])),
+            "X-RateLimit-Used": str(int(limit - window[0])),
+            "X-RateLimit-Resource": resource,
+        }
+        return headers, allowed
+
+    async def serve(
+        self,
+        request: Request,
+        resource: str,
+        build: Callable[[], Tuple[int, Any, Optional[str]]],
+    ) -> Response:
+        """
+        Answer a request the way GitHub would around ``build``.
+
+        ``build`` returns (status, body, next_url). Latency, injected errors,
+        rate limiting and ETag revalidation are applied here.
+        """
+        path = request.url.path
+        self.calls[path] += 1
+
+        delay = self.config.latency + self._rng.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        for pattern, status in self.config.fail.items():
+            if re.search(pattern, path):
+                return _json(status, {"message": "Injected failure"})
+        if self.config.error_rate and self._rng.random() < self.config.error_rate:
+            return _json(self.config.error_status, {"message": "Injected failure"})
+
+        status, body, next_url = build()
+        content = json.dumps(body).encode()
+        etag = f'W/"{hashlib.sha1(content).hexdigest()}"'
+
+        # Conditional requests that hit are not charged against the quota
+        if status == 200 and request.headers.get("If-None-Match") == etag:
+            self.calls["304"] += 1
+            return Response(status_code=304, headers={"ETag": etag})
+
+        headers, allowed = self._rate_limit(request, resource)
+        if not allowed:
+            return _json(403, {"message": "API rate limit exceeded"}, headers)
+
+        if status == 200:
+            headers["ETag"] = etag
+        if next_url:
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return Response(content, status_code=status, headers=headers, media_type="application/json")
+
+    def _page(self, request: Request, items: List[Dict]) -> Tuple[int, List[Dict], Optional[str]]:
+        """Slice a list by per_page/page and build the next link."""
+        params = request.query_params
+        per_page = min(int(params.get("per_page", 30)), self.config.max_per_page)
+        page = max(int(params.get("page", 1)), 1)
+        start = (page - 1) * per_page
+        next_url = None
+        if start + per_page < len(items):
+            next_url = str(request.url.include_query_params(page=page + 1))
+        return 200, items[start:start + per_page], next_url
+
+    # ------------------------------------------------------------------
+    # Endpoint data
+    # ------------------------------------------------------------------
+
+    def commits(self, data: Dict, since: Optional[str], until: Optional[str]) -> List[Dict]:
+        start, end = _parse(since), _parse(until)
+        selected = []
+        for commit in data["commits"]:
+            date = _parse(commit["commit"]["author"]["date"])
+            if (start and date < start) or (end and date > end):
+                continue
+            selected.append(commit)
+        return selected
+
+    @staticmethod
+    def _listing(items: List[Dict], request: Request) -> List[Dict]:
+        params = request.query_params
+        state = params.get("state", "open")
+        since = _parse(params.get("since"))
+        selected = [
+            i for i in items
+            if (state == "all" or i["state"] == state)
+            and (not since or _parse(i["updated_at"]) >= since)
+        ]
+        key = "created_at" if params.get("sort", "created") == "created" else "updated_at"
+        return sorted(selected, key=lambda i: i[key], reverse=params.get("direction") != "asc")
+
+    def commit_activity(self, data: Dict) -> List[Dict]:
+        """Last 52 weeks of daily commit counts, weeks starting Sunday."""
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        first = today - timedelta(days=(today.weekday() + 1) % 7 + 51 * 7)
+        weeks = [
+            {"week": int((first + timedelta(weeks=w)).timestamp()), "days": [0] * 7, "total": 0}
+            for w in range(52)
+        ]
+        for commit in data["commits"]:
+            offset = (_parse(commit["commit"]["author"]["date"]) - first).days
+            if 0 <= offset < 52 * 7:
+                week = weeks[offset // 7]
+                week["days"][offset % 7] += 1
+                week["total"] += 1
+        return weeks
+
+    def contributors(self, data: Dict) -> List[Dict]:
+        """Per-author weekly commit counts."""
+        weeks: Dict[str, Counter] = {}
+        for commit in data["commits"]:
+            if not commit.get("author"):
+                continue
+            ts = _parse(commit["commit"]["author"]["date"]).timestamp()
+            # GitHub weeks start on Sunday; the epoch was a Thursday
+            week = int((ts + 4 * 86400) // WEEK_SECONDS * WEEK_SECONDS - 4 * 86400)
+            weeks.setdefault(commit["author"]["login"], Counter())[week] += 1
+        return [
+            {
+                "author": {"login": login},
+                "total": sum(counts.values()),
+                "weeks": [{"w": w, "a": 0, "d": 0, "c": c} for w, c in sorted(counts.items())],
+            }
+            for login, counts in weeks.items()
+        ]
+
+    def search_count(self, query: str) -> int:
+        """Count issues and PRs for the qualifiers the client sends."""
+        terms = query.split()
+        repo = next((t[5:] for t in terms if t.startswith("repo:")), "")
+        data = self.repos.get(repo.lower())
+        if data is None:
+            return 0
+        created = next((_parse(t[10:]) for t in terms if t.startswith("created:>=")), None)
+
+        count = 0
+        for item in data["issues"]:
+            is_pr = "pull_request" in item
+            merged = is_pr and self._merged(data, item["number"])
+            if ("is:pr" in terms and not is_pr) or ("is:issue" in terms and is_pr):
+                continue
+            if "is:open" in terms and item["state"] != "open":
+                continue
+            if "is:closed" in terms and item["state"] != "closed":
+                continue
+            if ("is:merged" in terms and not merged) or ("is:unmerged" in terms and merged):
+                continue
+            if created and _parse(item["created_at"]) < created:
+                continue
+            count += 1
+        return count
+
+    @staticmethod
+    def _merged(data: Dict, number: int) -> bool:
+        return any(p["number"] == number and p.get("merged_at") for p in data["pulls"])
+
+    def graphql(self, variables: Dict[str, str]) -> Dict[str, Any]:
+        """Answer the aliased repository/search query built by GitHubGraphQLClient."""
+        if "after" in variables:
+            return self._history_page(variables)
+        body: Dict[str, Any] = {"data": {}}
+        errors = []
+        for key, value in variables.items():
+            match = re.fullmatch(r"owner(\d+)", key)
+            if match:
+                i = match.group(1)
+                alias = f"r{i}"
+                data = self.repo(value, variables[f"name{i}"])
+                if data is None:
+                    body["data"][alias] = None
+                    errors.append({"path": [alias], "message": "Could not resolve to a Repository"})
+                    continue
+                commits = self.commits(data, variables.get("since"), None)
+                body["data"][alias] = {
+                    "stargazerCount": data["repo"].get("stargazers_count", 0),
+                    "forkCount": data["repo"].get("forks_count", 0),
+                    "watchers": {"totalCount": data["repo"].get("subscribers_count", 0)},
+                    "defaultBranchRef": {"target": {"history": {
+                        "totalCount": len(commits),
+                        **self._history_nodes(commits, 0),
+                    }}},
+                }
+                continue
+            match = re.fullmatch(r"([a-z_]+?)(\d+)", key)
+            if match and not key.startswith("name"):
+                counter, i = match.groups()
+                body["data"][f"r{i}_{counter}"] = {"issueCount": self.search_count(value)}
+        if errors:
+            body["errors"] = errors
+        return body
+
+    def _history_page(self, variables: Dict[str, str]) -> Dict[str, Any]:
+        """Answer a follow-up page of one repository's commit history."""
+        data = self.repo(variables["owner"], variables["name"])
+        if data is None:
+            return {"data": {"repository": None}}
+        commits = self.commits(data, variables.get("since"), None)
+        history = self._history_nodes(commits, int(variables["after"]))
+        return {"data": {"repository": {"defaultBranchRef": {"target": {"history": history}}}}}
+
+    @staticmethod
+    def _history_nodes(commits: List[Dict], offset: int) -> Dict[str, Any]:
+        """One page of 100 history nodes from ``offset``, cursors being offsets."""
+        end = offset + 100
+        return {
+            "pageInfo": {"hasNextPage": end < len(commits), "endCursor": str(end)},
+            "nodes": [{"author": {"user": c["author"]}} for c in commits[offset:end]],
+        }
+
+    # ------------------------------------------------------------------
+    # App
+    # ------------------------------------------------------------------
+
+    def app(self) -> FastAPI:
+        """Build the ASGI app."""
+        app = FastAPI(title="GitHub stand-in", docs_url=None, redoc_url=None)
+        app.state.standin = self
+
+        def not_found() -> Tuple[int, Any, None]:
+            return 404, {"message": "Not Found"}, None
+
+        @app.get("/repos/{owner}/{name}")
+        async def get_repo(owner: str, name: str, request: Request) -> Response:
+            data = self.repo(owner, name)
+            return await self.serve(
+                request, "core", lambda: (200, data["repo"], None) if data else not_found()
+            )
+
+        @app.get("/repos/{owner}/{name}/commits")
+        async def list_commits(owner: str, name: str, request: Request) -> Response:
+            data = self.repo(owner, name)
+            params = request.query_params
+
+            def build():
+                if data is None:
+                    return not_found()
+                commits = self.commits(data, params.get("since"), params.get("until"))
+                return self._page(request, commits)
+
+            return await self.serve(request, "core", build)
+
+        @app.get("/repos/{owner}/{name}/{kind}")
+        async def list_items(owner: str, name: str, kind: str, request: Request) -> Response:
+            data = self.repo(owner, name)
+
+            def build():
+                if data is None or kind not in ("pulls", "issues"):
+                    return not_found()
+                return self._page(request, self._listing(data[kind], request))
+
+            return await self.serve(request, "core", build)
+
+        @app.get("/repos/{owner}/{name}/stats/{kind}")
+        async def stats(owner: str, name: str, kind: str, request: Request) -> Response:
+            data = self.repo(owner, name)
+            key = f"{owner}/{name}/{kind}".lower()
+
+            def build():
+                if data is None or kind not in ("commit_activity", "contributors"):
+                    return not_found()
+                self._stats_requests[key] += 1
+                if self._stats_requests[key] <= self.config.stats_pending:
+                    return 202, {}, None
+                if kind == "commit_activity":
+                    return 200, self.commit_activity(data), None
+                return 200, self.contributors(data), None
+
+            return await self.serve(request, "core", build)
+
+        @app.get("/search/issues")
+        async def search_issues(request: Request) -> Response:
+            query = request.query_params.get("q", "")
+            return await self.serve(
+                request,
+                "search",
+                lambda: (200, {"total_count": self.search_count(query), "items": []}, None),
+            )
+
+        @app.post("/graphql")
+        async def graphql(request: Request) -> Response:
+            payload = await request.json()
+            variables = payload.get("variables") or {}
+            return await self.serve(
+                request, "graphql", lambda: (200, self.graphql(variables), None)
+            )
+
+        @app.get("/_standin/calls")
+        async def calls() -> Dict[str, int]:
+            return dict(self.calls)
+
+        return app
+
+
+def _json(status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(
+        json.dumps(body), status_code=status, headers=headers, media_type="application/json"
+    )
+
+
+async def record(repos: List[str], path: str, max_items: int = 1000) -> None:
+    """Save repositories from the configured GitHub API as a stand-in fixture."""
+
+    async def collect(client: GitHubClient, endpoint: str, params: Dict) -> List[Dict]:
+        items = []
+        async with aclosing(client._paginate(endpoint, params, max_items=max_items)) as pages:
+            async for item in pages:
+                items.append(item)
+        return items
+
+    fixture = {}
+    async with GitHubClient() as client:
+        for full_name in repos:
+            base = f"/repos/{full_name}"
+            listing = {"state": "all", "per_page": 100, "sort": "updated", "direction": "desc"}
+            fixture[full_name] = {
+                "repo": await client.get_repo(*full_name.split("/", 1)),
+                "commits": await collect(client, f"{base}/commits", {"per_page": 100}),
+                "pulls": await collect(client, f"{base}/pulls", listing),
+                "issues": await collect(client, f"{base}/issues", listing),
+            }
+
+    with open(path, "w") as f:
+        json.dump(fixture, f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local GitHub API stand-in")
+    parser.add_argument("repos", nargs="*", help="owner/name repositories to record")
+    parser.add_argument("--synthetic", nargs="*", default=[], help="owner/name repos to generate")
+    parser.add_argument("--fixture", help="JSON file written by --record")
+    parser.add_argument("--record", help="record repos from GitHub into this file and exit")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stats-pending", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.repos, args.record))
+        return
+
+    repos = {name: synthetic_repo(name) for name in args.synthetic}
+    config = StandinConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        stats_pending=args.stats_pending,
+    )
+    if args.fixture:
+        standin = GitHubStandin.from_file(args.fixture, config)
+        standin.repos.update({k.lower(): v for k, v in repos.items()})
+    else:
+        standin = GitHubStandin(repos, config)
+
+    import uvicorn
+
+    uvicorn.run(standin.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+GitHub Webhooks
+Signature checks, event-to-metric translation and per-repo counters for webhooks.
+"""
+
+import hashlib
+import hmac
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+from backend.hyperbeats.dependencies import get_redis_optional
+from backend.integrations.contributor_sketch import contributor_sketches
+from backend.integrations.github_models import ActivityDelta, event_key
+
+
+SUPPORTED_EVENTS = ("push", "pull_request", "issues")
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check an ``X-Hub-Signature-256`` header against the raw request body."""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature[len("sha256="):], expected)
+
+
+def moment_of(timestamp: Optional[str]) -> datetime:
+    """A GitHub timestamp as an aware UTC datetime, or now if it is missing."""
+    if not timestamp:
+        return datetime.now(timezone.utc)
+    value = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def day_of(timestamp: Optional[str]) -> datetime:
+    """UTC midnight (naive, as stored in DailyMetric.date) of a GitHub timestamp."""
+    value = moment_of(timestamp)
+    return datetime(value.year, value.month, value.day)
+
+
+def event_delta(event: str, payload: Dict[str, Any]) -> Optional[ActivityDelta]:
+    """
+    Translate a webhook event into metric increments.
+
+    Returns None for events and actions that do not change any metric, such
+    as pushes to non-default branches or edited issues. Each increment is
+    named after the commit sha or the PR/issue number, action and time, as
+    ``GitHubClient.get_activity`` names them. A push whose ``size`` or
+    ``distinct_size`` exceeds the commits listed in the payload is marked
+    ``incomplete``.
+    """
+    repository = payload.get("repository") or {}
+    repo = repository.get("full_name")
+    if not repo or event not in SUPPORTED_EVENTS:
+        return None
+
+    counts: Dict[datetime, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    contributors: Dict[datetime, Set[str]] = defaultdict(set)
+    events: Dict[str, Tuple[datetime, str]] = {}
+    incomplete = False
+
+    def add(field: str, kind: str, number: int, timestamp: Optional[str]) -> None:
+        moment = moment_of(timestamp)
+        day = datetime(moment.year, moment.month, moment.day)
+        counts[day][field] += 1
+        events[event_key(kind, number, field.split("_", 1)[1], moment)] = (day, field)
+
+    if event == "push":
+        default_branch = repository.get("default_branch", "main")
+        if payload.get("ref") != f"refs/heads/{default_branch}":
+            return None
+        listed = payload.get("commits") or []
+        distinct = 0
+        for commit in listed:
+            # Commits already seen on another branch are not distinct
+            if not commit.get("distinct", True):
+                continue
+            distinct += 1
+            day = day_of(commit.get("timestamp"))
+            counts[day]["commits"] += 1
+            events[f"commit:{commit.get('id')}"] = (day, "commits")
+            login = (commit.get("author") or {}).get("username")
+            if login:
+                contributors[day].add(login)
+        # Large pushes list only their first commits; polling counts the rest
+        incomplete = (payload.get("size") or 0) > len(listed) or (
+            (payload.get("distinct_size") or 0) > distinct
+        )
+
+    elif event == "pull_request":
+        action = payload.get("action")
+        pr = payload.get("pull_request") or {}
+        number = pr.get("number") or payload.get("number") or 0
+        if action == "opened":
+            add("prs_opened", "pr", number, pr.get("created_at"))
+        elif action == "closed" and pr.get("merged"):
+            add("prs_merged", "pr", number, pr.get("merged_at"))
+        elif action == "closed":
+            add("prs_closed", "pr", number, pr.get("closed_at"))
+
+    elif event == "issues":
+        action = payload.get("action")
+        issue = payload.get("issue") or {}
+        number = issue.get("number") or 0
+        if action == "opened":
+            add("issues_opened", "issue", number, issue.get("created_at"))
+        elif action == "closed":
+            add("issues_closed", "issue", number, issue.get("closed_at"))
+
+    if not counts and not contributors and not incomplete:
+        return None
+
+    return ActivityDelta(
+        repo=repo,
+        counts={day: dict(fields) for day, fields in counts.items()},
+        contributors=dict(contributors),
+        events=events,
+        incomplete=incomplete,
+    )
+
+
+class WebhookCounters:
+    """
+    Per-repository activity counters kept in Redis from webhook deliveries.
+
+    Holds running totals and the time of the last event, so pollers can
+    skip repos that push their own updates, unless a delivery left events
+    out. Contributors go to the shared per-day sketches.
+    """
+
+    ACTIVITY_PREFIX = "repo:activity:"
+    DELIVERY_PREFIX = "webhook:delivery:"
+
+    def __init__(self, delivery_ttl: int = 86400):
+        self.delivery_ttl = delivery_ttl
+
+    async def claim_delivery(self, delivery_id: Optional[str]) -> bool:
+        """Whether this delivery is new; GitHub redelivers on timeouts."""
+        redis_client = get_redis_optional()
+        if redis_client is None or not delivery_id:
+            return True
+        try:
+            key = f"{self.DELIVERY_PREFIX}{delivery_id}"
+            return bool(await redis_client.set(key, 1, nx=True, ex=self.delivery_ttl))
+        except Exception:
+            return True
+
+    async def release_delivery(self, delivery_id: Optional[str]) -> None:
+        """Forget a delivery that failed so its redelivery is applied."""
+        redis_client = get_redis_optional()
+        if redis_client is None or not delivery_id:
+            return
+        try:
+            await redis_client.delete(f"{self.DELIVERY_PREFIX}{delivery_id}")
+        except Exception:
+            pass
+
+    async def add_contributors(self, delta: ActivityDelta) -> Dict[datetime, int]:
+        """
+        Add a delta's contributors to the per-day sketches.
+
+        Returns the estimated distinct contributor count of each day the
+        delta touched. Adding someone twice changes nothing, so this is safe
+        to repeat for a redelivery.
+        """
+        return await contributor_sketches.add(delta.repo, delta.contributors)
+
+    async def apply(self, delta: ActivityDelta) -> None:
+        """
+        Add a delta to the running counters.
+
+        Not idempotent: call it once per delivery, after the delta is stored.
+        """
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                activity_key = f"{self.ACTIVITY_PREFIX}{delta.repo.lower()}"
+                for fields in delta.counts.values():
+                    for field, n in fields.items():
+                        pipe.hincrby(activity_key, field, n)
+                pipe.hset(activity_key, "last_event_at", time.time())
+                await pipe.execute()
+        except Exception:
+            pass
+
+    async def mark_incomplete(self, repo: str) -> None:
+        """Ask the poller to read ``repo`` despite recent webhooks, since one left events out."""
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return
+        try:
+            key = f"{self.ACTIVITY_PREFIX}{repo.lower()}"
+            await redis_client.hsetnx(key, "incomplete_at", time.time())
+        except Exception:
+            pass
+
+    async def incomplete_at(self, repo: str) -> Optional[float]:
+        """When a delivery for ``repo`` first left events out since the last poll, if one did."""
+        return await self._timestamp(repo, "incomplete_at")
+
+    async def clear_incomplete(self, repo: str, polled_at: float) -> None:
+        """Forget the mark once a poll up to ``polled_at`` has counted what it left out."""
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return
+        try:
+            key = f"{self.ACTIVITY_PREFIX}{repo.lower()}"
+            value = await redis_client.hget(key, "incomplete_at")
+            if value and float(value) <= polled_at:
+                await redis_client.hdel(key, "incomplete_at")
+        except Exception:
+            pass
+
+    async def last_event_at(self, repo: str) -> Optional[float]:
+        """When the last webhook for ``repo`` was applied, if ever."""
+        return await self._timestamp(repo, "last_event_at")
+
+    async def _timestamp(self, repo: str, field: str) -> Optional[float]:
+        redis_client = get_redis_optional()
+        if redis_client is None:
+            return None
+        try:
+            value = await redis_client.hget(f"{self.ACTIVITY_PREFIX}{repo.lower()}", field)
+        except Exception:
+            return None
+        return float(value) if value else None
+
+
+# Global webhook counters
+webhook_counters = WebhookCounters()
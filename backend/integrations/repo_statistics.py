@@ -0,0 +1,134 @@
+"""
+Repository Statistics Cache
+Serves GitHub /stats endpoints, polling in the background while GitHub computes them.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from backend.hyperbeats.config import settings
+
+if TYPE_CHECKING:
+    from backend.integrations.github_client import GitHubClient
+
+
+class RepoStatisticsCache:
+    """
+    Cache for GitHub's precomputed repository statistics.
+
+    GitHub answers ``/repos/{owner}/{repo}/stats/*`` with 202 while it
+    computes the data. Instead of blocking the caller, the first 202 starts
+    one background poller per endpoint and the caller gets None (so it can
+    fall back to listing); later callers get the cached result. Results
+    are kept in an LRU of at most ``max_entries`` for ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        poll_attempts: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.ttl = ttl or settings.github_stats_ttl
+        self.poll_interval = poll_interval or settings.github_stats_poll_interval
+        self.poll_attempts = poll_attempts or settings.github_stats_poll_attempts
+        self.max_entries = max_entries or settings.github_stats_cache_size
+        self._results: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._pollers: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(owner: str, repo: str, kind: str) -> str:
+        return f"{owner}/{repo}/{kind}".lower()
+
+    async def get(
+        self,
+        client: "GitHubClient",
+        owner: str,
+        repo: str,
+        kind: str,
+    ) -> Optional[Any]:
+        """
+        Get a statistics payload, or None if GitHub is still computing it.
+
+        Args:
+            client: Client used for the request and any background polling
+            owner: Repository owner
+            repo: Repository name
+            kind: Statistics endpoint, e.g. "commit_activity" or "contributors"
+        """
+        key = self._key(owner, repo, kind)
+        cached = self._results.get(key)
+        if cached:
+            if time.monotonic() - cached[0] < self.ttl:
+                self._results.move_to_end(key)
+                return cached[1]
+            del self._results[key]
+
+        if key in self._pollers:
+            return None
+
+        data = await self._fetch(client, owner, repo, kind)
+        if data is not None:
+            self._remember(key, data)
+            return data
+
+        self._pollers[key] = asyncio.create_task(self._poll(client, owner, repo, kind, key))
+        return None
+
+    def _remember(self, key: str, data: Any) -> None:
+        """Insert into the LRU, evicting the oldest entries."""
+        self._results[key] = (time.monotonic(), data)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop cached results and cancel pollers."""
+        for task in self._pollers.values():
+            task.cancel()
+        self._pollers.clear()
+        self._results.clear()
+
+    @staticmethod
+    async def _fetch(
+        client: "GitHubClient",
+        owner: str,
+        repo: str,
+        kind: str,
+    ) -> Optional[Any]:
+        """Request a statistics endpoint once; None on 202."""
+        response = await client._send("GET", f"/repos/{owner}/{repo}/stats/{kind}")
+        if response.status_code == 202:
+            return None
+        return response.json()
+
+    async def _poll(
+        self,
+        client: "GitHubClient",
+        owner: str,
+        repo: str,
+        kind: str,
+        key: str,
+    ) -> None:
+        """Re-request a 202'd endpoint until GitHub has the data or we give up."""
+        try:
+            # Hold the client open for as long as we poll
+            async with client:
+                for _ in range(self.poll_attempts):
+                    await asyncio.sleep(self.poll_interval)
+                    try:
+                        data = await self._fetch(client, owner, repo, kind)
+                    except Exception:
+                        return
+                    if data is not None:
+                        self._remember(key, data)
+                        return
+        finally:
+            self._pollers.pop(key, None)
+
+
+# Global statistics cache instance
+repo_statistics = RepoStatisticsCache()
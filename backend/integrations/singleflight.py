@@ -0,0 +1,206 @@
+"""
+Singleflight
+Coalesces concurrent identical fetches into one upstream call.
+"""
+
+import asyncio
+import secrets
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_redis_optional
+
+
+# Extend a lock only while it is still ours
+RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Share one in-flight call per key between concurrent callers.
+
+    Within a worker, callers for the same key await one shared task. With
+    ``distributed`` enabled and Redis available, the first worker to take a
+    Redis lock runs the call and publishes the encoded result; the other
+    workers wait for it instead of fetching themselves, and fall back to
+    their own call if the leader fails or goes quiet.
+
+    The leader renews its lock every third of ``lock_ttl`` for as long as
+    its call runs, so a slow fetch keeps its followers. Followers wait up
+    to ``wait`` (the fetch timeout) for the result, but give up as soon as
+    the lock expires: a leader that died stops renewing it within
+    ``lock_ttl``.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        distributed: bool = True,
+        lock_ttl: Optional[float] = None,
+        result_ttl: Optional[int] = None,
+        wait: Optional[float] = None,
+    ):
+        self.prefix = prefix
+        self.distributed = distributed
+        self.lock_ttl = lock_ttl or settings.singleflight_lock_ttl
+        self.result_ttl = result_ttl or settings.singleflight_result_ttl
+        self.wait = wait or settings.aggregator_repo_timeout
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        encode: Optional[Callable[[Any], str]] = None,
+        decode: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        """
+        Run ``fn`` once for all concurrent callers of ``key``.
+
+        The shared call is shielded, so a caller timing out or being
+        cancelled does not cancel it for the others. Cross-worker sharing
+        needs ``encode``/``decode`` to move results through Redis.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._lead(key, fn, encode, decode))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for ``key`` is currently running in this worker."""
+        return key in self._inflight
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished task, leaving any newer call for the key alone."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the outcome as retrieved even if every caller went away
+            task.exception()
+
+    async def _lead(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        encode: Optional[Callable[[Any], str]],
+        decode: Optional[Callable[[str], Any]],
+    ) -> Any:
+        """Run the call for this worker, coordinating with others via Redis."""
+        redis_client = get_redis_optional() if self.distributed else None
+        if redis_client is None or encode is None or decode is None:
+            return await fn()
+
+        lock_key = f"singleflight:{self.prefix}:lock:{key}"
+        result_key = f"singleflight:{self.prefix}:result:{key}"
+        channel = f"singleflight:{self.prefix}:done:{key}"
+        owner = secrets.token_hex(8)
+
+        try:
+            acquired = await redis_client.set(
+                lock_key, owner, nx=True, px=int(self.lock_ttl * 1000)
+            )
+        except Exception:
+            return await fn()
+
+        if not acquired:
+            shared = await self._wait_for_leader(redis_client, lock_key, result_key, channel)
+            if shared is not None:
+                return decode(shared)
+            return await fn()
+
+        renewal = asyncio.create_task(self._renew(redis_client, lock_key, owner))
+        try:
+            result = await fn()
+        except BaseException:
+            await self._release(redis_client, lock_key, owner)
+            await self._publish(redis_client, channel, "")
+            raise
+        finally:
+            renewal.cancel()
+
+        # Store the result before releasing, so followers that see the lock gone find it
+        payload = encode(result)
+        try:
+            await redis_client.setex(result_key, self.result_ttl, payload)
+        except Exception:
+            pass
+        await self._release(redis_client, lock_key, owner)
+        await self._publish(redis_client, channel, payload)
+        return result
+
+    @staticmethod
+    async def _release(redis_client, lock_key: str, owner: str) -> None:
+        """Drop the lock if this worker still holds it."""
+        try:
+            if await redis_client.get(lock_key) == owner:
+                await redis_client.delete(lock_key)
+        except Exception:
+            pass
+
+    async def _renew(self, redis_client, lock_key: str, owner: str) -> None:
+        """Keep the lock alive while this worker's call runs; stop once it is lost."""
+        ttl_ms = int(self.lock_ttl * 1000)
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            try:
+                if not await redis_client.eval(RENEW_SCRIPT, 1, lock_key, owner, ttl_ms):
+                    return
+            except Exception:
+                pass
+
+    @staticmethod
+    async def _publish(redis_client, channel: str, payload: str) -> None:
+        """Notify waiting workers; an empty payload means 'fetch it yourself'."""
+        try:
+            await redis_client.publish(channel, payload)
+        except Exception:
+            pass
+
+    async def _wait_for_leader(
+        self,
+        redis_client,
+        lock_key: str,
+        result_key: str,
+        channel: str,
+    ) -> Optional[str]:
+        """Wait for another worker's result, or None if it never arrives or the leader died."""
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+
+            # The leader may have finished between our lock attempt and subscribe
+            cached = await redis_client.get(result_key)
+            if cached:
+                return cached
+
+            deadline = time.monotonic() + self.wait
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=min(remaining, self.lock_ttl),
+                )
+                if message is not None:
+                    return message["data"] or None
+                # A live leader keeps renewing the lock; a dead one lets it expire
+                if not await redis_client.exists(lock_key):
+                    return await redis_client.get(result_key) or None
+            return None
+        except Exception:
+            return None
+        finally:
+            try:
+                await pubsub.reset()
+            except Exception:
+                pass
+
+
+# Global singleflight for per-repo stats fetches
+repo_stats_flight = SingleFlight("repo_stats", distributed=settings.singleflight_distributed)
@@ -0,0 +1,223 @@
+"""
+GitHub Token Pool
+Routes GitHub calls across several tokens based on remaining rate limit.
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from backend.hyperbeats.config import settings
+from backend.hyperbeats.dependencies import get_redis_optional
+
+
+# Assumed headroom for a token whose window is unknown or has reset, per
+# resource: search allows 30 requests a minute, core and GraphQL 5000 an hour
+RESOURCE_LIMITS = {"core": 5000, "search": 30, "graphql": 5000}
+DEFAULT_LIMIT = RESOURCE_LIMITS["core"]
+
+# Length of each resource's rate limit window in seconds
+RESOURCE_WINDOWS = {"core": 3600, "search": 60, "graphql": 3600}
+DEFAULT_WINDOW = RESOURCE_WINDOWS["core"]
+
+
+class RateLimitedError(Exception):
+    """Raised when every token is exhausted for longer than the pool may wait."""
+
+
+class TokenState:
+    """Rate limit window of one token for one API resource."""
+
+    __slots__ = ("limit", "remaining", "reset")
+
+    def __init__(self, limit: int = DEFAULT_LIMIT, reset: float = 0.0):
+        self.limit = limit
+        self.remaining = limit
+        self.reset = reset
+
+    def refresh(self, now: float) -> None:
+        """Forget a window that has already reset."""
+        if self.reset and now >= self.reset:
+            self.remaining = self.limit
+            self.reset = 0.0
+
+
+class TokenPool:
+    """
+    Pool of GitHub tokens with rate-limit-aware scheduling.
+
+    Each call goes to the token with the most remaining requests for the
+    resource it hits (core, search, graphql). When every token is at the
+    buffer, callers wait for the earliest reset instead of failing. Windows
+    learnt from response headers are shared across workers through Redis.
+
+    The buffer is sized for the core limit and scaled down for smaller
+    windows, so search (30 a minute) keeps a proportional reserve.
+    """
+
+    KEY_PREFIX = "github:ratelimit:"
+
+    def __init__(
+        self,
+        tokens: List[str],
+        shared: bool = True,
+        buffer: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        sync_interval: float = 1.0,
+    ):
+        self.tokens = list(dict.fromkeys(tokens)) or [""]
+        self.shared = shared
+        self.buffer = settings.github_rate_limit_buffer if buffer is None else buffer
+        self.max_wait = settings.github_token_max_wait if max_wait is None else max_wait
+        self.sync_interval = sync_interval
+        self._ids = {t: hashlib.sha256(t.encode()).hexdigest()[:16] for t in self.tokens}
+        self._states: Dict[Tuple[str, str], TokenState] = {}
+        self._synced_at: Dict[str, float] = {}
+
+    def state(self, token: str, resource: str = "core") -> TokenState:
+        """Get the tracked window for a token and resource."""
+        key = (token, resource)
+        if key not in self._states:
+            self._states[key] = TokenState(RESOURCE_LIMITS.get(resource, DEFAULT_LIMIT))
+        return self._states[key]
+
+    def buffer_for(self, resource: str) -> int:
+        """Calls to keep in reserve on each token, scaled to the resource limit."""
+        limit = RESOURCE_LIMITS.get(resource, DEFAULT_LIMIT)
+        return math.ceil(self.buffer * limit / DEFAULT_LIMIT)
+
+    def _choose(self, resource: str, now: float) -> Optional[str]:
+        """Pick the token with the most headroom above the buffer."""
+        best = None
+        best_remaining = self.buffer_for(resource)
+        for token in self.tokens:
+            state = self.state(token, resource)
+            state.refresh(now)
+            if state.remaining > best_remaining:
+                best, best_remaining = token, state.remaining
+        return best
+
+    async def acquire(self, resource: str = "core") -> str:
+        """
+        Reserve a request on the best token for a resource.
+
+        Waits for the earliest reset when every token is exhausted. A token
+        counted down before GitHub reported its window is assumed to reset
+        one full window after that first call.
+
+        Raises:
+            RateLimitedError: If the earliest reset is further away than
+                max_wait, or no exhausted token has a known reset
+        """
+        while True:
+            await self._sync(resource)
+            now = time.time()
+            token = self._choose(resource, now)
+            if token is not None:
+                state = self.state(token, resource)
+                state.remaining -= 1
+                if not state.reset:
+                    state.reset = now + RESOURCE_WINDOWS.get(resource, DEFAULT_WINDOW)
+                return token
+
+            resets = [self.state(t, resource).reset for t in self.tokens]
+            resets = [reset for reset in resets if reset > now]
+            if not resets:
+                raise RateLimitedError("Rate limited. No reset time is known.")
+            wait_seconds = min(resets) - now
+            if wait_seconds > self.max_wait:
+                raise RateLimitedError(f"Rate limited. Reset in {int(wait_seconds)} seconds.")
+            await asyncio.sleep(wait_seconds + 0.1)
+
+    async def wait_for_headroom(self, reserve: float, resource: str = "core") -> None:
+        """
+        Wait until the pool has more than ``reserve`` of its quota left.
+
+        Lets background jobs spend only the top of each rate limit window,
+        keeping the reserved fraction for live requests. Below the reserve
+        this waits for the earliest reset.
+        """
+        while True:
+            await self._sync(resource)
+            now = time.time()
+            states = [self.state(token, resource) for token in self.tokens]
+            for state in states:
+                state.refresh(now)
+            if sum(state.remaining for state in states) > reserve * sum(s.limit for s in states):
+                return
+
+            resets = [state.reset for state in states if state.reset > now]
+            await asyncio.sleep(min(resets) - now + 0.1 if resets else 1.0)
+
+    async def update(
+        self,
+        token: str,
+        remaining: int,
+        reset: float,
+        resource: str = "core",
+    ) -> None:
+        """Record a token's window as reported by GitHub response headers."""
+        state = self.state(token, resource)
+        state.remaining = remaining
+        state.reset = reset
+
+        redis_client = get_redis_optional() if self.shared else None
+        if redis_client is None:
+            return
+
+        key = f"{self.KEY_PREFIX}{self._ids[token]}:{resource}"
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping={"remaining": remaining, "reset": reset})
+                pipe.expireat(key, int(reset) + 1)
+                await pipe.execute()
+        except Exception:
+            # Shared state is advisory; local tracking keeps working
+            pass
+
+    async def _sync(self, resource: str) -> None:
+        """Merge windows other workers have seen, at most once per interval."""
+        redis_client = get_redis_optional() if self.shared else None
+        if redis_client is None:
+            return
+
+        now = time.time()
+        if now - self._synced_at.get(resource, 0.0) < self.sync_interval:
+            return
+        self._synced_at[resource] = now
+
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for token in self.tokens:
+                    pipe.hgetall(f"{self.KEY_PREFIX}{self._ids[token]}:{resource}")
+                results = await pipe.execute()
+        except Exception:
+            return
+
+        for token, shared_state in zip(self.tokens, results):
+            if not shared_state:
+                continue
+            remaining = int(shared_state["remaining"])
+            reset = float(shared_state["reset"])
+            state = self.state(token, resource)
+            # A later reset means a newer window; within the same window the
+            # lower count has seen more traffic
+            if reset > state.reset:
+                state.remaining, state.reset = remaining, reset
+            elif reset == state.reset:
+                state.remaining = min(state.remaining, remaining)
+
+
+def resource_for(endpoint: str) -> str:
+    """The GitHub rate limit resource an endpoint is billed against."""
+    if endpoint.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if "/search/" in endpoint:
+        return "search"
+    return "core"
+
+
+# Global token pool built from GITHUB_TOKEN and GITHUB_TOKENS
+token_pool = TokenPool(settings.github_tokens_list)
@@ -0,0 +1,58 @@
+"""
+Backfill DailyMetric history for one or more repositories.
+
+Starts tracking the given repositories and runs their backfill to
+completion in the foreground, resuming from any saved checkpoints. The
+app's background job does the same for repositories added elsewhere.
+
+Usage:
+    python -m scripts.backfill owner/name [owner/name ...] [--days N]
+"""
+
+import argparse
+import asyncio
+
+from backend.database.metric_store import ensure_repository
+from backend.hyperbeats.aggregator.backfill import BackfillJob
+from backend.hyperbeats.dependencies import (
+    close_database,
+    close_redis,
+    get_session_factory_optional,
+    init_database,
+    init_redis,
+)
+
+
+async def run(repos, days: int) -> None:
+    await init_database()
+    await init_redis()
+    try:
+        async with get_session_factory_optional()() as session:
+            for full_name in repos:
+                await ensure_repository(session, full_name)
+            await session.commit()
+
+        job = BackfillJob(days=days)
+        async with job.client:
+            while await job.run_once():
+                pass
+        stats = job.ingested
+        print(
+            f"Wrote {stats.rows} rows in {stats.seconds:.1f}s"
+            f" ({stats.rows_per_second:.0f} rows/s)"
+        )
+    finally:
+        await close_redis()
+        await close_database()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill repository history")
+    parser.add_argument("repos", nargs="+", help="owner/name repositories")
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+    asyncio.run(run(args.repos, args.days))
+
+
+if __name__ == "__main__":
+    main()
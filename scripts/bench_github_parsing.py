@@ -0,0 +1,129 @@
+"""
+Microbenchmark: per-item parse cost of GitHub list pages.
+
+Compares the Pydantic ``from_api`` models against the slotted counting
+records on 100-item pages, reading the fields ``get_repo_stats`` uses.
+
+Usage:
+    python -m scripts.bench_github_parsing [--pages N]
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from backend.integrations.github_models import (
+    Commit,
+    CommitRecord,
+    Issue,
+    IssueRecord,
+    PullRequest,
+    PullRequestRecord,
+)
+
+PAGE_SIZE = 100
+
+
+def _iso(minutes_ago: int) -> str:
+    value = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def commit_page() -> List[Dict[str, Any]]:
+    return [
+        {
+            "sha": f"{i:040x}",
+            "html_url": f"https://github.com/o/r/commit/{i:040x}",
+            "author": {"login": f"dev{i % 7}", "id": i},
+            "commit": {
+                "message": "Fix the thing\n\nLonger description of the fix.",
+                "author": {"name": "Dev", "email": "dev@example.com", "date": _iso(i)},
+            },
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def pull_request_page() -> List[Dict[str, Any]]:
+    return [
+        {
+            "number": i,
+            "title": f"PR {i}",
+            "state": "closed" if i % 3 else "open",
+            "html_url": f"https://github.com/o/r/pull/{i}",
+            "user": {"login": f"dev{i % 7}", "id": i},
+            "created_at": _iso(i * 10),
+            "updated_at": _iso(i),
+            "merged_at": _iso(i) if i % 2 else None,
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def issue_page() -> List[Dict[str, Any]]:
+    return [
+        {
+            "number": i,
+            "title": f"Issue {i}",
+            "state": "closed" if i % 2 else "open",
+            "html_url": f"https://github.com/o/r/issues/{i}",
+            "user": {"login": f"dev{i % 7}", "id": i},
+            "labels": [{"name": "bug"}, {"name": "triage"}],
+            "created_at": _iso(i * 10),
+            "updated_at": _iso(i),
+            "closed_at": _iso(i) if i % 2 else None,
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def _commits(parse: Callable) -> Callable[[List[Dict]], None]:
+    def run(page: List[Dict]) -> None:
+        for data in page:
+            item = parse(data)
+            item.author
+
+    return run
+
+
+def _dated(parse: Callable) -> Callable[[List[Dict]], None]:
+    # Mirrors the counters: updated_at for the early stop, created_at for the window
+    def run(page: List[Dict]) -> None:
+        for data in page:
+            item = parse(data)
+            item.updated_at
+            item.created_at
+            item.state
+
+    return run
+
+
+CASES = [
+    ("commits", commit_page, _commits(Commit.from_api), _commits(CommitRecord)),
+    ("pulls", pull_request_page, _dated(PullRequest.from_api), _dated(PullRequestRecord)),
+    ("issues", issue_page, _dated(Issue.from_api), _dated(IssueRecord)),
+]
+
+
+def per_item_us(run: Callable[[List[Dict]], None], page: List[Dict], pages: int) -> float:
+    """Best-of-five per-item cost in microseconds."""
+    best = min(timeit.repeat(lambda: run(page), number=pages, repeat=5))
+    return best / (pages * len(page)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<10}{'model us/item':>16}{'record us/item':>16}{'speedup':>10}")
+    for name, make_page, model, record in CASES:
+        page = make_page()
+        model_us = per_item_us(model, page, args.pages)
+        record_us = per_item_us(record, page, args.pages)
+        print(f"{name:<10}{model_us:>16.2f}{record_us:>16.2f}{model_us / record_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
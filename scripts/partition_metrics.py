@@ -0,0 +1,43 @@
+"""
+Convert an existing daily_metrics table to monthly partitions.
+
+New installs create daily_metrics partitioned; installs created before
+partitioning run this once, with the app stopped, to move their rows
+across. Everything happens in one transaction, so a failure leaves the
+original table untouched.
+
+Usage:
+    python -m scripts.partition_metrics [--months-ahead N]
+"""
+
+import argparse
+import asyncio
+
+from backend.database.partitions import partition_existing_table
+from backend.hyperbeats.dependencies import (
+    close_database,
+    get_session_factory_optional,
+    init_database,
+)
+
+
+async def run(months_ahead: int) -> None:
+    await init_database()
+    try:
+        async with get_session_factory_optional()() as session:
+            moved = await partition_existing_table(session, months_ahead)
+            await session.commit()
+        print(f"Moved {moved} rows into partitioned daily_metrics")
+    finally:
+        await close_database()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partition daily_metrics by month")
+    parser.add_argument("--months-ahead", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.months_ahead))
+
+
+if __name__ == "__main__":
+    main()
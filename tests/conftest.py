@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 
 from backend.hyperbeats.main import app
 from backend.database.models import Base
+from backend.integrations.circuit_breaker import github_breaker
 
 
 # Test database URL (in-memory SQLite for tests)
@@ -25,6 +26,14 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def closed_github_breaker():
+    """Start every test with the process-wide GitHub breaker closed."""
+    github_breaker.clear()
+    yield
+    github_breaker.clear()
+
+
 @pytest.fixture(scope="session")
 async def test_engine():
     """Create test database engine."""
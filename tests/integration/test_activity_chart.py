@@ -21,7 +21,7 @@ class TestActivityChartEndpoint:
         
         # May fail due to GitHub API rate limits in tests
         # In production, this would use mocked responses
-        assert response.status_code in [200, 500]
+        assert response.status_code in [200, 500, 503]
         if response.status_code == 200:
             assert response.headers.get("content-type") == "image/svg+xml"
 
@@ -32,7 +32,7 @@ class TestActivityChartEndpoint:
             params={"repos": ["octocat/Hello-World"], "format": "png"}
         )
         
-        assert response.status_code in [200, 500]
+        assert response.status_code in [200, 500, 503]
         if response.status_code == 200:
             assert response.headers.get("content-type") == "image/png"
 
@@ -83,7 +83,7 @@ class TestActivityChartEndpoint:
             params={"repos": ["octocat/Hello-World", "microsoft/vscode"]}
         )
         
-        assert response.status_code in [200, 500]
+        assert response.status_code in [200, 500, 503]
 
     async def test_requires_repos_parameter(self, client: AsyncClient):
         """Test that repos parameter is required."""
@@ -102,3 +102,31 @@ class TestActivityChartEndpoint:
             assert "x-cache" in response.headers or "X-Cache" in response.headers
             assert "cache-control" in response.headers or "Cache-Control" in response.headers
 
+
+    async def test_hits_keep_the_ttl_of_incomplete_charts(
+        self, client: AsyncClient, monkeypatch
+    ):
+        """Test that a cached chart with unfetched days is served with its short max-age."""
+        from datetime import datetime
+
+        from backend.hyperbeats.aggregator.repo_aggregator import repo_aggregator
+        from backend.integrations.github_models import ActivitySeries, SourceRange
+
+        async def partial(repos, timeframe):
+            day = datetime(2024, 3, 1)
+            return ActivitySeries(
+                points=[{"date": day.isoformat(), "commits": 0}],
+                sources=[SourceRange(source="unavailable", first=day, last=day)],
+            )
+
+        monkeypatch.setattr(repo_aggregator, "get_series", partial)
+        params = {"repos": ["octocat/Partial-Chart"]}
+
+        miss = await client.get("/api/v1/chart/activity", params=params)
+        hit = await client.get("/api/v1/chart/activity", params=params)
+
+        assert miss.headers["X-Cache"] == "MISS"
+        assert miss.headers["Cache-Control"] == "public, max-age=60"
+        assert hit.headers["X-Cache"] != "MISS"
+        assert hit.headers["Cache-Control"] in ("public, max-age=60", "public, max-age=59")
+        assert hit.headers["X-Data-Source"] == miss.headers["X-Data-Source"]
@@ -0,0 +1,181 @@
+"""
+Integration Tests for the GitHub Client against the Local Stand-in
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from backend.integrations.conditional_cache import ConditionalRequestCache
+from backend.integrations.github_client import GitHubClient, timeframe_start
+from backend.integrations.github_graphql import GitHubGraphQLClient
+from backend.integrations.github_standin import GitHubStandin, StandinConfig, synthetic_repo
+from backend.integrations.repo_statistics import RepoStatisticsCache
+from backend.integrations.token_pool import TokenPool
+
+
+REPO = "octo/demo"
+
+
+def make_standin(**config) -> GitHubStandin:
+    return GitHubStandin({REPO: synthetic_repo(REPO)}, StandinConfig(**config))
+
+
+def http_client(standin: GitHubStandin) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=standin.app()),
+        base_url="http://github.test",
+    )
+
+
+def make_client(standin: GitHubStandin, cls=GitHubClient, **kwargs) -> GitHubClient:
+    return cls(
+        http_client=http_client(standin),
+        tokens=TokenPool(["test"], shared=False),
+        cache=ConditionalRequestCache(),
+        statistics=RepoStatisticsCache(poll_interval=0.01, poll_attempts=5),
+        **kwargs,
+    )
+
+
+def expected_counts(standin: GitHubStandin, timeframe: str) -> dict:
+    """PR and issue counters computed straight from the stand-in's data."""
+    data = standin.repos[REPO]
+    cutoff = timeframe_start(timeframe).strftime("%Y-%m-%dT%H:%M:%SZ")
+    pulls = [p for p in data["pulls"] if p["created_at"] >= cutoff]
+    issues = [
+        i for i in data["issues"]
+        if "pull_request" not in i and i["created_at"] >= cutoff
+    ]
+    return {
+        "prs_opened": sum(p["state"] == "open" for p in pulls),
+        "prs_merged": sum(bool(p["merged_at"]) for p in pulls),
+        "prs_closed": sum(p["state"] == "closed" and not p["merged_at"] for p in pulls),
+        "issues_opened": sum(i["state"] == "open" for i in issues),
+        "issues_closed": sum(i["state"] == "closed" for i in issues),
+    }
+
+
+@pytest.mark.asyncio
+class TestStandinFetchPath:
+    """Tests running the real fetch path against the stand-in."""
+
+    async def test_list_strategy_pages_through_everything(self):
+        """Test that listing follows pagination and counts match the data."""
+        standin = make_standin(max_per_page=10)
+        client = make_client(standin, fetch_strategy="list")
+
+        stats = await client.get_repo_stats("octo", "demo", "30d")
+
+        data = standin.repos[REPO]
+        cutoff = timeframe_start("30d").strftime("%Y-%m-%dT%H:%M:%SZ")
+        commits = [c for c in data["commits"] if c["commit"]["author"]["date"] >= cutoff]
+        assert stats.commits == len(commits)
+        assert stats.model_dump(include=set(expected_counts(standin, "30d"))) == (
+            expected_counts(standin, "30d")
+        )
+        assert standin.calls["/repos/octo/demo/commits"] > 1
+
+    async def test_backends_agree(self):
+        """Test that REST listing, count mode and GraphQL report the same counters."""
+        standin = make_standin(stats_pending=0)
+        listed = await make_client(standin, fetch_strategy="list").get_repo_stats(
+            "octo", "demo", "30d"
+        )
+        counted = await make_client(standin, fetch_strategy="count").get_repo_stats(
+            "octo", "demo", "30d"
+        )
+        batched = await make_client(standin, GitHubGraphQLClient).get_repo_stats(
+            "octo", "demo", "30d"
+        )
+
+        counters = set(expected_counts(standin, "30d"))
+        assert listed.model_dump(include=counters) == counted.model_dump(include=counters)
+        assert listed.model_dump(include=counters) == batched.model_dump(include=counters)
+        assert listed.commits == batched.commits
+        assert standin.calls["/search/issues"] == 5
+
+    async def test_activity_is_bucketed_by_event_day(self):
+        """Test that incremental activity counts each event on the day it happened."""
+        standin = make_standin(max_per_page=10)
+        client = make_client(standin)
+        until = datetime.now(timezone.utc).replace(microsecond=0)
+        since = until - timedelta(days=10)
+
+        delta = await client.get_activity("octo", "demo", since, until)
+
+        data = standin.repos[REPO]
+        start, end = (value.strftime("%Y-%m-%dT%H:%M:%SZ") for value in (since, until))
+
+        def within(value):
+            return value is not None and start <= value < end
+
+        issues = [i for i in data["issues"] if "pull_request" not in i]
+        expected = {
+            "commits": sum(within(c["commit"]["author"]["date"]) for c in data["commits"]),
+            "prs_opened": sum(within(p["created_at"]) for p in data["pulls"]),
+            "prs_merged": sum(within(p["merged_at"]) for p in data["pulls"]),
+            "prs_closed": sum(
+                within(p["closed_at"]) and not p["merged_at"] for p in data["pulls"]
+            ),
+            "issues_opened": sum(within(i["created_at"]) for i in issues),
+            "issues_closed": sum(within(i["closed_at"]) for i in issues),
+        }
+        totals = {field: 0 for field in expected}
+        for day, fields in delta.counts.items():
+            assert since.date() <= day.date() <= until.date()
+            for field, n in fields.items():
+                totals[field] += n
+        assert totals == expected
+
+    async def test_stats_202_then_computed(self):
+        """Test that count mode falls back on 202 and uses the stats once computed."""
+        standin = make_standin(stats_pending=1)
+        client = make_client(standin, fetch_strategy="count")
+
+        await client.get_repo_stats("octo", "demo", "7d")
+        assert standin.calls["/repos/octo/demo/commits"] == 1
+
+        await asyncio.gather(*client.statistics._pollers.values())
+        await client.get_repo_stats("octo", "demo", "7d")
+
+        assert standin.calls["/repos/octo/demo/commits"] == 1
+        assert standin.calls["/repos/octo/demo/stats/commit_activity"] == 2
+
+    async def test_revalidation_returns_304(self):
+        """Test that repeated GETs are answered with 304 and replayed."""
+        standin = make_standin()
+        client = make_client(standin)
+
+        first = await client.get_repo("octo", "demo")
+        second = await client.get_repo("octo", "demo")
+
+        assert first == second
+        assert standin.calls["304"] == 1
+
+
+@pytest.mark.asyncio
+class TestStandinBehaviour:
+    """Tests for the stand-in's rate limits and injected failures."""
+
+    async def test_rate_limit_headers_and_403(self):
+        """Test that an exhausted window is reported and enforced."""
+        standin = make_standin(rate_limits={"core": (2, 3600)})
+        async with http_client(standin) as http:
+            responses = [await http.get("/repos/octo/demo") for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 403]
+        assert responses[0].headers["X-RateLimit-Remaining"] == "1"
+        assert responses[2].headers["X-RateLimit-Remaining"] == "0"
+
+    async def test_injected_failures(self):
+        """Test path-based failure injection."""
+        standin = make_standin(fail={r"/pulls$": 500})
+        async with http_client(standin) as http:
+            pulls = await http.get("/repos/octo/demo/pulls")
+            repo = await http.get("/repos/octo/demo")
+
+        assert pulls.status_code == 500
+        assert repo.status_code == 200
@@ -17,7 +17,7 @@ class TestMetricsAggregateEndpoint:
             params={"repos": ["octocat/Hello-World"]}
         )
         
-        assert response.status_code in [200, 500]
+        assert response.status_code in [200, 500, 503]
         if response.status_code == 200:
             assert "application/json" in response.headers.get("content-type", "")
 
@@ -95,6 +95,37 @@ class TestMetricsAggregateEndpoint:
             aggregated = data["aggregated"]
             assert "repos_count" in aggregated  # Always included
 
+    async def test_serves_stale_when_circuit_open(self, client: AsyncClient, monkeypatch):
+        """Test that the last good metrics are served with X-Cache: STALE."""
+        from backend.cache.cache_manager import cache_manager
+        from backend.hyperbeats.aggregator.repo_aggregator import repo_aggregator
+        from backend.integrations.circuit_breaker import CircuitOpenError
+
+        repos = ["octocat/Spoon-Knife"]
+        cache_key = cache_manager.generate_cache_key(
+            prefix="metrics:aggregate",
+            repos=repos,
+            timeframe="7d",
+            theme="json",
+            format="json",
+        )
+        await cache_manager.set(f"stale:{cache_key}", {
+            "aggregated": {"commits": 7},
+            "per_repo": {},
+            "timeframe": "7d",
+            "timestamp": "2024-01-01T00:00:00",
+        }, ttl=60)
+
+        async def unavailable(*args, **kwargs):
+            raise CircuitOpenError("github circuit is open")
+
+        monkeypatch.setattr(repo_aggregator, "aggregate_repos", unavailable)
+        response = await client.get("/api/v1/metrics/aggregate", params={"repos": repos})
+
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "STALE"
+        assert response.json()["aggregated"]["commits"] == 7
+
 
 @pytest.mark.asyncio
 class TestSingleRepoEndpoint:
@@ -104,7 +135,7 @@ class TestSingleRepoEndpoint:
         """Test getting metrics for a single repo."""
         response = await client.get("/api/v1/metrics/repos/octocat/Hello-World")
         
-        assert response.status_code in [200, 500]
+        assert response.status_code in [200, 500, 503]
         if response.status_code == 200:
             data = response.json()
             assert data["repository"] == "octocat/Hello-World"
@@ -130,3 +161,39 @@ class TestSingleRepoEndpoint:
         
         assert response.status_code == 400
 
+
+
+@pytest.mark.asyncio
+class TestGitHubWebhookEndpoint:
+    """Tests for /api/v1/webhooks/github."""
+
+    async def test_rejects_unsigned_delivery(self, client: AsyncClient, monkeypatch):
+        """Test that deliveries without a valid signature are refused."""
+        from backend.hyperbeats.config import settings
+
+        monkeypatch.setattr(settings, "github_webhook_secret", "s3cret")
+        response = await client.post(
+            "/api/v1/webhooks/github",
+            content=b"{}",
+            headers={"X-GitHub-Event": "push", "X-Hub-Signature-256": "sha256=bad"},
+        )
+
+        assert response.status_code == 401
+
+    async def test_answers_ping(self, client: AsyncClient, monkeypatch):
+        """Test that GitHub's ping event is acknowledged."""
+        import hashlib
+        import hmac
+
+        from backend.hyperbeats.config import settings
+
+        monkeypatch.setattr(settings, "github_webhook_secret", "s3cret")
+        body = b'{"zen": "Design for failure."}'
+        signature = "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        response = await client.post(
+            "/api/v1/webhooks/github",
+            content=body,
+            headers={"X-GitHub-Event": "ping", "X-Hub-Signature-256": signature},
+        )
+
+        assert response.json() == {"status": "pong"}
@@ -0,0 +1,30 @@
+"""
+Unit Tests for API Error Handlers
+"""
+
+import json
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+from pydantic_core import PydanticUndefined
+
+from backend.hyperbeats.api.errors import validation_error_handler
+
+
+@pytest.mark.asyncio
+class TestValidationErrorHandler:
+    """Tests for 422 responses."""
+
+    async def test_undefined_input_is_sent_as_null(self):
+        """Test that a missing list parameter's undefined input does not break the 422."""
+        exc = RequestValidationError([{
+            "type": "missing",
+            "loc": ("query", "repos"),
+            "msg": "Field required",
+            "input": PydanticUndefined,
+        }])
+
+        response = await validation_error_handler(None, exc)
+
+        assert response.status_code == 422
+        assert json.loads(response.body)["detail"][0]["input"] is None
@@ -0,0 +1,231 @@
+"""
+Unit Tests for the Backfill Job
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from backend.database.metric_store import IngestStats
+from backend.hyperbeats.aggregator import backfill as module
+from backend.hyperbeats.aggregator.backfill import BackfillJob
+from backend.integrations.github_models import ActivityDelta, IssueRecord
+
+SINCE = datetime(2024, 1, 1)
+UNTIL = datetime(2024, 3, 1)
+
+
+def item(number, created, closed=None, merged=None, pull=False):
+    data = {
+        "number": number,
+        "state": "closed" if closed else "open",
+        "created_at": created,
+        "updated_at": closed or created,
+        "closed_at": closed,
+    }
+    if pull:
+        data["pull_request"] = {"url": f"https://example.test/pull/{number}", "merged_at": merged}
+    return IssueRecord(data)
+
+
+class TestCountIssues:
+    """Tests for bucketing a page of the issues listing."""
+
+    def test_events_land_on_their_own_days(self):
+        """Test that opened, merged and closed events are counted on the day they happened."""
+        page = [
+            item(9, "2024-02-10T12:00:00Z", closed="2024-02-12T08:00:00Z",
+                 merged="2024-02-12T08:00:00Z", pull=True),
+            item(8, "2024-02-01T00:30:00Z", closed="2024-02-03T23:59:00Z"),
+            item(7, "2023-12-20T00:00:00Z", closed="2024-01-05T10:00:00Z", pull=True),
+        ]
+
+        counts, lowest = BackfillJob.count_issues(page, SINCE, UNTIL, None)
+
+        assert counts == {
+            datetime(2024, 2, 10): {"prs_opened": 1},
+            datetime(2024, 2, 12): {"prs_merged": 1},
+            datetime(2024, 2, 1): {"issues_opened": 1},
+            datetime(2024, 2, 3): {"issues_closed": 1},
+            datetime(2024, 1, 5): {"prs_closed": 1},
+        }
+        assert lowest == 7
+
+    def test_events_outside_window_are_ignored(self):
+        """Test that activity after the sync cursor is left to incremental sync."""
+        page = [item(5, "2024-02-28T12:00:00Z", closed="2024-03-02T00:00:00Z")]
+
+        counts, _ = BackfillJob.count_issues(page, SINCE, UNTIL, None)
+
+        assert counts == {datetime(2024, 2, 28): {"issues_opened": 1}}
+
+    def test_items_already_counted_are_skipped(self):
+        """Test that items shifted onto the next page by new issues are not counted twice."""
+        page = [item(12, "2024-02-20T00:00:00Z"), item(10, "2024-02-15T00:00:00Z"),
+                item(6, "2024-02-01T00:00:00Z")]
+
+        counts, lowest = BackfillJob.count_issues(page, SINCE, UNTIL, last_number=7)
+
+        assert counts == {datetime(2024, 2, 1): {"issues_opened": 1}}
+        assert lowest == 6
+
+
+class CheckpointStore:
+    """Session factory keeping one BackfillCheckpoint and the batches written with it."""
+
+    def __init__(self, **checkpoint):
+        self.checkpoint = SimpleNamespace(
+            issues_page=1, last_issue_number=None, issues_done=False,
+            status="running", lease_until=None, last_error=None, **checkpoint,
+        )
+        self.batches = []
+
+    def __call__(self):
+        return CheckpointSession(self)
+
+
+class CheckpointSession:
+    def __init__(self, store):
+        self.store = store
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, model, key):
+        return SimpleNamespace(**vars(self.store.checkpoint))
+
+    async def execute(self, statement):
+        for name, value in statement.compile().params.items():
+            if hasattr(self.store.checkpoint, name):
+                setattr(self.store.checkpoint, name, value)
+
+    async def commit(self):
+        pass
+
+
+class PagedClient:
+    """GitHub stand-in serving commit chunks and issue pages, blocking when told to."""
+
+    def __init__(self, issue_pages, fail_on_page=None):
+        self.issue_pages = issue_pages
+        self.fail_on_page = fail_on_page
+        self.chunks = []
+        self.pages = []
+        self.budget_left = None
+        self.blocked = asyncio.Event()
+        self.token_pool = SimpleNamespace(wait_for_headroom=self.wait_for_headroom)
+
+    async def wait_for_headroom(self, reserve):
+        if self.budget_left is not None:
+            if self.budget_left == 0:
+                self.blocked.set()
+                await asyncio.Event().wait()
+            self.budget_left -= 1
+
+    async def get_activity(self, owner, repo, since, until, **kwargs):
+        self.chunks.append((since, until))
+        return ActivityDelta(repo=f"{owner}/{repo}", counts={since: {"commits": 1}})
+
+    async def get_issues_page(self, owner, repo, since, page, per_page=100):
+        if page == self.fail_on_page:
+            self.fail_on_page = None
+            raise RuntimeError("upstream error")
+        self.pages.append(page)
+        return self.issue_pages[page - 1], page < len(self.issue_pages)
+
+
+@pytest.mark.asyncio
+class TestResume:
+    """Tests for stopping a backfill partway and resuming from its checkpoint."""
+
+    @pytest.fixture(autouse=True)
+    def storage(self, monkeypatch):
+        async def add_daily_metrics(session, repository_id, counts, contributors, batch_id):
+            session.store.batches.append(batch_id)
+            return IngestStats(rows=len(counts))
+
+        async def add_contributors(full_name, contributors):
+            return {}
+
+        async def refresh(force=False):
+            return True
+
+        monkeypatch.setattr(module, "add_daily_metrics", add_daily_metrics)
+        monkeypatch.setattr(module.contributor_sketches, "add", add_contributors)
+        monkeypatch.setattr(module.leaderboard, "refresh", refresh)
+
+    @staticmethod
+    def store():
+        return CheckpointStore(
+            start_at=datetime(2024, 1, 1),
+            until_at=datetime(2024, 1, 31),
+            commits_before=datetime(2024, 1, 31),
+        )
+
+    async def test_budget_stop_resumes_after_the_last_saved_chunk(self):
+        """Test that a job held for budget and stopped keeps the chunks it saved."""
+        store = self.store()
+        repository_id = uuid4()
+        pages = [[item(3, "2024-01-20T00:00:00Z")], [item(2, "2024-01-10T00:00:00Z")]]
+        first = PagedClient(pages)
+        first.budget_left = 2
+
+        task = asyncio.create_task(
+            BackfillJob(client=first, chunk_days=10)
+            .backfill_repository(store, repository_id, "o/r")
+        )
+        await asyncio.wait_for(first.blocked.wait(), timeout=1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert first.chunks == [
+            (datetime(2024, 1, 21), datetime(2024, 1, 31)),
+            (datetime(2024, 1, 11), datetime(2024, 1, 21)),
+        ]
+        assert store.checkpoint.commits_before == datetime(2024, 1, 11)
+
+        second = PagedClient(pages)
+        await BackfillJob(client=second, chunk_days=10).backfill_repository(
+            store, repository_id, "o/r"
+        )
+
+        assert second.chunks == [(datetime(2024, 1, 1), datetime(2024, 1, 11))]
+        assert second.pages == [1, 2]
+        assert store.checkpoint.status == "done"
+        assert len(store.batches) == len(set(store.batches))
+
+    async def test_failed_page_resumes_from_its_checkpoint(self):
+        """Test that an error on an issues page retries that page, not the whole listing."""
+        store = self.store()
+        store.checkpoint.commits_before = store.checkpoint.start_at
+        repository_id = uuid4()
+        pages = [
+            [item(5, "2024-01-25T00:00:00Z"), item(4, "2024-01-20T00:00:00Z")],
+            [item(3, "2024-01-15T00:00:00Z")],
+        ]
+        client = PagedClient(pages, fail_on_page=2)
+        job = BackfillJob(client=client, chunk_days=10, tick=5)
+
+        await job.backfill_repository(store, repository_id, "o/r")
+
+        assert store.checkpoint.issues_page == 2
+        assert store.checkpoint.last_issue_number == 4
+        assert store.checkpoint.last_error == "RuntimeError: upstream error"
+        assert store.checkpoint.status == "running"
+
+        await job.backfill_repository(store, repository_id, "o/r")
+
+        assert client.pages == [1, 2]
+        assert store.checkpoint.issues_done
+        assert store.checkpoint.status == "done"
+        assert store.batches[-2:] == [
+            f"backfill:{repository_id}:issues:2",
+            None,
+        ]
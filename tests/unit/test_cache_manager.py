@@ -0,0 +1,85 @@
+"""
+Unit Tests for the Cache Tiers
+"""
+
+import pytest
+
+from backend.cache import cache_manager as module
+from backend.cache.cache_manager import CacheManager, decode_value, encode_value
+from backend.cache.memory_cache import MemoryCache
+from backend.cache.object_store import LocalObjectStore
+
+
+class TestEncoding:
+    """Tests for keeping value types through the text encoding."""
+
+    @pytest.mark.parametrize("value", [b"\x89PNG\r\n\x00", "<svg>\r\n</svg>", {"a": [1, 2]}])
+    def test_round_trip(self, value):
+        """Test that bytes, text and JSON values decode to what was stored."""
+        assert decode_value(encode_value(value)) == value
+
+
+class TestMemoryCache:
+    """Tests for the size-bounded LRU."""
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test that inserting past the limit drops the oldest unused entries."""
+        cache = MemoryCache(max_bytes=10, max_item_bytes=10)
+        cache.set("a", "aaaa", 60)
+        cache.set("b", "bbbb", 60)
+        cache.get("a")
+        cache.set("c", "cccc", 60)
+
+        assert cache.get("a") == "aaaa"
+        assert cache.get("b") is None
+        assert cache.size == 8
+
+    def test_oversized_and_expired_entries_are_not_kept(self):
+        """Test that entries too large or already expired are never stored."""
+        cache = MemoryCache(max_bytes=100, max_item_bytes=5)
+
+        assert cache.set("big", "x" * 6, 60) is False
+        assert cache.set("gone", "x", 0) is False
+        assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+class TestCacheManager:
+    """Tests for reading and writing through the tiers without Redis."""
+
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(module, "get_redis_optional", lambda: None)
+        return CacheManager(
+            default_ttl=60,
+            memory_max_bytes=1024,
+            memory_ttl=30,
+            object_store=LocalObjectStore(str(tmp_path)),
+            object_min_ttl=3600,
+        )
+
+    async def test_memory_then_object_hits(self, manager):
+        """Test that a long-lived entry survives losing the memory tier."""
+        await manager.set("chart", b"png", ttl=7200)
+
+        assert await manager.get("chart") == (b"png", "HIT_MEMORY")
+        manager.memory.clear()
+        assert await manager.get("chart") == (b"png", "HIT_OBJECT")
+        assert await manager.get("chart") == (b"png", "HIT_MEMORY")
+
+    async def test_short_lived_entries_skip_object_storage(self, manager):
+        """Test that entries below the object tier's minimum TTL stay in memory only."""
+        await manager.set("metrics", {"commits": 3}, ttl=1800)
+        manager.memory.clear()
+
+        assert await manager.get("metrics") == (None, "MISS")
+
+    async def test_delete_reaches_every_tier(self, manager):
+        """Test that an invalidated entry is gone from memory and object storage."""
+        await manager.set("chart", "<svg/>", ttl=7200)
+        await manager.delete("chart")
+
+        assert await manager.get("chart") == (None, "MISS")
+        stats = await manager.get_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == {"memory": 0, "redis": 0, "object": 0}
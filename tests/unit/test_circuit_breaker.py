@@ -0,0 +1,124 @@
+"""
+Unit Tests for the Circuit Breaker
+"""
+
+import httpx
+import pytest
+
+from backend.integrations.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from backend.integrations.github_client import GitHubClient
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = {"failure_threshold": 3, "recovery_timeout": 60, "shared": False}
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+@pytest.mark.asyncio
+class TestCircuitBreaker:
+    """Tests for closed / open / half-open transitions."""
+
+    async def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the failure threshold."""
+        breaker = make_breaker()
+        for _ in range(2):
+            await breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        await breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert not await breaker.allow()
+
+    async def test_success_resets_failure_count(self):
+        """Test that only consecutive failures count."""
+        breaker = make_breaker()
+        await breaker.record_failure()
+        await breaker.record_failure()
+        await breaker.record_success()
+        await breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    async def test_half_open_allows_one_probe(self):
+        """Test that after the timeout a single probe goes through."""
+        breaker = make_breaker(failure_threshold=1, recovery_timeout=0.01)
+        await breaker.record_failure()
+        breaker._opened_at -= 1
+
+        assert breaker.state == HALF_OPEN
+        assert await breaker.allow()
+        assert not await breaker.allow()
+
+    async def test_probe_outcome_closes_or_reopens(self):
+        """Test that a probe success closes the circuit and a failure reopens it."""
+        breaker = make_breaker(failure_threshold=1, recovery_timeout=0.01)
+        await breaker.record_failure()
+        breaker._opened_at -= 1
+        await breaker.record_failure()
+        assert breaker.state == OPEN
+
+        breaker._opened_at -= 1
+        await breaker.record_success()
+        assert breaker.state == CLOSED
+
+    async def test_check_raises_when_open(self):
+        """Test that check fails fast with CircuitOpenError."""
+        breaker = make_breaker(failure_threshold=1)
+        await breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError, match="Retry in"):
+            await breaker.check()
+
+
+@pytest.mark.asyncio
+class TestClientBreaker:
+    """Tests for the GitHub client honouring the breaker."""
+
+    async def test_open_circuit_skips_upstream(self):
+        """Test that calls fail fast without reaching GitHub or retrying."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={})
+
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            base_url="https://api.github.com",
+        )
+        breaker = make_breaker(failure_threshold=1)
+        await breaker.record_failure()
+        client = GitHubClient(token="test", http_client=http_client, breaker=breaker)
+
+        with pytest.raises(CircuitOpenError):
+            await client.get_repo("o", "r")
+        await http_client.aclose()
+
+        assert calls == []
+
+    async def test_server_errors_count_as_failures(self):
+        """Test that 5xx responses feed the breaker but 404s do not."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(502 if request.url.path.endswith("/down") else 404)
+
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            base_url="https://api.github.com",
+        )
+        breaker = make_breaker(failure_threshold=1)
+        client = GitHubClient(token="test", http_client=http_client, breaker=breaker)
+
+        await client._track_upstream(await http_client.get("/repos/o/missing"))
+        assert breaker.state == CLOSED
+        await client._track_upstream(await http_client.get("/repos/o/down"))
+        await http_client.aclose()
+
+        assert breaker.state == OPEN
@@ -0,0 +1,103 @@
+"""
+Unit Tests for Contributor Sketches
+"""
+
+from datetime import datetime
+
+import pytest
+
+from backend.integrations import contributor_sketch as module
+from backend.integrations.contributor_sketch import ContributorSketches
+
+
+class FakePipeline:
+    """Pipeline over a set of existing sketch keys, each counting one login."""
+
+    def __init__(self, present):
+        self.present = present
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def exists(self, *keys):
+        self.queued.append(sum(key in self.present for key in keys))
+
+    def pfcount(self, *keys):
+        self.queued.append(sum(key in self.present for key in keys))
+
+    async def execute(self):
+        return self.queued
+
+
+class FakeRedis:
+    def __init__(self, present):
+        self.present = present
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.present)
+
+
+class TestKeys:
+    """Tests for per-repo, per-day sketch keys."""
+
+    def test_covers_every_day_of_the_window(self):
+        """Test that a window spanning midnight includes both days for every repo."""
+        sketches = ContributorSketches()
+
+        keys = sketches.keys(
+            ["Octo/Demo", "octo/other"], datetime(2024, 1, 30, 18), datetime(2024, 2, 1, 6)
+        )
+
+        assert keys == [
+            "repo:contributors:hll:octo/demo:2024-01-30",
+            "repo:contributors:hll:octo/demo:2024-01-31",
+            "repo:contributors:hll:octo/demo:2024-02-01",
+            "repo:contributors:hll:octo/other:2024-01-30",
+            "repo:contributors:hll:octo/other:2024-01-31",
+            "repo:contributors:hll:octo/other:2024-02-01",
+        ]
+
+
+@pytest.mark.asyncio
+class TestWithoutRedis:
+    """Tests for behaviour when Redis is not configured."""
+
+    async def test_add_reports_exact_daily_counts(self):
+        """Test that adds fall back to the size of the given login sets."""
+        sketches = ContributorSketches()
+        day = datetime(2024, 1, 1)
+
+        counts = await sketches.add(
+            "octo/demo", {day: {"alice", "bob"}, datetime(2024, 1, 2): set()}
+        )
+
+        assert counts == {day: 2}
+
+    async def test_count_reports_no_data(self):
+        """Test that counting without Redis is distinguishable from zero."""
+        sketches = ContributorSketches()
+
+        since, until = datetime(2024, 1, 1), datetime(2024, 1, 7)
+
+        assert await sketches.count(["octo/demo"], since, until) is None
+
+
+@pytest.mark.asyncio
+class TestCountEach:
+    """Tests for per-repository counts."""
+
+    async def test_repos_without_sketches_are_left_out(self, monkeypatch):
+        """Test that evicted or never written sketches are not reported as zero contributors."""
+        sketches = ContributorSketches()
+        day = datetime(2024, 1, 1)
+        monkeypatch.setattr(
+            module, "get_redis_optional", lambda: FakeRedis({sketches.key("octo/demo", day)})
+        )
+
+        counts = await sketches.count_each(["octo/demo", "octo/gone"], day, day)
+
+        assert counts == {"octo/demo": 1}
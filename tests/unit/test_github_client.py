@@ -0,0 +1,398 @@
+"""
+Unit Tests for GitHub Client
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from backend.integrations.conditional_cache import ConditionalRequestCache
+from backend.integrations.github_client import GitHubClient, timeframe_start
+from backend.integrations.repo_statistics import RepoStatisticsCache
+
+
+def iso(days_ago: float) -> str:
+    """ISO timestamp for a point in the past, GitHub style."""
+    value = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_pr(number: int, days_ago: float, state: str = "closed", merged: bool = True) -> dict:
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "state": state,
+        "user": {"login": "dev"},
+        "created_at": iso(days_ago),
+        "updated_at": iso(days_ago),
+        "merged_at": iso(days_ago) if merged else None,
+    }
+
+
+class TestTimeframeStart:
+    """Tests for live query windows."""
+
+    def test_windows_are_rolling(self):
+        """Test that "1d" is the last 24 hours, not the current UTC day."""
+        since = timeframe_start("1d")
+        age = datetime.now(timezone.utc) - since
+
+        assert timedelta(hours=24) <= age < timedelta(hours=25)
+        assert since.minute == since.second == 0
+
+
+class StubbedClient(GitHubClient):
+    """GitHub client serving canned pages instead of calling GitHub."""
+
+    def __init__(self, pages=None, delay: float = 0.0, fail: str = ""):
+        super().__init__(token="test")
+        self.pages = pages or {}
+        self.delay = delay
+        self.fail = fail
+        self.requested = []
+        self.cancelled = []
+
+    async def _request_page(self, endpoint, params=None):
+        self.requested.append(endpoint)
+        name = endpoint.split("?")[0].rsplit("/", 1)[-1]
+        try:
+            await asyncio.sleep(self.delay if name != self.fail else 0.01)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        if name == self.fail:
+            raise ValueError(f"{name} failed")
+        # Pages are keyed by endpoint for the first page and by URL after that
+        return self.pages.get(endpoint, ([], None))
+
+
+@pytest.mark.asyncio
+class TestGetRepoStats:
+    """Tests for concurrent sub-fetches in get_repo_stats."""
+
+    async def test_sub_fetches_run_concurrently(self):
+        """Test that the three endpoint fetches overlap."""
+        client = StubbedClient(delay=0.1)
+
+        start = time.perf_counter()
+        stats = await client.get_repo_stats("owner", "repo", "7d")
+        elapsed = time.perf_counter() - start
+
+        assert stats.commits == 0
+        assert elapsed < 0.25
+
+    async def test_failure_cancels_other_fetches(self):
+        """Test that one failing fetch cancels its siblings and re-raises."""
+        client = StubbedClient(delay=1.0, fail="pulls")
+
+        with pytest.raises(ValueError, match="pulls failed"):
+            await client.get_repo_stats("owner", "repo", "7d")
+
+        assert sorted(client.cancelled) == ["commits", "issues"]
+
+    async def test_counts_prs_within_timeframe(self):
+        """Test that PR counts only include PRs created inside the window."""
+        pulls = [
+            make_pr(1, 1, state="open", merged=False),
+            make_pr(2, 2),
+            make_pr(3, 3, merged=False),
+            make_pr(4, 30),
+        ]
+        client = StubbedClient(pages={"/repos/owner/repo/pulls": (pulls, None)})
+
+        stats = await client.get_repo_stats("owner", "repo", "7d")
+
+        assert (stats.prs_opened, stats.prs_merged, stats.prs_closed) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+class TestPagination:
+    """Tests for Link-header pagination generators."""
+
+    async def test_follows_next_links(self):
+        """Test that every linked page is consumed in order."""
+        client = StubbedClient(pages={
+            "/repos/o/r/pulls": ([make_pr(1, 1), make_pr(2, 1)], "https://api/p2"),
+            "https://api/p2": ([make_pr(3, 2)], "https://api/p3"),
+            "https://api/p3": ([make_pr(4, 2)], None),
+        })
+
+        numbers = [pr.number async for pr in client.iter_pull_requests("o", "r")]
+
+        assert numbers == [1, 2, 3, 4]
+
+    async def test_item_budget_stops_iteration(self):
+        """Test that max_items caps the number of yielded items and pages fetched."""
+        client = StubbedClient(pages={
+            "/repos/o/r/pulls": ([make_pr(1, 1), make_pr(2, 1)], "https://api/p2"),
+            "https://api/p2": ([make_pr(3, 1), make_pr(4, 1)], "https://api/p3"),
+            "https://api/p3": ([make_pr(5, 1)], None),
+        })
+
+        numbers = [pr.number async for pr in client.iter_pull_requests("o", "r", max_items=3)]
+
+        assert numbers == [1, 2, 3]
+        assert "https://api/p3" not in client.requested
+
+    async def test_page_budget_stops_iteration(self):
+        """Test that max_pages caps the number of pages requested."""
+        client = StubbedClient(pages={
+            "/repos/o/r/pulls": ([make_pr(1, 1)], "https://api/p2"),
+            "https://api/p2": ([make_pr(2, 1)], "https://api/p3"),
+        })
+
+        numbers = [pr.number async for pr in client.iter_pull_requests("o", "r", max_pages=1)]
+
+        assert numbers == [1]
+        assert client.requested == ["/repos/o/r/pulls"]
+
+    async def test_stops_when_outside_since_window(self):
+        """Test that PRs updated before `since` end the stream early."""
+        client = StubbedClient(pages={
+            "/repos/o/r/pulls": ([make_pr(1, 1), make_pr(2, 10)], "https://api/p2"),
+            "https://api/p2": ([make_pr(3, 20)], None),
+        })
+        since = datetime.utcnow() - timedelta(days=7)
+
+        numbers = [pr.number async for pr in client.iter_pull_requests("o", "r", since=since)]
+
+        assert numbers == [1]
+
+    async def test_prefetches_next_page(self):
+        """Test that the next page is requested before the current one is consumed."""
+        client = StubbedClient(pages={
+            "/repos/o/r/pulls": ([make_pr(1, 1), make_pr(2, 1)], "https://api/p2"),
+            "https://api/p2": ([make_pr(3, 1)], None),
+        })
+
+        stream = client.iter_pull_requests("o", "r")
+        first = await stream.__anext__()
+        await asyncio.sleep(0)
+
+        assert first.number == 1
+        assert client.requested == ["/repos/o/r/pulls", "https://api/p2"]
+        await stream.aclose()
+
+    async def test_numbered_issues_page(self):
+        """Test that one page of the issues listing comes back with whether more follow."""
+        client = StubbedClient(pages={
+            "/repos/o/r/issues": ([make_pr(2, 1), make_pr(1, 2)], "https://api/p2"),
+        })
+
+        items, has_next = await client.get_issues_page("o", "r", datetime(2024, 1, 1), 1)
+
+        assert [item.number for item in items] == [2, 1]
+        assert has_next
+
+
+@pytest.mark.asyncio
+class TestConditionalRequests:
+    """Tests for ETag revalidation through the conditional cache."""
+
+    async def test_304_serves_stored_body(self):
+        """Test that a repeated GET revalidates and replays the stored page."""
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json=[make_pr(1, 1)],
+                headers={"ETag": '"v1"', "Link": '<https://api.github.com/p2>; rel="next"'},
+            )
+
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            base_url="https://api.github.com",
+        )
+        client = GitHubClient(
+            token="test",
+            cache=ConditionalRequestCache(max_entries=8),
+            http_client=http_client,
+        )
+
+        first = await client._request_page("/repos/o/r/pulls", {"state": "all"})
+        second = await client._request_page("/repos/o/r/pulls", {"state": "all"})
+        await http_client.aclose()
+
+        assert seen_headers == [None, '"v1"']
+        assert second == first
+        assert second[1] == "https://api.github.com/p2"
+
+    async def test_lru_evicts_oldest_entry(self):
+        """Test that the in-process layer stays within max_entries."""
+        cache = ConditionalRequestCache(max_entries=2)
+
+        await cache.set("a", "[]", etag='"a"')
+        await cache.set("b", "[]", etag='"b"')
+        await cache.get("a")
+        await cache.set("c", "[]", etag='"c"')
+
+        assert await cache.get("b") is None
+        assert (await cache.get("a"))["etag"] == '"a"'
+
+
+@pytest.mark.asyncio
+class TestConnectionPool:
+    """Tests for sharing one HTTP client across concurrent users."""
+
+    async def test_uses_shared_pool_without_closing_it(self, monkeypatch):
+        """Test that the app-wide pool is used and left open on exit."""
+        pool = httpx.AsyncClient(base_url="https://api.github.com")
+        monkeypatch.setattr(
+            "backend.integrations.github_client.get_http_client_optional", lambda: pool
+        )
+        client = GitHubClient(token="test")
+
+        async with client:
+            assert client.http is pool
+
+        assert not pool.is_closed
+        await pool.aclose()
+
+    async def test_concurrent_contexts_share_private_client(self):
+        """Test that overlapping `async with` blocks do not close each other's client."""
+        client = GitHubClient(token="test")
+
+        async with client:
+            first = client.http
+            async with client:
+                assert client.http is first
+            assert not first.is_closed
+
+        assert first.is_closed
+        assert client.http is None
+
+    async def test_auth_header_sent_per_request(self):
+        """Test that credentials travel on each request, not on the pooled client."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("Authorization"))
+            return httpx.Response(200, json={})
+
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            base_url="https://api.github.com",
+        )
+        await GitHubClient(token="abc", http_client=http_client).get_repo("o", "r")
+        await http_client.aclose()
+
+        assert seen == ["Bearer abc"]
+
+
+@pytest.mark.asyncio
+class TestCountStrategy:
+    """Tests for counting activity from GitHub's statistics and search endpoints."""
+
+    @staticmethod
+    def make_handler(calls, computing: int = 0):
+        now = int(time.time())
+        pending = {"commit_activity": computing}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            calls.append(path)
+            if path.endswith("/stats/commit_activity"):
+                if pending["commit_activity"] > 0:
+                    pending["commit_activity"] -= 1
+                    return httpx.Response(202, json={})
+                return httpx.Response(200, json=[
+                    {"week": now - 10 * 86400, "days": [1] * 7, "total": 7},
+                    {"week": now - 3 * 86400, "days": [2] * 7, "total": 14},
+                ])
+            if path.endswith("/stats/contributors"):
+                return httpx.Response(200, json=[
+                    {"author": {"login": "alice"}, "weeks": [{"w": now - 3 * 86400, "c": 2}]},
+                    {"author": {"login": "bob"}, "weeks": [{"w": now - 20 * 86400, "c": 5}]},
+                    {"author": {"login": "carol"}, "weeks": [{"w": now - 3 * 86400, "c": 0}]},
+                ])
+            if path == "/search/issues":
+                return httpx.Response(200, json={"total_count": 3, "items": []})
+            if path.endswith("/commits"):
+                return httpx.Response(200, json=[
+                    {"sha": "1", "author": {"login": "dev"}, "commit": {"message": "m"}},
+                ])
+            return httpx.Response(404, json={})
+
+        return handler
+
+    async def test_counts_from_stats_and_search(self):
+        """Test that count mode never lists PRs, issues or commits."""
+        calls = []
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self.make_handler(calls)),
+            base_url="https://api.github.com",
+        )
+        client = GitHubClient(
+            token="test",
+            http_client=http_client,
+            cache=ConditionalRequestCache(),
+            statistics=RepoStatisticsCache(),
+            fetch_strategy="count",
+        )
+
+        stats = await client.get_repo_stats("o", "r", "7d")
+        await http_client.aclose()
+
+        assert stats.commits == 4 + 14
+        assert stats.contributors == 1
+        assert stats.prs_opened == stats.issues_closed == 3
+        assert calls.count("/search/issues") == 5
+        assert not any(c.startswith("/repos/o/r/") and "/stats/" not in c for c in calls)
+
+    async def test_computing_stats_fall_back_then_poll(self):
+        """Test that a 202 falls back to listing while a background poll fills the cache."""
+        calls = []
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self.make_handler(calls, computing=2)),
+            base_url="https://api.github.com",
+        )
+        statistics = RepoStatisticsCache(poll_interval=0.01, poll_attempts=5)
+        client = GitHubClient(
+            token="test",
+            http_client=http_client,
+            cache=ConditionalRequestCache(),
+            statistics=statistics,
+            fetch_strategy="count",
+        )
+
+        first = await client.get_repo_stats("o", "r", "7d")
+        assert first.commits == 1
+        assert "/repos/o/r/commits" in calls
+
+        await asyncio.sleep(0.1)
+        calls.clear()
+        second = await client.get_repo_stats("o", "r", "7d")
+        await http_client.aclose()
+
+        assert second.commits == 18
+        assert not any("/stats/" in c or c.endswith("/commits") for c in calls)
+
+    async def test_statistics_cache_is_bounded(self):
+        """Test that cached /stats results are evicted least recently used first."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json=[])
+
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            base_url="https://api.github.com",
+        )
+        client = GitHubClient(
+            token="test", http_client=http_client, cache=ConditionalRequestCache()
+        )
+        statistics = RepoStatisticsCache(max_entries=2)
+
+        for repo in ("a", "b", "a", "c", "a", "b"):
+            await statistics.get(client, "o", repo, "contributors")
+        await http_client.aclose()
+
+        assert [path.split("/")[3] for path in calls] == ["a", "b", "c", "b"]
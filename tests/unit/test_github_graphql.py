@@ -0,0 +1,134 @@
+"""
+Unit Tests for the GitHub GraphQL Client
+"""
+
+import json
+import re
+
+import httpx
+import pytest
+
+from backend.integrations.github_graphql import REPO_QUERY_COST, GitHubGraphQLClient
+
+
+def graphql_standin(queries: list):
+    """Build a transport that answers aliased repository/search queries."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/graphql"
+        payload = json.loads(request.content)
+        variables = payload["variables"]
+        queries.append(payload)
+
+        if "after" in variables:
+            # A later page of one repo's history
+            history = {
+                "pageInfo": {"hasNextPage": variables["after"] == "page2", "endCursor": "page3"},
+                "nodes": [{"author": {"user": {"login": f"dev{variables['after']}"}}}],
+            }
+            repository = {"defaultBranchRef": {"target": {"history": history}}}
+            return httpx.Response(200, json={"data": {"repository": repository}})
+
+        data = {}
+        errors = []
+        for alias in re.findall(r"(r\d+): repository", payload["query"]):
+            i = alias[1:]
+            name = variables[f"name{i}"]
+            if name == "missing":
+                data[alias] = None
+                errors.append({"path": [alias], "message": "Could not resolve to a Repository"})
+                continue
+            data[alias] = {
+                "stargazerCount": 10,
+                "forkCount": 2,
+                "watchers": {"totalCount": 3},
+                "defaultBranchRef": {"target": {"history": {
+                    "totalCount": len(name),
+                    "pageInfo": {"hasNextPage": name == "busy", "endCursor": "page2"},
+                    "nodes": [
+                        {"author": {"user": {"login": "alice"}}},
+                        {"author": {"user": {"login": "bob"}}},
+                        {"author": {"user": None}},
+                    ],
+                }}},
+            }
+        for alias, var in re.findall(r"(r\d+_\w+): search\(type: ISSUE, query: \$(\w+)\)", payload["query"]):
+            data[alias] = {"issueCount": 5 if "is:merged" in variables[var] else 1}
+
+        body = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return httpx.Response(200, json=body)
+
+    return httpx.MockTransport(handler)
+
+
+def make_client(queries: list, max_cost: int = 100) -> GitHubGraphQLClient:
+    http_client = httpx.AsyncClient(
+        transport=graphql_standin(queries),
+        base_url="https://api.github.com",
+    )
+    return GitHubGraphQLClient(token="test", http_client=http_client, max_cost=max_cost)
+
+
+@pytest.mark.asyncio
+class TestGraphQLBackend:
+    """Tests for batched GraphQL repository stats."""
+
+    async def test_maps_response_to_repo_stats(self):
+        """Test that one query fills every RepoStats counter."""
+        queries = []
+        client = make_client(queries)
+
+        stats, errors = await client.get_many_repo_stats([("o", "alpha"), ("o", "beta")])
+
+        assert errors == {}
+        assert len(queries) == 1
+        alpha = stats["o/alpha"]
+        assert alpha.commits == 5
+        assert alpha.contributors == 2
+        assert alpha.prs_merged == 5
+        assert alpha.issues_closed == 1
+        assert (alpha.stars, alpha.forks, alpha.watchers) == (10, 2, 3)
+
+    async def test_contributors_cover_every_history_page(self):
+        """Test that authors beyond the first 100 commits are paged in and counted."""
+        queries = []
+        client = make_client(queries)
+
+        stats, errors = await client.get_many_repo_stats([("o", "alpha"), ("o", "busy")])
+
+        assert stats["o/alpha"].contributors == 2
+        assert stats["o/busy"].contributors == 4
+        assert [q["variables"].get("after") for q in queries[1:]] == ["page2", "page3"]
+
+    async def test_chunks_by_query_cost(self):
+        """Test that repos are split across queries to respect the cost budget."""
+        queries = []
+        client = make_client(queries, max_cost=REPO_QUERY_COST * 2)
+        repos = [("o", f"repo{i}") for i in range(5)]
+
+        stats, errors = await client.get_many_repo_stats(repos)
+
+        assert len(queries) == 3
+        assert len(stats) == 5
+
+    async def test_missing_repo_reported_per_repo(self):
+        """Test that a repo GraphQL cannot resolve does not fail the batch."""
+        queries = []
+        client = make_client(queries)
+
+        stats, errors = await client.get_many_repo_stats([("o", "alpha"), ("o", "missing")])
+
+        assert list(stats) == ["o/alpha"]
+        assert "Could not resolve" in errors["o/missing"]
+
+    async def test_query_uses_variables(self):
+        """Test that owner/name are passed as variables, not interpolated."""
+        query, variables = GitHubGraphQLClient.build_query(
+            [("evil\"", "repo")], "2024-01-01T00:00:00+00:00"
+        )
+
+        assert "evil" not in query
+        assert variables["owner0"] == 'evil"'
+        assert variables["prs_merged0"].endswith("created:>=2024-01-01T00:00:00Z")
@@ -0,0 +1,75 @@
+"""
+Unit Tests for GitHub Models
+"""
+
+from datetime import datetime, timezone
+
+from backend.integrations.github_models import (
+    Commit,
+    CommitRecord,
+    Issue,
+    IssueRecord,
+    PullRequest,
+    PullRequestRecord,
+)
+
+
+PR_DATA = {
+    "number": 1,
+    "title": "Add thing",
+    "state": "closed",
+    "user": {"login": "dev"},
+    "created_at": "2024-01-02T03:04:05Z",
+    "updated_at": "2024-01-03T03:04:05Z",
+    "merged_at": "2024-01-03T03:04:05Z",
+}
+
+
+class TestCountingRecords:
+    """Tests for the slotted records used on the counting path."""
+
+    def test_pull_request_record_matches_model(self):
+        """Test that the record exposes the same values as the full model."""
+        model = PullRequest.from_api(PR_DATA)
+        record = PullRequestRecord(PR_DATA)
+
+        assert record.state == model.state
+        assert record.merged == model.merged
+        assert record.author == model.author
+        assert record.created_at == model.created_at
+        assert record.updated_at == model.updated_at
+
+    def test_timestamps_parse_lazily(self):
+        """Test that timestamps stay raw until read, then are kept parsed."""
+        record = PullRequestRecord(PR_DATA)
+        assert record._created_at == "2024-01-02T03:04:05Z"
+
+        created = record.created_at
+
+        assert created == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        assert record._created_at is created
+
+    def test_issue_record_flags_pull_requests(self):
+        """Test that issue records remember whether the item is a PR."""
+        data = {**PR_DATA, "pull_request": {}}
+
+        assert IssueRecord(data).is_pull_request
+        assert IssueRecord(PR_DATA).created_at == Issue.from_api(PR_DATA).created_at
+
+    def test_commit_record_matches_model(self):
+        """Test commit records, including commits without a linked user."""
+        data = {
+            "sha": "abc",
+            "author": {"login": "dev"},
+            "commit": {"message": "m", "author": {"date": "2024-01-02T03:04:05Z"}},
+        }
+        anonymous = {"sha": "def", "author": None, "commit": {"author": {}}}
+
+        assert CommitRecord(data).author == Commit.from_api(data).author
+        assert CommitRecord(data).date == Commit.from_api(data).date
+        assert CommitRecord(anonymous).author is None
+        assert CommitRecord(anonymous).date is None
+
+    def test_records_have_no_instance_dict(self):
+        """Test that records stay slotted."""
+        assert not hasattr(PullRequestRecord(PR_DATA), "__dict__")
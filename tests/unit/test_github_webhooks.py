@@ -0,0 +1,221 @@
+"""
+Unit Tests for GitHub Webhook Ingestion
+"""
+
+import hashlib
+import hmac
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.hyperbeats.api.v1 import webhooks as module
+from backend.integrations.github_webhooks import (
+    ActivityDelta,
+    event_delta,
+    verify_signature,
+    webhook_counters,
+)
+from backend.integrations.github_models import event_key
+
+
+REPOSITORY = {"full_name": "octo/demo", "default_branch": "main"}
+
+
+def sign(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class TestSignature:
+    """Tests for X-Hub-Signature-256 verification."""
+
+    def test_accepts_valid_signature(self):
+        body = b'{"zen": "Keep it logically awesome."}'
+        assert verify_signature("s3cret", body, sign("s3cret", body))
+
+    def test_rejects_bad_or_missing_signature(self):
+        body = b"{}"
+        assert not verify_signature("s3cret", body, sign("other", body))
+        assert not verify_signature("s3cret", body, None)
+        assert not verify_signature("", body, sign("", body))
+
+
+class TestEventDelta:
+    """Tests for translating events into metric increments."""
+
+    def test_push_counts_distinct_commits_per_day(self):
+        """Test that pushes count distinct default-branch commits by UTC day."""
+        delta = event_delta("push", {
+            "ref": "refs/heads/main",
+            "repository": REPOSITORY,
+            "commits": [
+                {
+                    "id": "a1",
+                    "timestamp": "2024-03-01T23:30:00-02:00",
+                    "author": {"username": "alice"},
+                },
+                {"id": "b2", "timestamp": "2024-03-01T10:00:00Z", "author": {"username": "bob"}},
+                {"id": "c3", "timestamp": "2024-03-01T11:00:00Z", "distinct": False},
+            ],
+        })
+
+        assert delta.repo == "octo/demo"
+        assert delta.counts == {
+            datetime(2024, 3, 2): {"commits": 1},
+            datetime(2024, 3, 1): {"commits": 1},
+        }
+        assert delta.contributors[datetime(2024, 3, 2)] == {"alice"}
+        assert delta.events == {
+            "commit:a1": (datetime(2024, 3, 2), "commits"),
+            "commit:b2": (datetime(2024, 3, 1), "commits"),
+        }
+        assert not delta.incomplete
+
+    def test_push_listing_part_of_its_commits_is_incomplete(self):
+        """Test that a push larger than its commit list is flagged for polling."""
+        delta = event_delta("push", {
+            "ref": "refs/heads/main",
+            "repository": REPOSITORY,
+            "size": 25,
+            "distinct_size": 25,
+            "commits": [
+                {"id": f"sha{i}", "timestamp": "2024-03-01T10:00:00Z"} for i in range(20)
+            ],
+        })
+
+        assert delta.incomplete
+        assert delta.counts == {datetime(2024, 3, 1): {"commits": 20}}
+
+    def test_push_to_other_branch_is_ignored(self):
+        payload = {"ref": "refs/heads/feature", "repository": REPOSITORY, "commits": [{}]}
+        assert event_delta("push", payload) is None
+
+    def test_pull_request_outcomes(self):
+        """Test that closed PRs count as merged or closed by their merge flag."""
+        def closed(merged: bool):
+            return event_delta("pull_request", {
+                "action": "closed",
+                "repository": REPOSITORY,
+                "pull_request": {
+                    "merged": merged,
+                    "merged_at": "2024-03-01T10:00:00Z" if merged else None,
+                    "closed_at": "2024-03-01T10:00:00Z",
+                },
+            })
+
+        assert closed(True).counts == {datetime(2024, 3, 1): {"prs_merged": 1}}
+        assert closed(False).counts == {datetime(2024, 3, 1): {"prs_closed": 1}}
+
+    def test_events_are_named_like_polled_ones(self):
+        """Test that a webhook names an event the way polling does, so both count it once."""
+        delta = event_delta("pull_request", {
+            "action": "closed",
+            "repository": REPOSITORY,
+            "pull_request": {
+                "number": 42,
+                "merged": True,
+                "merged_at": "2024-03-01T10:00:00Z",
+            },
+        })
+        key = event_key("pr", 42, "merged", datetime(2024, 3, 1, 10, tzinfo=timezone.utc))
+
+        assert list(delta.events) == [key]
+        assert delta.restricted_to(set()).counts == {}
+        assert delta.restricted_to({key}).counts == delta.counts
+
+    def test_issue_actions(self):
+        """Test that opened and closed issues count and other actions do not."""
+        issue = {"created_at": "2024-03-01T10:00:00Z", "closed_at": "2024-03-02T10:00:00Z"}
+
+        def event(action: str):
+            return event_delta("issues", {"action": action, "repository": REPOSITORY, "issue": issue})
+
+        opened = event("opened")
+        edited = event("edited")
+
+        assert opened.counts == {datetime(2024, 3, 1): {"issues_opened": 1}}
+        assert edited is None
+        assert event_delta("star", {"repository": REPOSITORY}) is None
+
+
+
+class FailingSession:
+    async def commit(self):
+        raise RuntimeError("database down")
+
+
+@pytest.mark.asyncio
+class TestApplyDelivery:
+    """Tests for the order deliveries are stored and counted in."""
+
+    async def test_counters_wait_for_the_commit(self, monkeypatch):
+        """Test that a failed commit leaves the counters for the redelivery to apply."""
+        applied, released = [], []
+
+        async def noop(*args):
+            return None
+
+        async def repository_id(session, repo):
+            return "id-x"
+
+        async def add_contributors(delta):
+            return {}
+
+        async def apply(delta):
+            applied.append(delta)
+
+        async def release_delivery(delivery_id):
+            released.append(delivery_id)
+
+        async def claim_delivery(delivery_id):
+            return True
+
+        async def claim_batch(session, batch_id):
+            return True
+
+        async def claim_events(session, repository_id, keys):
+            return set(keys)
+
+        monkeypatch.setattr(module, "get_repository_id", repository_id)
+        monkeypatch.setattr(module, "claim_batch", claim_batch)
+        monkeypatch.setattr(module, "claim_events", claim_events)
+        monkeypatch.setattr(module, "increment_daily_metrics", noop)
+        monkeypatch.setattr(webhook_counters, "claim_delivery", claim_delivery)
+        monkeypatch.setattr(webhook_counters, "add_contributors", add_contributors)
+        monkeypatch.setattr(webhook_counters, "apply", apply)
+        monkeypatch.setattr(webhook_counters, "release_delivery", release_delivery)
+        delta = ActivityDelta(repo="octo/demo", counts={datetime(2024, 3, 1): {"commits": 1}})
+
+        with pytest.raises(RuntimeError):
+            await module._apply(FailingSession(), delta, "delivery-1")
+
+        assert applied == []
+        assert released == ["delivery-1"]
+
+    async def test_delivery_already_stored_is_a_duplicate(self, monkeypatch):
+        """Test that a delivery the database has seen is skipped even if Redis forgot it."""
+        written, applied = [], []
+
+        async def repository_id(session, repo):
+            return "id-x"
+
+        async def claim_delivery(delivery_id):
+            return True
+
+        async def claim_batch(session, batch_id):
+            return batch_id != "webhook:delivery-1"
+
+        async def increment(*args, **kwargs):
+            written.append(args)
+
+        async def apply(delta):
+            applied.append(delta)
+
+        monkeypatch.setattr(module, "get_repository_id", repository_id)
+        monkeypatch.setattr(module, "claim_batch", claim_batch)
+        monkeypatch.setattr(module, "increment_daily_metrics", increment)
+        monkeypatch.setattr(webhook_counters, "claim_delivery", claim_delivery)
+        monkeypatch.setattr(webhook_counters, "apply", apply)
+        delta = ActivityDelta(repo="octo/demo", counts={datetime(2024, 3, 1): {"commits": 1}})
+
+        assert await module._apply(FailingSession(), delta, "delivery-1") == "duplicate"
+        assert written == [] and applied == []
@@ -0,0 +1,95 @@
+"""
+Unit Tests for the Hot Series Store
+"""
+
+from datetime import datetime, timedelta
+
+from backend.hyperbeats.aggregator.hot_series import HotSeriesStore, RepoSeries
+
+NOW = datetime(2024, 3, 10, 12)
+END = datetime(2024, 3, 11)
+
+
+def row(day, **fields):
+    return {
+        "date": day,
+        **{field: 0 for field in (
+            "commits", "prs_opened", "prs_merged", "prs_closed",
+            "issues_opened", "issues_closed", "contributors", "stars", "forks", "watchers",
+        )},
+        **fields,
+    }
+
+
+class TestRepoSeries:
+    """Tests for one repository's columnar series."""
+
+    def test_per_period_sums_weeks(self):
+        """Test that days are summed per week, clipped to the requested range."""
+        series = RepoSeries(datetime(2024, 2, 26), END, END)
+        for n in range(14):
+            series.add(datetime(2024, 2, 26) + timedelta(days=n), {"commits": n})
+
+        weeks = series.per_period(datetime(2024, 2, 28), END, "week", ["commits"])
+
+        assert list(weeks) == [datetime(2024, 2, 26), datetime(2024, 3, 4)]
+        assert weeks[datetime(2024, 2, 26)]["commits"] == sum(range(2, 7))
+        assert weeks[datetime(2024, 3, 4)]["commits"] == sum(range(7, 14))
+
+    def test_days_outside_are_ignored(self):
+        """Test that writes and reads outside the series leave it untouched."""
+        series = RepoSeries(datetime(2024, 3, 1), END, END)
+        series.add(datetime(2024, 2, 1), {"commits": 5})
+        series.add(END, {"commits": 5})
+        series.add(datetime(2024, 3, 1), {"commits": 1})
+        series.raise_contributors(datetime(2024, 3, 1), 3)
+        series.raise_contributors(datetime(2024, 3, 1), 2)
+
+        totals = series.totals(datetime(2024, 1, 1), datetime(2024, 4, 1))
+
+        assert totals["commits"] == 1
+        assert totals["contributors"] == 3
+
+
+class TestHotSeriesStore:
+    """Tests for admission, eviction and expiry."""
+
+    def test_admitted_on_second_miss(self):
+        """Test that a repository is worth loading only once it is missed again."""
+        store = HotSeriesStore(max_repos=2, days=30, ttl=60)
+
+        assert store.admissions(["a/x"]) == []
+        assert store.admissions(["A/X"]) == ["a/x"]
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the store never holds more than its maximum."""
+        store = HotSeriesStore(max_repos=2, days=30, ttl=60)
+        for repo in ("a/x", "b/y"):
+            store.load(repo, datetime(2024, 3, 1), END, [], now=NOW)
+        store.lookup(["a/x"], now=NOW)
+        store.load("c/z", datetime(2024, 3, 1), END, [], now=NOW)
+
+        assert set(store.lookup(["a/x", "b/y", "c/z"], now=NOW)) == {"a/x", "c/z"}
+
+    def test_loaded_days_are_capped_and_expire(self):
+        """Test that a series keeps at most ``days`` days and expires after the ttl."""
+        store = HotSeriesStore(max_repos=2, days=5, ttl=60)
+        rows = [row(END - timedelta(days=n), commits=1, stars=n) for n in range(1, 9)]
+        series = store.load("a/x", datetime(2024, 3, 1), END, rows, now=NOW)
+
+        assert series.first == END - timedelta(days=5)
+        assert series.totals(series.first, END)["commits"] == 5
+        assert series.engagement["stars"] == 1
+        assert store.lookup(["a/x"], now=NOW + timedelta(seconds=61)) == {}
+
+    def test_updates_apply_in_place(self):
+        """Test that webhook and sync increments reach a loaded series."""
+        store = HotSeriesStore(max_repos=2, days=30, ttl=60)
+        store.load("a/x", datetime(2024, 3, 1), END, [row(datetime(2024, 3, 10), commits=2)], NOW)
+
+        store.record("A/x", {datetime(2024, 3, 10): {"commits": 3}})
+        store.set_engagement("a/x", stars=7, forks=1, watchers=2)
+
+        series = store.lookup(["a/x"], now=NOW)["a/x"]
+        assert series.totals(datetime(2024, 3, 10), END)["commits"] == 5
+        assert series.engagement == {"stars": 7, "forks": 1, "watchers": 2}
@@ -0,0 +1,102 @@
+"""
+Unit Tests for the Activity Leaderboard
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.hyperbeats.aggregator import leaderboard as module
+from backend.hyperbeats.aggregator.leaderboard import Leaderboard
+
+
+@pytest.mark.asyncio
+class TestBackgroundRebuild:
+    """Tests for building a missing ranking without blocking readers."""
+
+    async def test_concurrent_misses_start_one_rebuild(self, monkeypatch):
+        """Test that many requests finding no ranking share a single refresh."""
+        board = Leaderboard(min_interval=60)
+        calls = []
+
+        async def refresh(force=False):
+            calls.append(force)
+            await asyncio.sleep(0.05)
+            return True
+
+        monkeypatch.setattr(board, "refresh", refresh)
+
+        for _ in range(20):
+            board.rebuild_in_background()
+        await asyncio.sleep(0.1)
+
+        assert calls == [False]
+
+    async def test_failed_rebuild_can_be_retried(self, monkeypatch):
+        """Test that a rebuild that raised does not block the next one."""
+        board = Leaderboard(min_interval=60)
+        calls = []
+
+        async def refresh(force=False):
+            calls.append(force)
+            raise RuntimeError("database down")
+
+        monkeypatch.setattr(board, "refresh", refresh)
+
+        board.rebuild_in_background()
+        await asyncio.sleep(0.01)
+        board.rebuild_in_background()
+        await asyncio.sleep(0.01)
+
+        assert len(calls) == 2
+
+
+class SwappedRedis:
+    """Redis whose ranking is replaced between reading a page and its details."""
+
+    def __init__(self, names, details):
+        self.names = names
+        self.details = details
+
+    def pipeline(self, transaction=True):
+        return SwappedPipeline(self.names)
+
+    async def hmget(self, key, names):
+        return [self.details.get(name) for name in names]
+
+
+class SwappedPipeline:
+    def __init__(self, names):
+        self.names = names
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def zcard(self, key):
+        pass
+
+    def zrevrange(self, key, start, stop):
+        pass
+
+    async def execute(self):
+        return [len(self.names), self.names[:]]
+
+
+@pytest.mark.asyncio
+class TestPage:
+    """Tests for reading a page of the ranking."""
+
+    async def test_skips_names_without_details(self, monkeypatch):
+        """Test that a member dropped by a concurrent swap is left out, not empty."""
+        details = {"o/a": json.dumps({"score": 9.0}), "o/c": json.dumps({"score": 1.0})}
+        redis_client = SwappedRedis(["o/a", "o/b", "o/c"], details)
+        monkeypatch.setattr(module, "get_redis_optional", lambda: redis_client)
+
+        total, entries = await Leaderboard().page("7d", 0, 3)
+
+        assert total == 3
+        assert [(e["rank"], e["repository"]) for e in entries] == [(1, "o/a"), (3, "o/c")]
@@ -0,0 +1,157 @@
+"""
+Unit Tests for the Metric Store's Bulk Ingestion
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.database import metric_store
+from backend.database.metric_store import (
+    IngestStats,
+    MetricBatch,
+    refresh_prefix_sums,
+    upsert_daily_metrics,
+)
+
+REPO_A = uuid.uuid4()
+REPO_B = uuid.uuid4()
+DAY_1 = datetime(2024, 3, 1)
+DAY_2 = datetime(2024, 3, 2)
+
+
+class FakeSession:
+    def __init__(self, claimed=()):
+        self.statements = []
+        self.claimed = set(claimed)
+
+    async def execute(self, statement, *args):
+        self.statements.append(statement)
+
+    async def scalar(self, statement, *args):
+        """Answer batch claims like ``INSERT ... ON CONFLICT DO NOTHING RETURNING``."""
+        batch_id = statement.compile().params["batch_id"]
+        if batch_id in self.claimed:
+            return None
+        self.claimed.add(batch_id)
+        return batch_id
+
+
+class TestMetricBatch:
+    """Tests for the columnar batch."""
+
+    def test_extend_fills_missing_fields_with_zero(self):
+        """Test that days with only some counts, or only contributors, become full rows."""
+        batch = MetricBatch()
+        batch.extend(REPO_A, {DAY_2: {"commits": 3}}, {DAY_1: 4})
+
+        rows = batch.rows(0, 10)
+
+        assert [row["date"] for row in rows] == [DAY_1, DAY_2]
+        assert rows[0]["commits"] == 0 and rows[0]["contributors"] == 4
+        assert rows[1]["commits"] == 3 and rows[1]["contributors"] == 0
+
+    def test_days_by_repository(self):
+        """Test that rows are grouped back by repository."""
+        batch = MetricBatch()
+        batch.add(REPO_A, DAY_1, {})
+        batch.add(REPO_B, DAY_1, {})
+        batch.add(REPO_A, DAY_2, {})
+
+        assert batch.days_by_repository() == {REPO_A: [DAY_1, DAY_2], REPO_B: [DAY_1]}
+
+
+class TestUpsertDailyMetrics:
+    """Tests for writing batches in chunks."""
+
+    @pytest.fixture(autouse=True)
+    def no_refresh(self, monkeypatch):
+        self.refreshed = []
+
+        async def refresh_prefix_sums(session, repository_id, since):
+            self.refreshed.append((repository_id, since))
+
+        async def refresh_rollups(session, repository_id, days):
+            pass
+
+        monkeypatch.setattr(metric_store, "refresh_prefix_sums", refresh_prefix_sums)
+        monkeypatch.setattr(metric_store, "refresh_rollups", refresh_rollups)
+
+    @pytest.mark.asyncio
+    async def test_writes_in_chunks_and_refreshes_each_repository_once(self):
+        """Test that a batch becomes one upsert per chunk and one refresh per repository."""
+        batch = MetricBatch()
+        for repository_id in (REPO_A, REPO_B):
+            batch.extend(repository_id, {DAY_1: {"commits": 1}, DAY_2: {"commits": 2}})
+        session = FakeSession()
+
+        stats = await upsert_daily_metrics(session, batch, batch_size=3)
+
+        assert len(session.statements) == 2
+        assert stats.rows == 4
+        assert sorted(self.refreshed, key=str) == sorted(
+            [(REPO_A, DAY_1), (REPO_B, DAY_1)], key=str
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_days_are_merged(self):
+        """Test that the same repository-day twice is summed, keeping peak contributors."""
+        batch = MetricBatch()
+        batch.add(REPO_A, DAY_1, {"commits": 2, "contributors": 3})
+        batch.add(REPO_A, DAY_1, {"commits": 5, "contributors": 1})
+        session = FakeSession()
+
+        stats = await upsert_daily_metrics(session, batch)
+
+        assert stats.rows == 1
+        params = session.statements[0].compile().params
+        assert params["commits_m0"] == 7
+        assert params["contributors_m0"] == 3
+
+
+    @pytest.mark.asyncio
+    async def test_repeated_batch_id_writes_nothing(self):
+        """Test that sending the same batch twice adds its counts once."""
+        batch = MetricBatch()
+        batch.extend(REPO_A, {DAY_1: {"commits": 1}})
+        session = FakeSession()
+
+        first = await upsert_daily_metrics(session, batch, batch_id="webhook:1")
+        second = await upsert_daily_metrics(session, batch, batch_id="webhook:1")
+
+        assert first.rows == 1 and second.rows == 0
+        assert len(session.statements) == 1
+        assert self.refreshed == [(REPO_A, DAY_1)]
+
+
+class TestRefreshPrefixSums:
+    """Tests for the running total refresh."""
+
+    @pytest.mark.asyncio
+    async def test_only_rows_from_since_are_summed(self):
+        """Test that the window covers the touched range, offset by the row before it."""
+        session = FakeSession()
+
+        await refresh_prefix_sums(session, REPO_A, DAY_2)
+
+        sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+        window = sql[sql.index("OVER (ORDER BY"):]
+        assert "daily_metrics.date >= " in window
+        assert "daily_metrics.date < " in sql
+        assert "ORDER BY daily_metrics.date DESC" in sql
+        assert session.statements[0].compile().params["date_1"] == DAY_2
+
+
+class TestIngestStats:
+    """Tests for ingestion throughput."""
+
+    def test_rows_per_second_sums_batches(self):
+        """Test that throughput is computed over every batch added."""
+        stats = IngestStats()
+        stats.add(IngestStats(rows=300, seconds=1.0))
+        stats.add(IngestStats(rows=100, seconds=1.0))
+
+        assert stats.rows_per_second == 200
+        assert IngestStats().rows_per_second == 0.0
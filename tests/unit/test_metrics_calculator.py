@@ -0,0 +1,168 @@
+"""
+Unit Tests for the Metrics Calculator
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from backend.hyperbeats.aggregator.leaderboard import Leaderboard
+from backend.hyperbeats.aggregator.metrics_calculator import MetricsCalculator
+
+END = datetime(2024, 3, 10, 15, 30)
+
+
+class TestBucketTimeSeries:
+    """Tests for single-pass daily bucketing."""
+
+    def test_fills_every_metric_in_one_pass(self):
+        """Test that each metric gets one column aligned with the dates."""
+        points = [
+            {"date": datetime(2024, 3, 9, 8), "commits": 4, "prs": 1},
+            {"date": datetime(2024, 3, 5), "commits": 2},
+        ]
+
+        columns = MetricsCalculator.bucket_time_series(points, ["commits", "prs"], "7d", END)
+
+        assert len(columns) == 8
+        assert columns.dates[0] == datetime(2024, 3, 3, 15, 30)
+        assert columns.values["commits"] == [0, 0, 2, 0, 0, 0, 4, 0]
+        assert columns.values["prs"] == [0, 0, 0, 0, 0, 0, 1, 0]
+
+    def test_sums_same_day_and_accepts_iso_strings(self):
+        """Test that points sharing a day add up, whatever their date format."""
+        points = [
+            {"date": "2024-03-08T00:00:00", "commits": 1},
+            {"date": "2024-03-08T23:00:00Z", "commits": 2},
+            {"date": datetime(2024, 3, 8, 12, tzinfo=timezone.utc), "commits": 3},
+        ]
+
+        columns = MetricsCalculator.bucket_time_series(points, ["commits"], "7d", END)
+
+        assert columns.values["commits"][5] == 6
+
+    def test_ignores_points_outside_range_or_undated(self):
+        """Test that out-of-range and undated points are skipped."""
+        points = [
+            {"date": datetime(2023, 1, 1), "commits": 9},
+            {"date": datetime(2024, 4, 1), "commits": 9},
+            {"commits": 9},
+        ]
+
+        columns = MetricsCalculator.bucket_time_series(points, ["commits"], "7d", END)
+
+        assert sum(columns.values["commits"]) == 0
+
+    def test_year_of_repeated_days_matches_daily_sums(self):
+        """Test that the vectorized fill equals summing each day's points by hand."""
+        points = [
+            {"date": datetime(2023, 3, 1) + timedelta(days=i % 400, hours=i % 24), "commits": i}
+            for i in range(2000)
+        ]
+
+        columns = MetricsCalculator.bucket_time_series(points, ["commits"], "1y", END)
+
+        first_day = datetime(2023, 3, 11)
+        expected = [0.0] * len(columns)
+        for point in points:
+            offset = (point["date"] - first_day).days
+            if 0 <= offset < len(columns):
+                expected[offset] += point["commits"]
+        assert columns.values["commits"] == expected
+
+    def test_points_are_built_at_the_edge(self):
+        """Test that API models are produced from the columns on request."""
+        columns = MetricsCalculator.bucket_time_series(
+            [{"date": datetime(2024, 3, 10), "commits": 5}], ["commits"], "1d", END
+        )
+
+        points = columns.points("commits")
+
+        assert [p.value for p in points] == [0, 5]
+        assert points[-1].date == END
+
+
+class TestActivityScores:
+    """Tests for vectorized activity scoring."""
+
+    def test_matches_scalar_scores(self):
+        """Test that batch scores equal the per-repository formula."""
+        rows = [(0, 0, 0, 0), (12, 3, 4, 2), (500, 90, 70, 40), (50, 20, 30, 10)]
+
+        scored = MetricsCalculator.calculate_activity_scores(*np.array(rows).T)
+
+        expected = [MetricsCalculator.calculate_activity_score(*row) for row in rows]
+        assert scored["score"].tolist() == expected
+
+    def test_change_and_trend_match_velocity(self):
+        """Test that commit change and trend agree with calculate_velocity."""
+        current = np.array([110, 100, 90, 5, 0])
+        previous = np.array([100, 100, 100, 0, 0])
+
+        scored = MetricsCalculator.calculate_activity_scores(
+            current, np.zeros(5), np.zeros(5), np.zeros(5), previous_commits=previous
+        )
+
+        assert scored["change_percent"].tolist() == [10.0, 0.0, -10.0, 100.0, 0.0]
+        assert scored["trend"].tolist() == [1, 0, -1, 1, 0]
+        for i in range(5):
+            velocity = MetricsCalculator.calculate_velocity(int(current[i]), int(previous[i]))
+            assert velocity["change_percent"] == scored["change_percent"][i]
+
+
+class TestLeaderboardRank:
+    """Tests for ranking window totals."""
+
+    ROWS = [
+        {
+            "full_name": "a/busy", "commits": 80, "prs_opened": 0, "prs_merged": 10,
+            "prs_closed": 0, "issues_opened": 0, "issues_closed": 5, "contributors": 12,
+            "previous_commits": 40,
+        },
+        {
+            "full_name": "b/quiet", "commits": 2, "prs_opened": 0, "prs_merged": 0,
+            "prs_closed": 0, "issues_opened": 0, "issues_closed": 0, "contributors": 1,
+            "previous_commits": 10,
+        },
+    ]
+
+    def test_scores_every_repository(self):
+        """Test that each row gets its score, metrics and trend label."""
+        ranking = Leaderboard.rank(self.ROWS)
+
+        assert ranking["a/busy"]["score"] == MetricsCalculator.calculate_activity_score(
+            80, 10, 5, 12
+        )
+        assert ranking["a/busy"]["trend"] == "up"
+        assert ranking["b/quiet"]["trend"] == "down"
+        assert ranking["b/quiet"]["change_percent"] == -80.0
+
+    def test_distinct_contributors_override_summed_counts(self):
+        """Test that sketch estimates replace daily sums where they exist."""
+        ranking = Leaderboard.rank(self.ROWS, {"a/busy": 7, "b/quiet": 0})
+
+        assert ranking["a/busy"]["contributors"] == 7
+        assert ranking["b/quiet"]["contributors"] == 1
+
+    def test_empty(self):
+        """Test that no rows rank to nothing."""
+        assert Leaderboard.rank([]) == {}
+
+
+class TestPeriodComparisons:
+    """Tests for growth and period-over-period values."""
+
+    def test_growth_rate_unchanged(self):
+        """Test that weekly growth compares the last two weeks."""
+        values = [1] * 7 + [2] * 7
+
+        assert MetricsCalculator.calculate_growth_rate(values) == 100.0
+        assert MetricsCalculator.calculate_growth_rate([1, 2, 3]) == 100.0
+
+    def test_period_result(self):
+        """Test that results carry the previous value and change."""
+        result = MetricsCalculator.period_result("commits", 90, 100)
+
+        assert result.previous_value == 100
+        assert result.change_percent == -10.0
+        assert result.trend == "down"
@@ -0,0 +1,97 @@
+"""
+Unit Tests for DailyMetric Partitions
+"""
+
+from datetime import datetime
+
+import pytest
+
+from backend.cache.object_store import LocalObjectStore
+from backend.database.partitions import months_between, partition_name
+from backend.hyperbeats.aggregator import maintenance
+from backend.hyperbeats.aggregator.maintenance import MetricMaintenance
+
+
+class FakeSession:
+    def __init__(self):
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def commit(self):
+        self.committed = True
+
+
+class TestPartitionNames:
+    """Tests for naming and planning monthly partitions."""
+
+    def test_name_sorts_chronologically(self):
+        """Test that partition names are zero padded so they sort by month."""
+        names = [partition_name(datetime(2024, month, 1)) for month in (3, 10, 12)]
+
+        assert names[0] == "daily_metrics_y2024m03"
+        assert names == sorted(names)
+
+    def test_months_cover_the_range(self):
+        """Test that every month overlapping the range is planned, and only those."""
+        months = months_between(datetime(2023, 11, 20), datetime(2024, 2, 1))
+
+        assert months == [datetime(2023, 11, 1), datetime(2023, 12, 1), datetime(2024, 1, 1)]
+
+    def test_range_within_a_month(self):
+        """Test that a range inside one month plans that month alone."""
+        months = months_between(datetime(2024, 5, 3), datetime(2024, 5, 4))
+
+        assert months == [datetime(2024, 5, 1)]
+
+
+@pytest.mark.asyncio
+class TestMaintenanceRuns:
+    """Tests for the partitions created at startup and the periodic runs."""
+
+    async def test_creates_this_and_next_month(self, monkeypatch):
+        """Test that startup covers the current and next month, and commits."""
+        session = FakeSession()
+        ranges = []
+
+        async def ensure_partitions(session, first, end):
+            ranges.append((first, end))
+            return [partition_name(month) for month in months_between(first, end)]
+
+        monkeypatch.setattr(maintenance, "get_session_factory_optional", lambda: lambda: session)
+        monkeypatch.setattr(maintenance, "ensure_partitions", ensure_partitions)
+
+        created = await MetricMaintenance().ensure_current(datetime(2024, 12, 20))
+
+        assert ranges == [(datetime(2024, 12, 1), datetime(2025, 2, 1))]
+        assert created == ["daily_metrics_y2024m12", "daily_metrics_y2025m01"]
+        assert session.committed
+
+    async def test_failures_are_logged(self, monkeypatch, caplog):
+        """Test that a failing database is reported instead of raising or passing silently."""
+
+        async def ensure_partitions(session, first, end):
+            raise RuntimeError("database down")
+
+        monkeypatch.setattr(
+            maintenance, "get_session_factory_optional", lambda: lambda: FakeSession()
+        )
+        monkeypatch.setattr(maintenance, "ensure_partitions", ensure_partitions)
+
+        assert await MetricMaintenance().ensure_current() == []
+        assert "database down" in caplog.text
+
+    async def test_runs_purge_expired_cache_objects(self, monkeypatch, tmp_path):
+        """Test that maintenance deletes expired object store entries, database or not."""
+        store = LocalObjectStore(str(tmp_path))
+        await store.put("old", "s:x", -1)
+        await store.put("new", "s:y", 60)
+        monkeypatch.setattr(maintenance.cache_manager, "objects", store)
+        monkeypatch.setattr(maintenance, "get_session_factory_optional", lambda: None)
+
+        assert await MetricMaintenance().run_once() == {"purged": 1}
+        assert await store.get("new") is not None
@@ -0,0 +1,552 @@
+"""
+Unit Tests for Repository Aggregator
+"""
+
+import asyncio
+import contextlib
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from backend.hyperbeats.aggregator import repo_aggregator as module
+from backend.hyperbeats.aggregator.hot_series import HotSeriesStore
+from backend.hyperbeats.aggregator.repo_aggregator import (
+    RepositoryAggregator,
+    choose_grain,
+    stored_days,
+)
+from backend.hyperbeats.config import Settings
+from backend.integrations.circuit_breaker import CircuitBreaker, CircuitOpenError
+from backend.integrations.github_models import ActivityDelta, RepoStats
+
+
+class FakeGitHubClient:
+    """Stand-in GitHub client with per-repo latency and failures."""
+
+    def __init__(self, delays=None, failures=None, breaker=None):
+        self.delays = delays or {}
+        self.failures = failures or set()
+        self.breaker = breaker
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.activity_calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def get_repo_stats(self, owner, repo, timeframe="7d"):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(repo, 0.01))
+            if repo in self.failures:
+                raise RuntimeError("boom")
+            return RepoStats(commits=len(repo), contributors=1, timeframe=timeframe)
+        finally:
+            self.in_flight -= 1
+
+    async def get_activity(self, owner, repo, since, until):
+        if repo in self.failures:
+            raise RuntimeError("boom")
+        self.activity_calls.append((repo, since, until))
+        return ActivityDelta(
+            repo=f"{owner}/{repo}",
+            counts={since: {"commits": 1, "prs_merged": 2}},
+            contributors={},
+        )
+
+
+def make_aggregator(client: FakeGitHubClient) -> RepositoryAggregator:
+    aggregator = RepositoryAggregator()
+    aggregator.github_client = client
+    return aggregator
+
+
+@pytest.mark.asyncio
+class TestAggregateRepos:
+    """Tests for concurrent fan-out in aggregate_repos."""
+
+    async def test_results_keep_input_order(self):
+        """Test that per-repo results follow the input order, not completion order."""
+        client = FakeGitHubClient(delays={"slow": 0.05, "fast": 0.0})
+        aggregator = make_aggregator(client)
+
+        result = await aggregator.aggregate_repos(["a/slow", "b/fast", "c/mid"])
+
+        assert list(result.per_repo) == ["a/slow", "b/fast", "c/mid"]
+        assert result.repos == 3
+        assert result.total_commits == len("slow") + len("fast") + len("mid")
+
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than max_concurrency fetches run at once."""
+        client = FakeGitHubClient()
+        aggregator = make_aggregator(client)
+        repos = [f"owner/repo{i}" for i in range(10)]
+
+        await aggregator.aggregate_repos(repos, max_concurrency=3)
+
+        assert client.max_in_flight == 3
+
+    async def test_sequential_mode(self):
+        """Test that max_concurrency=1 fetches one repo at a time."""
+        client = FakeGitHubClient()
+        aggregator = make_aggregator(client)
+
+        await aggregator.aggregate_repos(["a/x", "b/y", "c/z"], max_concurrency=1)
+
+        assert client.max_in_flight == 1
+
+    async def test_failures_and_timeouts_are_skipped(self):
+        """Test that failing or slow repos do not abort the aggregation."""
+        client = FakeGitHubClient(delays={"slow": 1.0}, failures={"broken"})
+        aggregator = make_aggregator(client)
+
+        result = await aggregator.aggregate_repos(
+            ["a/ok", "b/broken", "c/slow", "invalid"],
+            repo_timeout=0.1,
+        )
+
+        assert list(result.per_repo) == ["a/ok"]
+        assert len(result.errors) == 3
+
+    async def test_concurrent_requests_share_fetches(self):
+        """Test that overlapping aggregations for the same repos fetch each repo once."""
+        client = FakeGitHubClient(delays={"shared": 0.05})
+        calls = []
+        original = client.get_repo_stats
+
+        async def counting(owner, repo, timeframe="7d"):
+            calls.append(repo)
+            return await original(owner, repo, timeframe)
+
+        client.get_repo_stats = counting
+        aggregator = make_aggregator(client)
+
+        results = await asyncio.gather(
+            *(aggregator.aggregate_repos(["o/shared"]) for _ in range(5))
+        )
+
+        assert calls == ["shared"]
+        assert all(r.repos == 1 for r in results)
+
+    async def test_raises_when_circuit_open(self):
+        """Test that failures while the circuit is open are not reported as partial data."""
+        breaker = CircuitBreaker("test", failure_threshold=1, shared=False)
+        await breaker.record_failure()
+        client = FakeGitHubClient(failures={"broken"}, breaker=breaker)
+        aggregator = make_aggregator(client)
+
+        with pytest.raises(CircuitOpenError):
+            await aggregator.aggregate_repos(["a/ok", "b/broken"])
+
+
+class TestRepoTimeoutSettings:
+    """Tests for the relation between the per-repo and per-request timeouts."""
+
+    def test_repo_timeout_must_outlast_requests(self):
+        """Test that a hung request times out inside the client, where the breaker sees it."""
+        with pytest.raises(ValidationError):
+            Settings(aggregator_repo_timeout=30, github_timeout=30)
+
+        assert Settings(aggregator_repo_timeout=45, github_timeout=30)
+
+
+@pytest.mark.asyncio
+class TestUniqueContributors:
+    """Tests for cross-repo distinct contributor counting."""
+
+    async def test_falls_back_to_sum_without_sketches(self):
+        """Test that the per-repo sum is reported when no sketches are available."""
+        aggregator = make_aggregator(FakeGitHubClient())
+
+        result = await aggregator.aggregate_repos(["a/x", "b/y", "c/z"])
+
+        assert result.unique_contributors == 3
+
+    async def test_uses_sketch_estimate_within_bounds(self, monkeypatch):
+        """Test that the merged sketch estimate is clamped to the per-repo bounds."""
+        from backend.integrations.contributor_sketch import contributor_sketches
+
+        estimates = iter([2, 0, 99])
+
+        async def count(repos, since, until):
+            return next(estimates)
+
+        monkeypatch.setattr(contributor_sketches, "count", count)
+        aggregator = make_aggregator(FakeGitHubClient())
+        repos = ["a/x", "b/y", "c/z"]
+
+        assert (await aggregator.aggregate_repos(repos)).unique_contributors == 2
+        assert (await aggregator.aggregate_repos(repos)).unique_contributors == 1
+        assert (await aggregator.aggregate_repos(repos)).unique_contributors == 3
+
+
+@pytest.mark.asyncio
+class TestComparePeriods:
+    """Tests for previous-period comparison from stored running totals."""
+
+    async def test_none_without_database(self):
+        """Test that no comparison is made when no database is configured."""
+        aggregator = make_aggregator(FakeGitHubClient())
+
+        assert await aggregator.compare_periods(["a/x"], "7d") is None
+
+    @staticmethod
+    def coverage_from(days: int):
+        """A stored_coverage reporting ``a/x`` synced from ``days`` ago until now."""
+
+        async def stored_coverage(session, names):
+            now = datetime.utcnow()
+            return [{
+                "repository_id": "id-x",
+                "full_name": "a/x",
+                "synced_from": now - timedelta(days=days),
+                "synced_until": now,
+                "backfilled_from": None,
+            }]
+
+        return stored_coverage
+
+    async def test_none_without_stored_rows_for_both_periods(self, monkeypatch):
+        """Test that repos missing rows are not compared as 0 against 0."""
+
+        async def prefix_totals_at(session, full_names, at):
+            raise AssertionError("totals read without coverage")
+
+        @contextlib.asynccontextmanager
+        async def session():
+            yield None
+
+        monkeypatch.setattr(module, "stored_coverage", self.coverage_from(days=10))
+        monkeypatch.setattr(module, "prefix_totals_at", prefix_totals_at)
+        monkeypatch.setattr(module, "get_session_factory_optional", lambda: session)
+        aggregator = make_aggregator(FakeGitHubClient())
+
+        assert await aggregator.compare_periods(["a/x"], "7d") is None
+        assert await aggregator.compare_periods(["a/x", "b/y"], "1d") is None
+
+    async def test_differences_of_running_totals(self, monkeypatch):
+        """Test that each period is the difference of totals at its boundaries."""
+        boundaries = []
+
+        async def prefix_totals_at(session, full_names, at):
+            boundaries.extend(at)
+            return [
+                {"commits": 10, "prs_merged": 1, "issues_closed": 0},
+                {"commits": 30, "prs_merged": 5, "issues_closed": 0},
+                {"commits": 48, "prs_merged": 5, "issues_closed": 3},
+            ]
+
+        @contextlib.asynccontextmanager
+        async def session():
+            yield None
+
+        monkeypatch.setattr(module, "stored_coverage", self.coverage_from(days=30))
+        monkeypatch.setattr(module, "prefix_totals_at", prefix_totals_at)
+        monkeypatch.setattr(module, "get_session_factory_optional", lambda: session)
+        aggregator = make_aggregator(FakeGitHubClient())
+
+        comparison = await aggregator.compare_periods(["a/x"], "7d")
+
+        assert (boundaries[1] - boundaries[0]).days == 7
+        assert (boundaries[2] - boundaries[1]).days == 7
+        assert comparison["commits"].current_value == 18
+        assert comparison["commits"].previous_value == 20
+        assert comparison["commits"].trend == "down"
+        assert comparison["prs_merged"].current_value == 0
+        assert comparison["issues_closed"].change_percent == 100.0
+
+
+class TestStoredDays:
+    """Tests for deciding which days stored rows are complete for."""
+
+    NOW = datetime(2024, 3, 10, 12)
+
+    def coverage(self, synced_from, synced_until, backfilled_from=None):
+        return {
+            "synced_from": synced_from,
+            "synced_until": synced_until,
+            "backfilled_from": backfilled_from,
+        }
+
+    def test_fresh_sync_covers_today(self):
+        """Test that a recent cursor covers whole days from sync start through today."""
+        coverage = self.coverage(datetime(2024, 3, 1, 9), self.NOW - timedelta(minutes=5))
+
+        assert stored_days(coverage, self.NOW, 1800) == (
+            datetime(2024, 3, 2), datetime(2024, 3, 11)
+        )
+
+    def test_completed_backfill_extends_history(self):
+        """Test that a finished backfill covers the days before sync started."""
+        coverage = self.coverage(
+            datetime(2024, 3, 1, 9), self.NOW, backfilled_from=datetime(2023, 3, 1)
+        )
+
+        assert stored_days(coverage, self.NOW, 1800)[0] == datetime(2023, 3, 1)
+
+    def test_stale_cursor_stops_before_its_last_day(self):
+        """Test that days after a stalled sync are left to live fetches."""
+        coverage = self.coverage(datetime(2024, 3, 1), datetime(2024, 3, 8, 6))
+
+        assert stored_days(coverage, self.NOW, 1800) == (
+            datetime(2024, 3, 1), datetime(2024, 3, 8)
+        )
+
+    def test_nothing_synced(self):
+        """Test that a cursor without a sync covers nothing."""
+        assert stored_days(self.coverage(None, None), self.NOW, 1800) is None
+
+
+@pytest.mark.asyncio
+class TestSeries:
+    """Tests for chart series read from DailyMetric with live gap filling."""
+
+    async def test_live_only_without_database(self):
+        """Test that every day is fetched live when nothing is stored."""
+        client = FakeGitHubClient()
+        aggregator = make_aggregator(client)
+
+        series = await aggregator.get_series(["a/x", "b/y"], "7d")
+
+        assert len(series.points) == 7
+        assert series.points[0]["commits"] == 2
+        assert series.points[0]["prs"] == 4
+        assert [(r.source, r.first, r.last) for r in series.sources] == [
+            ("live", series.points[0]["date"], series.points[-1]["date"])
+        ]
+
+    async def test_stored_days_with_live_gap(self, monkeypatch):
+        """Test that stored days come from one query and only the gap is fetched."""
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+        first = today - timedelta(days=6)
+
+        async def stored_coverage(session, names):
+            return [{
+                "repository_id": "id-x",
+                "full_name": "a/x",
+                "synced_from": today - timedelta(days=3),
+                "synced_until": datetime.utcnow(),
+                "backfilled_from": None,
+            }]
+
+        spans_read = []
+
+        async def daily_totals_between(session, ranges, grain="day"):
+            ranges = [span for span in ranges if span[1] < span[2]]
+            spans_read.extend(ranges)
+            if not ranges:
+                return []
+            return [{
+                "date": (today - timedelta(days=1)).isoformat(),
+                "commits": 5, "prs_merged": 0, "issues_closed": 3,
+            }]
+
+        @contextlib.asynccontextmanager
+        async def session():
+            yield None
+
+        monkeypatch.setattr(module, "stored_coverage", stored_coverage)
+        monkeypatch.setattr(module, "daily_totals_between", daily_totals_between)
+        monkeypatch.setattr(module, "get_session_factory_optional", lambda: session)
+        client = FakeGitHubClient()
+        aggregator = make_aggregator(client)
+
+        series = await aggregator.get_series(["a/x"], "7d")
+
+        assert ("id-x", today - timedelta(days=3), today + timedelta(days=1)) in spans_read
+        assert client.activity_calls == [("x", first, today - timedelta(days=3))]
+        assert series.points[-2]["commits"] == 5
+        assert series.points[-2]["issues"] == 3
+        assert [r.source for r in series.sources] == ["live", "database"]
+        assert series.sources[1].first == today - timedelta(days=3)
+
+    async def test_failed_gap_is_reported(self):
+        """Test that days a live fetch could not fill are marked unavailable."""
+        aggregator = make_aggregator(FakeGitHubClient(failures={"y"}))
+
+        series = await aggregator.get_series(["a/x", "b/y"], "1d")
+
+        assert series.points[0]["commits"] == 1
+        assert [r.source for r in series.sources] == ["unavailable"]
+
+    async def test_whole_periods_read_from_rollups(self, monkeypatch):
+        """Test that fully stored weeks come from rollups and partial ones from days."""
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+        synced_from = today - timedelta(days=40)
+
+        async def stored_coverage(session, names):
+            return [{
+                "repository_id": "id-x",
+                "full_name": "a/x",
+                "synced_from": synced_from,
+                "synced_until": datetime.utcnow(),
+                "backfilled_from": None,
+            }]
+
+        reads = {}
+
+        async def daily_totals_between(session, ranges, grain="day"):
+            reads[grain] = [span for span in ranges if span[1] < span[2]]
+            return []
+
+        @contextlib.asynccontextmanager
+        async def session():
+            yield None
+
+        monkeypatch.setattr(module, "stored_coverage", stored_coverage)
+        monkeypatch.setattr(module, "daily_totals_between", daily_totals_between)
+        monkeypatch.setattr(module, "get_session_factory_optional", lambda: session)
+        aggregator = make_aggregator(FakeGitHubClient())
+
+        series = await aggregator.get_series(["a/x"], "90d", grain="week")
+
+        assert series.grain == "week"
+        assert all(point["date"].weekday() == 0 for point in series.points)
+        (_, rollup_first, rollup_end), = reads["week"]
+        assert rollup_first.weekday() == 0 and rollup_first >= synced_from
+        assert rollup_end == today + timedelta(days=1)
+        leading_days = [("id-x", synced_from, rollup_first)] if synced_from < rollup_first else []
+        assert reads["day"] == leading_days
+        assert [r.source for r in series.sources][-1] == "database"
+
+    async def test_year_stays_within_the_backfill_horizon(self, monkeypatch):
+        """Test that a month-grain year does not fetch the days before its first month starts."""
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+
+        async def stored_coverage(session, names):
+            return [{
+                "repository_id": "id-x",
+                "full_name": "a/x",
+                "synced_from": today,
+                "synced_until": datetime.utcnow(),
+                "backfilled_from": today - timedelta(days=365),
+            }]
+
+        reads = {}
+
+        async def daily_totals_between(session, ranges, grain="day"):
+            reads[grain] = [span for span in ranges if span[1] < span[2]]
+            return []
+
+        @contextlib.asynccontextmanager
+        async def session():
+            yield None
+
+        monkeypatch.setattr(module, "stored_coverage", stored_coverage)
+        monkeypatch.setattr(module, "daily_totals_between", daily_totals_between)
+        monkeypatch.setattr(module, "get_session_factory_optional", lambda: session)
+        client = FakeGitHubClient()
+        aggregator = make_aggregator(client)
+
+        series = await aggregator.get_series(["a/x"], "1y")
+
+        since = today + timedelta(days=1) - timedelta(days=365)
+        assert series.grain == "month"
+        assert series.points[0]["date"] == since.replace(day=1)
+        assert client.activity_calls == []
+        assert reads["day"][0] == ("id-x", since, reads["month"][0][1])
+        assert [r.source for r in series.sources] == ["database"]
+
+
+def hot_store(repo: str, days: int, commits: int) -> HotSeriesStore:
+    """A store holding ``days`` days of ``commits`` a day for one repo, through today."""
+    end = datetime.combine(datetime.utcnow().date(), datetime.min.time()) + timedelta(days=1)
+    store = HotSeriesStore(max_repos=4, days=400, ttl=60)
+    rows = [
+        {"date": end - timedelta(days=n), "commits": commits, "prs_opened": 0, "prs_merged": 1,
+         "prs_closed": 0, "issues_opened": 0, "issues_closed": 0, "contributors": 2,
+         "stars": 10, "forks": 3, "watchers": 1}
+        for n in range(1, days + 1)
+    ]
+    store.load(repo, end - timedelta(days=days), end, rows)
+    return store
+
+
+@pytest.mark.asyncio
+class TestHotSeries:
+    """Tests for reading hot repositories from memory first."""
+
+    async def test_series_summed_from_memory(self, monkeypatch):
+        """Test that a hot repo's chart needs neither the database nor GitHub."""
+        monkeypatch.setattr(module, "hot_series", hot_store("a/x", 10, commits=2))
+        client = FakeGitHubClient()
+        aggregator = make_aggregator(client)
+
+        series = await aggregator.get_series(["A/x"], "7d")
+
+        assert client.activity_calls == []
+        assert [point["commits"] for point in series.points] == [2] * 7
+        assert [r.source for r in series.sources] == ["database"]
+
+    async def test_aggregate_always_fetches(self, monkeypatch):
+        """Test that totals are never summed from daily rows, which count events by day."""
+        monkeypatch.setattr(module, "hot_series", hot_store("a/x", 10, commits=2))
+        aggregator = make_aggregator(FakeGitHubClient())
+
+        result = await aggregator.aggregate_repos(["a/x"], "7d")
+
+        assert result.per_repo["a/x"].commits == 1
+
+    async def test_repeated_misses_load_the_repo(self, monkeypatch):
+        """Test that a repo missed twice is loaded and then served from memory."""
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+        calls = []
+
+        async def stored_coverage(session, names):
+            calls.append(names)
+            return [{
+                "repository_id": "id-x",
+                "full_name": "a/x",
+                "synced_from": today - timedelta(days=30),
+                "synced_until": datetime.utcnow(),
+                "backfilled_from": None,
+            }]
+
+        async def daily_totals_between(session, ranges, grain="day"):
+            return []
+
+        async def repository_days(session, ranges):
+            (repository_id, first, end), = ranges
+            return [{
+                "repository_id": repository_id, "date": today, "commits": 4, "prs_opened": 0,
+                "prs_merged": 0, "prs_closed": 0, "issues_opened": 0, "issues_closed": 0,
+                "contributors": 1, "stars": 0, "forks": 0, "watchers": 0,
+            }]
+
+        @contextlib.asynccontextmanager
+        async def session():
+            yield None
+
+        store = HotSeriesStore(max_repos=4, days=400, ttl=60)
+        monkeypatch.setattr(module, "hot_series", store)
+        monkeypatch.setattr(module, "stored_coverage", stored_coverage)
+        monkeypatch.setattr(module, "daily_totals_between", daily_totals_between)
+        monkeypatch.setattr(module, "repository_days", repository_days)
+        monkeypatch.setattr(module, "get_session_factory_optional", lambda: session)
+        aggregator = make_aggregator(FakeGitHubClient())
+
+        await aggregator.get_series(["a/x"], "7d")
+        assert len(store) == 0
+        await aggregator.get_series(["a/x"], "7d")
+        assert len(store) == 1
+        series = await aggregator.get_series(["a/x"], "7d")
+
+        assert len(calls) == 2
+        assert series.points[-1]["commits"] == 4
+
+
+class TestChooseGrain:
+    """Tests for picking the series grain from the point budget."""
+
+    def test_coarsest_grain_meeting_budget(self):
+        """Test that long ranges use rollups and short ones stay daily."""
+        assert choose_grain(365, budget=12) == "month"
+        assert choose_grain(90, budget=12) == "week"
+        assert choose_grain(30, budget=12) == "day"
+        assert choose_grain(365, budget=50) == "week"
+        assert choose_grain(365, budget=60) == "day"
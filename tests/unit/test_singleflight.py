@@ -0,0 +1,239 @@
+"""
+Unit Tests for Singleflight Request Coalescing
+"""
+
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from backend.hyperbeats.config import Settings
+from backend.integrations import singleflight as module
+from backend.integrations.singleflight import SingleFlight
+
+
+class DeadLeaderPubSub:
+    """A subscription on which the lock holder never publishes."""
+
+    async def subscribe(self, channel):
+        pass
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        await asyncio.sleep(timeout)
+        return None
+
+    async def reset(self):
+        pass
+
+
+class DeadLeaderRedis:
+    """Redis where another worker took the lock, then died and let it expire."""
+
+    async def set(self, key, value, nx=False, px=None):
+        return False
+
+    async def get(self, key):
+        return None
+
+    async def exists(self, key):
+        return 0
+
+    def pubsub(self):
+        return DeadLeaderPubSub()
+
+
+class SlowLeaderPubSub:
+    """A subscription on which the lock holder publishes after ``delay``."""
+
+    def __init__(self, delay):
+        self.ready_at = asyncio.get_running_loop().time() + delay
+
+    async def subscribe(self, channel):
+        pass
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        remaining = self.ready_at - asyncio.get_running_loop().time()
+        if remaining > timeout:
+            await asyncio.sleep(timeout)
+            return None
+        await asyncio.sleep(max(0, remaining))
+        return {"data": "shared"}
+
+    async def reset(self):
+        pass
+
+
+class SlowLeaderRedis(DeadLeaderRedis):
+    """Redis where another worker holds the lock, renewing it while a slow fetch runs."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def exists(self, key):
+        return 1
+
+    def pubsub(self):
+        return SlowLeaderPubSub(self.delay)
+
+
+class LeaderRedis:
+    """Redis where this worker takes the lock, recording renewals."""
+
+    def __init__(self):
+        self.values = {}
+        self.renewals = 0
+
+    async def set(self, key, value, nx=False, px=None):
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def eval(self, script, numkeys, key, owner, ttl_ms):
+        self.renewals += 1
+        return int(self.values.get(key) == owner)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def publish(self, channel, payload):
+        pass
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Tests for in-process coalescing of identical calls."""
+
+    async def test_concurrent_callers_share_one_call(self):
+        """Test that many callers for one key trigger a single call."""
+        flight = SingleFlight("test", distributed=False)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "stats"
+
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(50)))
+
+        assert results == ["stats"] * 50
+        assert len(calls) == 1
+        assert not flight.in_flight("k")
+
+    async def test_different_keys_run_separately(self):
+        """Test that distinct keys are not coalesced."""
+        flight = SingleFlight("test", distributed=False)
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: fetch("a")),
+            flight.do("b", lambda: fetch("b")),
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    async def test_errors_reach_every_caller(self):
+        """Test that a failed call raises for all waiting callers."""
+        flight = SingleFlight("test", distributed=False)
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(flight.do("k", fetch) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that one caller timing out leaves the shared call running."""
+        flight = SingleFlight("test", distributed=False)
+
+        async def fetch():
+            await asyncio.sleep(0.1)
+            return "done"
+
+        impatient = asyncio.ensure_future(asyncio.wait_for(flight.do("k", fetch), 0.01))
+        patient = asyncio.ensure_future(flight.do("k", fetch))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        assert await patient == "done"
+
+    async def test_new_call_after_completion(self):
+        """Test that results are not cached once the call has finished."""
+        flight = SingleFlight("test", distributed=False)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return len(calls)
+
+        assert await flight.do("k", fetch) == 1
+        assert await flight.do("k", fetch) == 2
+
+
+@pytest.mark.asyncio
+class TestDistributedSingleFlight:
+    """Tests for waiting on another worker's call through Redis."""
+
+    async def test_follower_of_dead_leader_fetches_in_time(self, monkeypatch):
+        """Test that a follower gives up on a silent leader before the caller's timeout."""
+        monkeypatch.setattr(module, "get_redis_optional", lambda: DeadLeaderRedis())
+        flight = SingleFlight("test", lock_ttl=0.05)
+
+        async def fetch():
+            return "own"
+
+        result = await asyncio.wait_for(flight.do("k", fetch, encode=str, decode=str), 0.5)
+
+        assert result == "own"
+
+
+    async def test_follower_waits_for_a_slow_leader(self, monkeypatch):
+        """Test that a follower outwaits the lock TTL while the leader keeps renewing."""
+        monkeypatch.setattr(module, "get_redis_optional", lambda: SlowLeaderRedis(0.2))
+        flight = SingleFlight("test", lock_ttl=0.05, wait=1)
+
+        async def fetch():
+            return "own"
+
+        assert await flight.do("k", fetch, encode=str, decode=str) == "shared"
+
+    async def test_leader_renews_its_lock_while_fetching(self, monkeypatch):
+        """Test that a fetch longer than the lock TTL keeps the lock and then releases it."""
+        redis = LeaderRedis()
+        monkeypatch.setattr(module, "get_redis_optional", lambda: redis)
+        flight = SingleFlight("test", lock_ttl=0.06)
+
+        async def fetch():
+            await asyncio.sleep(0.2)
+            return "own"
+
+        assert await flight.do("k", fetch, encode=str, decode=str) == "own"
+        assert redis.renewals >= 2
+        assert "singleflight:test:lock:k" not in redis.values
+        assert redis.values["singleflight:test:result:k"] == "own"
+
+
+class TestSingleFlightSettings:
+    """Tests for the relation between the lock TTL and the aggregator timeout."""
+
+    def test_lock_ttl_must_be_shorter_than_repo_timeout(self):
+        """Test that followers of a dead leader notice before the per-repo timeout."""
+        with pytest.raises(ValidationError):
+            Settings(singleflight_lock_ttl=30, aggregator_repo_timeout=30)
+
+        assert Settings(singleflight_lock_ttl=10, aggregator_repo_timeout=45)
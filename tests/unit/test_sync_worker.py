@@ -0,0 +1,103 @@
+"""
+Unit Tests for the Sync Worker
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.hyperbeats.aggregator.sync_worker import SyncWorker
+from backend.integrations.github_models import ActivityDelta
+from backend.integrations.github_webhooks import webhook_counters
+
+
+class FakeGitHubClient:
+    """Records activity windows instead of calling GitHub."""
+
+    def __init__(self):
+        self.windows = []
+
+    async def get_activity(self, owner, repo, since, until):
+        self.windows.append((f"{owner}/{repo}", since, until))
+        return ActivityDelta(repo=f"{owner}/{repo}")
+
+
+class TestSchedule:
+    """Tests for jittered per-repository schedules."""
+
+    def test_next_run_stays_within_jitter(self):
+        """Test that next runs drift around the interval but never beyond the jitter."""
+        worker = SyncWorker(client=FakeGitHubClient(), interval=600, jitter=0.25)
+        now = datetime(2024, 1, 1)
+
+        offsets = {(worker.next_run(now) - now).total_seconds() for _ in range(200)}
+
+        assert all(450 <= offset <= 750 for offset in offsets)
+        assert len(offsets) > 1
+
+    def test_zero_jitter_is_exact(self):
+        """Test that jitter can be turned off."""
+        worker = SyncWorker(client=FakeGitHubClient(), interval=600, jitter=0)
+
+        assert worker.next_run(datetime(2024, 1, 1)) == datetime(2024, 1, 1, 0, 10)
+
+
+@pytest.mark.asyncio
+class TestCollect:
+    """Tests for fetching a repository's delta."""
+
+    async def test_fetches_window_since_cursor(self, monkeypatch):
+        """Test that only the window between the cursor and now is requested."""
+        async def never(repo):
+            return None
+
+        monkeypatch.setattr(webhook_counters, "last_event_at", never)
+        client = FakeGitHubClient()
+        worker = SyncWorker(client=client)
+        since, until = datetime(2024, 1, 1), datetime(2024, 1, 1, 0, 15)
+
+        delta = await worker.collect("octo/demo", since, until)
+
+        assert delta.repo == "octo/demo"
+        assert client.windows == [("octo/demo", since, until)]
+
+    async def test_skips_repos_with_recent_webhooks(self, monkeypatch):
+        """Test that repos kept current by webhooks are not polled."""
+        async def recent(repo):
+            return time.time() - 60
+
+        monkeypatch.setattr(webhook_counters, "last_event_at", recent)
+        client = FakeGitHubClient()
+        worker = SyncWorker(client=client, webhook_grace=3600)
+        until = datetime.utcnow()
+
+        assert await worker.collect("octo/demo", until - timedelta(hours=1), until) is None
+        assert client.windows == []
+
+    async def test_polls_again_once_webhooks_go_quiet(self, monkeypatch):
+        """Test that a repo whose webhooks stopped is polled again."""
+        async def stale(repo):
+            return time.time() - 7200
+
+        monkeypatch.setattr(webhook_counters, "last_event_at", stale)
+        client = FakeGitHubClient()
+        worker = SyncWorker(client=client, webhook_grace=3600)
+        until = datetime.utcnow()
+
+        assert await worker.collect("octo/demo", until - timedelta(hours=1), until) is not None
+        assert len(client.windows) == 1
+
+    async def test_polls_despite_webhooks_when_one_left_events_out(self, monkeypatch):
+        """Test that a push listing only part of its commits gets the rest polled."""
+        async def recent(repo):
+            return time.time() - 60
+
+        monkeypatch.setattr(webhook_counters, "last_event_at", recent)
+        monkeypatch.setattr(webhook_counters, "incomplete_at", recent)
+        client = FakeGitHubClient()
+        worker = SyncWorker(client=client, webhook_grace=3600)
+        until = datetime.utcnow()
+
+        assert await worker.collect("octo/demo", until - timedelta(hours=1), until) is not None
+        assert len(client.windows) == 1
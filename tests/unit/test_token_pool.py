@@ -0,0 +1,161 @@
+"""
+Unit Tests for the GitHub Token Pool
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.integrations.github_client import GitHubClient
+from backend.integrations.token_pool import RateLimitedError, TokenPool, resource_for
+
+
+@pytest.mark.asyncio
+class TestTokenPool:
+    """Tests for rate-limit-aware token scheduling."""
+
+    async def test_routes_to_token_with_most_headroom(self):
+        """Test that acquire prefers the token with the most remaining calls."""
+        pool = TokenPool(["a", "b"], shared=False, buffer=10)
+        await pool.update("a", remaining=100, reset=time.time() + 600)
+        await pool.update("b", remaining=4000, reset=time.time() + 600)
+
+        assert await pool.acquire() == "b"
+
+    async def test_skips_tokens_at_buffer(self):
+        """Test that tokens at or below the buffer are not used."""
+        pool = TokenPool(["a", "b"], shared=False, buffer=10, max_wait=0)
+        await pool.update("a", remaining=10, reset=time.time() + 600)
+        await pool.update("b", remaining=11, reset=time.time() + 600)
+
+        assert await pool.acquire() == "b"
+        with pytest.raises(RateLimitedError):
+            await pool.acquire()
+
+    async def test_resources_are_tracked_separately(self):
+        """Test that an exhausted search budget does not block core calls."""
+        pool = TokenPool(["a"], shared=False, buffer=0)
+        await pool.update("a", remaining=0, reset=time.time() + 600, resource="search")
+
+        assert await pool.acquire("core") == "a"
+
+    async def test_waits_for_earliest_reset(self):
+        """Test that callers queue until a window resets instead of failing."""
+        pool = TokenPool(["a", "b"], shared=False, buffer=0, max_wait=5)
+        await pool.update("a", remaining=0, reset=time.time() + 600)
+        await pool.update("b", remaining=0, reset=time.time() + 0.2)
+
+        start = time.perf_counter()
+        token = await pool.acquire()
+
+        assert token == "b"
+        assert time.perf_counter() - start >= 0.2
+
+    async def test_headroom_reserves_share_for_live_traffic(self):
+        """Test that background jobs wait once the pool drops to the reserve."""
+        pool = TokenPool(["a", "b"], shared=False)
+        await pool.update("a", remaining=4000, reset=time.time() + 600)
+        await pool.update("b", remaining=100, reset=time.time() + 600)
+
+        # 4100 of 10000 left: above a 30% reserve, below a 50% one
+        await pool.wait_for_headroom(0.3)
+
+        await pool.update("a", remaining=100, reset=time.time() + 0.2)
+        start = time.perf_counter()
+        await pool.wait_for_headroom(0.3)
+        assert time.perf_counter() - start >= 0.2
+
+    async def test_unknown_windows_assume_the_resource_limit(self):
+        """Test that a fresh search window allows 30 calls, not the core 5000."""
+        pool = TokenPool(["a", "b"], shared=False, buffer=0)
+
+        assert pool.state("a", "search").remaining == 30
+        assert pool.state("a", "core").remaining == 5000
+
+        # 20 of 60 search calls left: below a 50% reserve
+        await pool.update("a", remaining=10, reset=time.time() + 0.2, resource="search")
+        await pool.update("b", remaining=10, reset=time.time() + 0.2, resource="search")
+        start = time.perf_counter()
+        await pool.wait_for_headroom(0.5, resource="search")
+        assert time.perf_counter() - start >= 0.2
+
+    async def test_raises_when_reset_is_too_far(self):
+        """Test that waits longer than max_wait fail fast."""
+        pool = TokenPool(["a"], shared=False, buffer=0, max_wait=1)
+        await pool.update("a", remaining=0, reset=time.time() + 600)
+
+        with pytest.raises(RateLimitedError):
+            await pool.acquire()
+
+    async def test_buffer_scales_with_the_resource_limit(self):
+        """Test that a core-sized buffer does not starve the 30 call search window."""
+        pool = TokenPool(["a"], shared=False, buffer=100, max_wait=0)
+        await pool.update("a", remaining=2, reset=time.time() + 60, resource="search")
+
+        assert pool.buffer_for("core") == 100
+        assert pool.buffer_for("search") == 1
+        assert await pool.acquire("search") == "a"
+        with pytest.raises(RateLimitedError):
+            await pool.acquire("search")
+
+    async def test_local_countdown_assumes_a_window(self):
+        """Test that a token counted down without headers waits for a reset."""
+        pool = TokenPool(["a"], shared=False, buffer=0, max_wait=1)
+        start = time.time()
+        for _ in range(30):
+            await pool.acquire("search")
+
+        assert start + 60 <= pool.state("a", "search").reset <= time.time() + 60
+        with pytest.raises(RateLimitedError):
+            await pool.acquire("search")
+
+    async def test_raises_when_no_reset_is_known(self):
+        """Test that an exhausted token without a reset fails instead of spinning."""
+        pool = TokenPool(["a"], shared=False, buffer=0, max_wait=60)
+        await pool.update("a", remaining=0, reset=0.0)
+
+        with pytest.raises(RateLimitedError):
+            await asyncio.wait_for(pool.acquire(), timeout=1)
+
+    async def test_resource_for_endpoint(self):
+        """Test mapping endpoints to rate limit resources."""
+        assert resource_for("/graphql") == "graphql"
+        assert resource_for("/search/issues") == "search"
+        assert resource_for("/repos/o/r/commits") == "core"
+
+
+@pytest.mark.asyncio
+class TestClientTokenRouting:
+    """Tests for GitHubClient spreading calls over the pool."""
+
+    async def test_client_follows_response_headers(self):
+        """Test that a token reporting low remaining stops receiving calls."""
+        seen = []
+        reset = str(int(time.time()) + 600)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            token = request.headers["Authorization"].split()[-1]
+            seen.append(token)
+            remaining = "5" if token == "a" else "4000"
+            return httpx.Response(
+                200,
+                json={},
+                headers={"X-RateLimit-Remaining": remaining, "X-RateLimit-Reset": reset},
+            )
+
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            base_url="https://api.github.com",
+        )
+        pool = TokenPool(["a", "b"], shared=False, buffer=10)
+        await pool.update("b", remaining=1000, reset=time.time() + 600)
+        await pool.update("a", remaining=2000, reset=time.time() + 600)
+        client = GitHubClient(http_client=http_client, tokens=pool)
+
+        for _ in range(3):
+            await client.get_repo("o", "r")
+        await http_client.aclose()
+
+        assert seen == ["a", "b", "b"]